@@ -4,3 +4,18 @@ from django.apps import AppConfig
 class ApplicationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'applications'
+
+    def ready(self):
+        from django.contrib.auth import get_user_model
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_migrate, pre_delete
+        from .instrumentation import install_execute_wrapper
+        from .sharding import delete_user_rows, seed_id_ranges
+        from .slow_queries import install_slow_query_wrapper
+        from .sqlite_profile import configure_sqlite_connection
+
+        connection_created.connect(configure_sqlite_connection, dispatch_uid='applications_sqlite_profile')
+        connection_created.connect(install_execute_wrapper, dispatch_uid='applications_execute_wrapper')
+        connection_created.connect(install_slow_query_wrapper, dispatch_uid='applications_slow_query_wrapper')
+        post_migrate.connect(seed_id_ranges, sender=self, dispatch_uid='applications_seed_id_ranges')
+        pre_delete.connect(delete_user_rows, sender=get_user_model(), dispatch_uid='applications_delete_user_rows')
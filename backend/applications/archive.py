@@ -0,0 +1,121 @@
+"""
+Archive tier for old, closed applications.
+
+Long-time users collect hundreds of Ghosted rows that every list scan, index
+and stats query over the hot ``JobApplication`` table keeps paying for.
+``manage.py archive_applications`` moves applications in the given statuses
+whose ``applied_date`` is older than a cutoff into ``ArchivedApplication``
+(same id, interviews inline), one batch per transaction so regular writes
+interleave.
+
+The list and stats endpoints read hot rows only; ``?include_archived=1``
+unions the archive back in. Delta sync mirrors the hot data, so archived rows
+leave it through tombstones, like deletions.
+"""
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count
+
+from . import quotas
+from .coalesce import invalidate_user
+from .models import ArchivedApplication, JobApplication
+from .serializers import ArchivedApplicationSerializer
+from .sync import record_deletions
+
+BATCH_SIZE = 500
+# Hot fields copied as they are into the archive
+COPIED_FIELDS = (
+    'company', 'position', 'applied_date', 'status', 'job_description', 'contact_email',
+    'contact_phone', 'company_website', 'notes', 'updated_at', 'resume_sha256', 'resume_size',
+    'resume_content_type',
+)
+
+
+def include_archived(request):
+    """True if the client asked for ``?include_archived=1``"""
+    return request.GET.get('include_archived', '').lower() in ('1', 'true', 'yes')
+
+
+def archivable(alias, statuses, before):
+    """Hot applications in ``alias`` with one of ``statuses``, applied before ``before``"""
+    return JobApplication.objects.using(alias).filter(status__in=statuses, applied_date__lt=before)
+
+
+def _archived_copy(job):
+    return ArchivedApplication(
+        id=job.pk,
+        user_id=job.user_id,
+        resume=job.resume.name or None,
+        interviews=[
+            {'id': i.pk, 'date': i.date, 'time': i.time, 'type': i.type, 'updated_at': i.updated_at}
+            for i in job.interviews.all()
+        ],
+        **{name: getattr(job, name) for name in COPIED_FIELDS},
+    )
+
+
+def archive_batch(alias, statuses, before, after_id=0, batch_size=BATCH_SIZE):
+    """
+    Archive up to ``batch_size`` of the ``archivable`` applications with ids
+    above ``after_id``, in one transaction. Returns the archived ids in order.
+    """
+    jobs = list(
+        archivable(alias, statuses, before).filter(pk__gt=after_id)
+        .prefetch_related('interviews').order_by('pk')[:batch_size]
+    )
+    if not jobs:
+        return []
+
+    deleted = defaultdict(lambda: ([], []))
+    for job in jobs:
+        application_ids, interview_ids = deleted[job.user_id]
+        application_ids.append(job.pk)
+        interview_ids.extend(i.pk for i in job.interviews.all())
+    users = get_user_model().objects.in_bulk(list(deleted))
+
+    # Tombstones live in default; with sharding that is a second transaction
+    with transaction.atomic(using=alias), transaction.atomic():
+        ArchivedApplication.objects.using(alias).bulk_create([_archived_copy(job) for job in jobs])
+        JobApplication.objects.using(alias).filter(pk__in=[job.pk for job in jobs]).delete()
+        for user_id, (application_ids, interview_ids) in deleted.items():
+            record_deletions(users[user_id], application_ids, interview_ids)
+    for user_id in deleted:
+        invalidate_user(user_id)
+        quotas.forget(user_id)
+    return [job.pk for job in jobs]
+
+
+def archived_rows(user):
+    """``user``'s archived applications, serialized like the hot ones"""
+    return ArchivedApplicationSerializer(ArchivedApplication.objects.for_user(user), many=True).data
+
+
+def merge_archived(rows, archived):
+    """Hot and archived rows in one list, newest ``applied_date`` first"""
+    # Serialized dates are ISO strings, so they sort as dates
+    return sorted([*rows, *archived], key=lambda row: row['applied_date'], reverse=True)
+
+
+def archived_status_counts(user):
+    """{"ghosted": n, ...} over ``user``'s archived applications"""
+    stats = ArchivedApplication.objects.for_user(user).values('status').annotate(count=Count('id')).order_by()
+    return Counter({s['status'].lower(): s['count'] for s in stats})
+
+
+def archived_interview_counts(user):
+    """Upcoming, completed (last 30 days) and total interviews of archived applications"""
+    today = date.today()
+    thirty_days_ago = today - timedelta(days=30)
+    counts = Counter(upcoming=0, completed=0, total=0)
+    for interviews in ArchivedApplication.objects.for_user(user).values_list('interviews', flat=True):
+        for interview in interviews:
+            day = date.fromisoformat(interview['date'])
+            counts['total'] += 1
+            if day >= today:
+                counts['upcoming'] += 1
+            elif day >= thirty_days_ago:
+                counts['completed'] += 1
+    return counts
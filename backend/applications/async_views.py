@@ -0,0 +1,200 @@
+"""
+Async versions of the read-only dashboard endpoints.
+
+Served when ``ASYNC_READ_VIEWS`` is on (the ASGI deployment sets it), these
+return the same JSON as their DRF counterparts in ``views.py``. An async view
+does not hold a worker while it waits on the database, so one ASGI process can
+serve many concurrent dashboard requests.
+
+Django's async ORM methods all funnel through one shared thread, so
+independent queries are instead dispatched with ``concurrently``: each runs on
+its own executor thread and database connection, and they are awaited
+together.
+
+DRF does not support async views, so JWT (or session) authentication is done
+here with the same simplejwt settings.
+
+The stats endpoints share identical concurrent computations through
+``asingle_flight``, and all of them read from the replica (``routers``), like
+their sync counterparts.
+"""
+import asyncio
+from collections import Counter
+from datetime import date, timedelta
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import close_old_connections
+from django.db.models import Count
+from django.http import JsonResponse
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .archive import (
+    archived_interview_counts, archived_rows, archived_status_counts, include_archived, merge_archived,
+)
+from .coalesce import asingle_flight, astats_key
+from .models import JobApplication, Interview
+from .routers import use_read_replica
+from .serializers import JobApplicationSerializer, InterviewSerializer
+from .stats import stats_name
+
+User = get_user_model()
+
+_jwt = JWTAuthentication()
+
+
+def _in_own_connection(fn):
+    close_old_connections()
+    try:
+        return fn()
+    finally:
+        close_old_connections()
+
+
+async def concurrently(*fns):
+    """Run independent ORM callables in parallel, each on its own connection"""
+    return await asyncio.gather(*(
+        sync_to_async(_in_own_connection, thread_sensitive=False)(fn) for fn in fns
+    ))
+
+
+def _unauthorized(detail, **extra):
+    response = JsonResponse({'detail': detail, **extra}, status=401)
+    response['WWW-Authenticate'] = f'{jwt_settings.AUTH_HEADER_TYPES[0]} realm="api"'
+    return response
+
+
+async def _authenticate(request):
+    """Return (user, None) or (None, error response), mirroring DRF's JWT/session auth"""
+    header = _jwt.get_header(request)
+    raw_token = _jwt.get_raw_token(header) if header else None
+    if raw_token is None:
+        # Session fallback; auser is provided by AuthenticationMiddleware
+        auser = getattr(request, 'auser', None)
+        user = await auser() if auser else None
+        if user is not None and user.is_authenticated:
+            return user, None
+        return None, _unauthorized('Authentication credentials were not provided.')
+
+    try:
+        token = _jwt.get_validated_token(raw_token)
+        user_id = token[jwt_settings.USER_ID_CLAIM]
+    except (InvalidToken, TokenError, KeyError):
+        return None, _unauthorized('Given token not valid for any token type', code='token_not_valid')
+
+    user = await User.objects.filter(**{jwt_settings.USER_ID_FIELD: user_id}).afirst()
+    if user is None:
+        return None, _unauthorized('User not found', code='user_not_found')
+    if not user.is_active:
+        return None, _unauthorized('User is inactive', code='user_inactive')
+    return user, None
+
+
+def async_authenticated(view):
+    """Require an authenticated user, like IsAuthenticated on the DRF views"""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != 'GET':
+            return JsonResponse({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+        user, error = await _authenticate(request)
+        if error is not None:
+            return error
+        request.user = user
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+async def _job_stats(user, archived=False):
+    user_applications = JobApplication.objects.for_user(user)
+    queries = [
+        lambda: list(user_applications.values('status').annotate(count=Count('id')).order_by()),
+        lambda: user_applications.count(),
+    ]
+    if archived:
+        queries.append(lambda: archived_status_counts(user))
+    stats, total, *archived_counts = await concurrently(*queries)
+    summary = Counter({s['status'].lower(): s['count'] for s in stats})
+    if archived_counts:
+        summary.update(archived_counts[0])
+        total += sum(archived_counts[0].values())
+    return {
+        "total": total,
+        "applied": summary.get("applied", 0),
+        "ghosted": summary.get("ghosted", 0),
+        "interviewing": summary.get("interviewing", 0),
+        "assessment": summary.get("assessment", 0),
+    }
+
+
+@async_authenticated
+@use_read_replica
+async def job_stats(request):
+    user = request.user
+    archived = include_archived(request)
+    key = await astats_key(user.pk, stats_name('job_stats', archived))
+    return JsonResponse(await asingle_flight(key, lambda: _job_stats(user, archived)))
+
+
+@async_authenticated
+@use_read_replica
+async def recent_applications(request):
+    applications = (
+        JobApplication.objects.for_user(request.user)
+        .prefetch_related('interviews')
+        .order_by('-applied_date')
+    )
+    # The list and its prefetch depend on each other, so they share one thread
+    queries = [lambda: JobApplicationSerializer(applications, many=True).data]
+    if include_archived(request):
+        queries.append(lambda: archived_rows(request.user))
+    data, *archived = await concurrently(*queries)
+    if archived:
+        data = merge_archived(data, archived[0])
+    return JsonResponse(data, safe=False)
+
+
+@async_authenticated
+@use_read_replica
+async def upcoming_interviews(request):
+    interviews = Interview.objects.for_user(request.user).filter(
+        date__gte=date.today()
+    ).select_related('job_application').order_by('date', 'time')[:5]
+    [data] = await concurrently(lambda: InterviewSerializer(interviews, many=True).data)
+    return JsonResponse(data, safe=False)
+
+
+async def _interview_stats(user, archived=False):
+    today = date.today()
+    thirty_days_ago = today - timedelta(days=30)
+    all_interviews = Interview.objects.for_user(user)
+
+    queries = [
+        lambda: all_interviews.filter(date__gte=today).count(),
+        lambda: all_interviews.filter(date__lt=today, date__gte=thirty_days_ago).count(),
+        lambda: all_interviews.count(),
+    ]
+    if archived:
+        queries.append(lambda: archived_interview_counts(user))
+    upcoming_count, completed_count, total_count, *archived_counts = await concurrently(*queries)
+    if archived_counts:
+        upcoming_count += archived_counts[0]['upcoming']
+        completed_count += archived_counts[0]['completed']
+        total_count += archived_counts[0]['total']
+    return {
+        "upcoming": upcoming_count,
+        "completed": completed_count,
+        "total": total_count,
+        "success_rate": "0%",
+    }
+
+
+@async_authenticated
+@use_read_replica
+async def interview_stats(request):
+    user = request.user
+    archived = include_archived(request)
+    key = await astats_key(user.pk, stats_name('interview_stats', archived))
+    return JsonResponse(await asingle_flight(key, lambda: _interview_stats(user, archived)))
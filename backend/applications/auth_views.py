@@ -12,6 +12,7 @@ from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework.exceptions import ValidationError
 from django.db import IntegrityError
+from .idempotency import idempotent
 
 logger = logging.getLogger('applications')  # Use the 'applications' logger from settings
 User = get_user_model()
@@ -205,6 +206,7 @@ def login(request):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@idempotent
 def logout(request):
     """Logout user by blacklisting refresh token"""
     try:
@@ -0,0 +1,200 @@
+"""
+Batch endpoint: several API calls in one HTTP request.
+
+``POST /api/batch/`` takes a list of sub-requests and returns one response
+per call, in order:
+
+    {"atomic": false, "requests": [
+        {"method": "PATCH", "path": "/api/applications/7/update/", "body": {"status": "Ghosted"}},
+        {"method": "GET", "path": "/api/job-stats/"}
+    ]}
+
+    {"responses": [{"status": 200, "body": {...}}, {"status": 200, "body": {...}}]}
+
+The batch is authenticated once; each call is dispatched in-process through
+the URL resolver to the same view a standalone request would reach, with the
+already-authenticated user attached. Calls may carry extra ``headers``
+(e.g. ``Prefer``).
+
+With ``"atomic": true`` all calls run in one transaction. The first call that
+fails (status >= 400) rolls everything back, later calls are not run (424)
+and the response has ``"committed": false``.
+
+Work is bounded: at most ``BATCH_MAX_REQUESTS`` calls, and once the batch has
+run ``BATCH_MAX_QUERIES`` database queries the remaining calls are refused
+with 429.
+"""
+import io
+import json
+import logging
+from contextlib import nullcontext
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from . import sharding, views
+from .idempotency import idempotent
+from .instrumentation import track_queries
+
+logger = logging.getLogger('applications')
+
+ALLOWED_METHODS = {'GET', 'POST', 'PUT', 'PATCH', 'DELETE'}
+# Views that cannot run inside a batch
+EXCLUDED_VIEWS = {'batch', 'event_stream'}
+# Parent headers that describe the batch body, not the sub-request
+_NOT_INHERITED = {'HTTP_CONTENT_LENGTH', 'HTTP_CONTENT_TYPE', 'HTTP_PREFER', 'HTTP_IDEMPOTENCY_KEY'}
+_INHERITED_META = ('SERVER_NAME', 'SERVER_PORT', 'REMOTE_ADDR', 'SERVER_PROTOCOL')
+
+
+class BatchError(ValueError):
+    """A malformed sub-request; reported as that call's 400 response"""
+
+
+def _error(status_code, message):
+    return {'status': status_code, 'body': {'error': message}}
+
+
+def _parse_call(call):
+    if not isinstance(call, dict):
+        raise BatchError('Each request must be an object with "method" and "path".')
+    method = str(call.get('method', 'GET')).upper()
+    if method not in ALLOWED_METHODS:
+        raise BatchError(f'Method "{method}" is not allowed in a batch.')
+    path = call.get('path')
+    if not isinstance(path, str) or not path.startswith('/api/'):
+        raise BatchError('"path" must be an API path starting with /api/.')
+    headers = call.get('headers') or {}
+    if not isinstance(headers, dict):
+        raise BatchError('"headers" must be an object.')
+    return method, path, call.get('body'), headers
+
+
+def _sub_request(request, method, path, body, headers):
+    url = urlsplit(path)
+    payload = b'' if body is None else json.dumps(body, cls=DjangoJSONEncoder).encode()
+
+    environ = {
+        key: value for key, value in request.META.items()
+        if (key.startswith('HTTP_') and key not in _NOT_INHERITED) or key in _INHERITED_META
+    }
+    for name, value in headers.items():
+        environ['HTTP_' + name.upper().replace('-', '_')] = str(value)
+    environ.update({
+        'REQUEST_METHOD': method,
+        'SCRIPT_NAME': '',
+        'PATH_INFO': url.path,
+        'QUERY_STRING': url.query,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(payload)),
+        'wsgi.input': io.BytesIO(payload),
+        'wsgi.url_scheme': request.scheme,
+    })
+    sub = WSGIRequest(environ)
+    # Reuse the batch's authentication instead of re-checking the token per call
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+    return sub
+
+
+def _render(response):
+    if getattr(response, 'streaming', False):
+        return {'status': status.HTTP_400_BAD_REQUEST, 'body': {'error': 'Streaming endpoints cannot be batched.'}}
+    if hasattr(response, 'render') and not response.is_rendered:
+        response.render()
+    body = None
+    if response.content:
+        if 'json' in response.get('Content-Type', ''):
+            body = json.loads(response.content)
+        else:
+            body = response.content.decode(errors='replace')
+    return {'status': response.status_code, 'body': body}
+
+
+def _in_process_view(view):
+    """
+    The view to run for a sub-request. Async read views query on their own
+    connections, outside the batch's transaction, so they would not see
+    earlier calls' writes; their DRF counterparts in ``views`` are used instead.
+    """
+    if not iscoroutinefunction(view):
+        return view
+    return getattr(views, view.__name__, None)
+
+
+def dispatch(request, call):
+    """Run one sub-request through the URL resolver and return {status, body}"""
+    try:
+        method, path, body, headers = _parse_call(call)
+    except BatchError as e:
+        return _error(status.HTTP_400_BAD_REQUEST, str(e))
+
+    sub = _sub_request(request, method, path, body, headers)
+    try:
+        match = resolve(sub.path_info)
+    except Resolver404:
+        return _error(status.HTTP_404_NOT_FOUND, f'No endpoint at {path}.')
+    view = _in_process_view(match.func)
+    if view is None or match.url_name in EXCLUDED_VIEWS:
+        return _error(status.HTTP_400_BAD_REQUEST, f'{path} cannot be called inside a batch.')
+
+    sub.resolver_match = match
+    try:
+        return _render(view(sub, *match.args, **match.kwargs))
+    except Exception:
+        logger.exception(f'[BATCH] {method} {path} failed')
+        return _error(status.HTTP_500_INTERNAL_SERVER_ERROR, 'Internal server error.')
+
+
+def run_batch(request, calls, atomic=False):
+    """Dispatch ``calls`` in order; returns (responses, committed)"""
+    responses = []
+    committed = True
+    with track_queries() as work, sharding.atomic(request.user) if atomic else nullcontext():
+        for index, call in enumerate(calls):
+            if work.count >= settings.BATCH_MAX_QUERIES:
+                responses.extend(
+                    _error(status.HTTP_429_TOO_MANY_REQUESTS, 'Batch work limit reached; request not run.')
+                    for _ in calls[index:]
+                )
+                break
+            result = dispatch(request, call)
+            responses.append(result)
+            if atomic and result['status'] >= 400:
+                sharding.set_rollback(request.user)
+                committed = False
+                responses.extend(
+                    _error(status.HTTP_424_FAILED_DEPENDENCY, 'Not run: an earlier request in the atomic batch failed.')
+                    for _ in calls[index + 1:]
+                )
+                break
+    return responses, committed
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@idempotent
+def batch(request):
+    """Run several API calls in one request, optionally in one transaction"""
+    calls = request.data.get('requests') if isinstance(request.data, dict) else None
+    if not isinstance(calls, list) or not calls:
+        return Response({"error": '"requests" must be a non-empty list.'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(calls) > settings.BATCH_MAX_REQUESTS:
+        return Response(
+            {"error": f"A batch may contain at most {settings.BATCH_MAX_REQUESTS} requests."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    atomic = request.data.get('atomic') is True
+    responses, committed = run_batch(request, calls, atomic=atomic)
+    body = {"responses": responses}
+    if atomic:
+        body["committed"] = committed
+    return Response(body)
@@ -0,0 +1,228 @@
+"""
+Endpoint micro-benchmarks.
+
+Each dataset size gets its own seeded user (via ``generate_synthetic_data``)
+and every scenario is driven through the full middleware stack with DRF's
+APIClient. For each view we keep latency percentiles and the number of
+queries per request, so results can be stored as a JSON baseline and later
+compared against it (see ``manage.py benchmark_endpoints``).
+"""
+import io
+import math
+import platform
+import time
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .instrumentation import track_queries
+
+User = get_user_model()
+
+DEFAULT_SIZES = (1, 100, 1000, 10000)
+BENCHMARK_PASSWORD = 'benchmark-pass-123'
+
+# Latency metrics compared against the baseline; query counts are compared exactly
+LATENCY_METRICS = ('p50_ms', 'p95_ms')
+
+# Benchmark users get ids real users have too, so their quota counters, db
+# pins and cached stats live in a private cache rather than the shared file.
+# The largest datasets are over QUOTA_MAX_APPLICATIONS, and every scenario
+# runs as one user far faster than QUOTA_WRITES_PER_MINUTE allows.
+BENCHMARK_SETTINGS = {
+    'CACHES': {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'benchmarks'}},
+    'QUOTA_MAX_APPLICATIONS': 0,
+    'QUOTA_MAX_RESUME_BYTES': 0,
+    'QUOTA_WRITES_PER_MINUTE': 0,
+}
+
+
+class BenchmarkError(Exception):
+    """A scenario returned an error response, so its timings are meaningless"""
+
+
+class Scenario:
+    def __init__(self, name, method, url_name, body=None, authenticated=True, seeded=None):
+        self.name = name
+        self.method = method
+        self.url_name = url_name
+        self.body = body
+        self.authenticated = authenticated
+        # How many seeded applications a response shows; checked against the
+        # dataset size so a read served from the wrong database fails loudly
+        self.seeded = seeded
+
+
+class BenchmarkContext:
+    """The seeded user for one dataset size plus ready-made clients"""
+
+    def __init__(self, size, user):
+        self.size = size
+        self.user = user
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}'
+        )
+        self.anonymous = APIClient()
+
+
+SCENARIOS = [
+    Scenario('recent_applications', 'get', 'recent_applications', seeded=lambda data: len(data)),
+    Scenario('job_stats', 'get', 'job_stats', seeded=lambda data: data['total']),
+    Scenario('upcoming_interviews', 'get', 'upcoming_interviews'),
+    Scenario('interview_stats', 'get', 'interview_stats'),
+    Scenario('add_job_application', 'post', 'add_job_application', body=lambda ctx, i: {
+        'company': f'Benchmark Co {i}',
+        'position': 'Engineer',
+        'status': 'Interviewing',
+        'applied_date': timezone.localdate().isoformat(),
+        'interview_date': timezone.localdate().isoformat(),
+        'notes': 'Created by benchmark_endpoints',
+    }),
+    Scenario('login', 'post', 'login', authenticated=False, body=lambda ctx, i: {
+        'username': ctx.user.username,
+        'password': BENCHMARK_PASSWORD,
+    }),
+    Scenario('register', 'post', 'register', authenticated=False, body=lambda ctx, i: {
+        'username': f'bench_register_{ctx.size}_{i}',
+        'email': f'bench_register_{ctx.size}_{i}@example.com',
+        'password': BENCHMARK_PASSWORD,
+    }),
+    Scenario('get_user', 'get', 'get_user'),
+    # Refresh tokens rotate and are blacklisted after use, so mint one per call
+    Scenario('refresh_token', 'post', 'refresh_token', authenticated=False, body=lambda ctx, i: {
+        'refresh_token': str(RefreshToken.for_user(ctx.user)),
+    }),
+]
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(timings_ms, query_counts):
+    timings_ms = sorted(timings_ms)
+    return {
+        'iterations': len(timings_ms),
+        'mean_ms': round(sum(timings_ms) / len(timings_ms), 3),
+        'p50_ms': round(percentile(timings_ms, 50), 3),
+        'p95_ms': round(percentile(timings_ms, 95), 3),
+        'p99_ms': round(percentile(timings_ms, 99), 3),
+        'max_ms': round(timings_ms[-1], 3),
+        'queries': max(query_counts),
+    }
+
+
+def seed_dataset(size, seed):
+    """Create one user with exactly ``size`` applications"""
+    prefix = f'bench_{size}_'
+    call_command(
+        'generate_synthetic_data',
+        '--users', '1',
+        '--applications-per-user', str(size),
+        '--exact',
+        '--username-prefix', prefix,
+        '--password', BENCHMARK_PASSWORD,
+        '--seed', str(seed),
+        '--clear',
+        stdout=io.StringIO(),
+    )
+    return User.objects.get(username=f'{prefix}0')
+
+
+def run_scenario(scenario, ctx, iterations, warmup):
+    client = ctx.client if scenario.authenticated else ctx.anonymous
+    url = reverse(scenario.url_name)
+    request = getattr(client, scenario.method)
+    timings_ms, query_counts = [], []
+
+    for i in range(warmup + iterations):
+        body = scenario.body(ctx, i) if scenario.body else None
+        start = time.perf_counter()
+        with track_queries() as stats:
+            response = request(url, body, format='json')
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if response.status_code >= 400:
+            raise BenchmarkError(
+                f'{scenario.name} returned {response.status_code} at size {ctx.size}: {response.content[:200]!r}'
+            )
+        if scenario.seeded and i == 0 and scenario.seeded(response.json()) != ctx.size:
+            raise BenchmarkError(
+                f'{scenario.name} saw {scenario.seeded(response.json())} of the {ctx.size} seeded applications'
+            )
+        if i >= warmup:
+            timings_ms.append(elapsed_ms)
+            query_counts.append(stats.count)
+
+    return summarize(timings_ms, query_counts)
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, iterations=20, warmup=3, views=None, seed=42, progress=None):
+    """Seed each dataset size and benchmark every selected scenario against it"""
+    scenarios = [s for s in SCENARIOS if not views or s.name in views]
+    results = {}
+    with override_settings(**BENCHMARK_SETTINGS):
+        # Nothing left over from an earlier run in this process
+        cache.clear()
+        for size in sizes:
+            ctx = BenchmarkContext(size, seed_dataset(size, seed))
+            results[str(size)] = {}
+            for scenario in scenarios:
+                results[str(size)][scenario.name] = run_scenario(scenario, ctx, iterations, warmup)
+                if progress:
+                    progress(size, scenario.name, results[str(size)][scenario.name])
+
+    return {
+        'meta': {
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'iterations': iterations,
+            'warmup': warmup,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def compare_results(baseline, current, tolerance=0.25, min_delta_ms=1.0):
+    """
+    Return regressions of ``current`` against ``baseline``.
+
+    Latency regresses when it grows by more than ``tolerance`` (a fraction)
+    and by at least ``min_delta_ms``, which keeps sub-millisecond noise out.
+    Query counts are deterministic, so any increase is a regression.
+    """
+    regressions = []
+    for size, views in current['results'].items():
+        for view, metrics in views.items():
+            base = baseline.get('results', {}).get(size, {}).get(view)
+            if base is None:
+                continue
+            for metric in LATENCY_METRICS:
+                if (metrics[metric] > base[metric] * (1 + tolerance)
+                        and metrics[metric] - base[metric] >= min_delta_ms):
+                    regressions.append({
+                        'size': size, 'view': view, 'metric': metric,
+                        'baseline': base[metric], 'current': metrics[metric],
+                    })
+            if metrics['queries'] > base['queries']:
+                regressions.append({
+                    'size': size, 'view': view, 'metric': 'queries',
+                    'baseline': base['queries'], 'current': metrics['queries'],
+                })
+    return regressions
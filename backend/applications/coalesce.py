@@ -0,0 +1,121 @@
+"""
+Single-flight coalescing for per-user dashboard computations.
+
+Several tabs, or a dashboard that fires its requests twice, ask for the same
+``job_stats`` / ``interview_stats`` at the same moment. ``single_flight`` lets
+the first caller compute the value while holding a short-lived cache lock;
+callers arriving meanwhile wait for it and get the same result, so a burst of
+identical requests costs one database pass.
+
+The result is shared for ``STATS_COALESCE_TTL`` seconds. Keys carry a per-user
+generation that ``invalidate_user`` bumps once a write commits, so a change
+is never hidden behind a shared result. Waiters give up after
+``STATS_COALESCE_WAIT`` seconds and compute for themselves.
+
+The lock and results live in the default cache, which all workers on a node
+share (``sqlite_cache``), so coalescing spans workers.
+"""
+import asyncio
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+logger = logging.getLogger('applications')
+
+KEY_PREFIX = 'single-flight'
+# Seconds between checks while waiting on another caller's computation
+POLL_INTERVAL = 0.02
+
+
+def _generation_key(user_id):
+    return f'{KEY_PREFIX}:gen:{user_id}'
+
+
+def _result_key(user_id, name, generation):
+    return f'{KEY_PREFIX}:{name}:{user_id}:{generation}'
+
+
+def stats_key(user_id, name):
+    """Cache key for ``name`` computed for ``user_id``, as of the user's last write"""
+    return _result_key(user_id, name, cache.get(_generation_key(user_id), 0))
+
+
+async def astats_key(user_id, name):
+    return _result_key(user_id, name, await cache.aget(_generation_key(user_id), 0))
+
+
+def invalidate_user(user_id):
+    """Stop sharing results computed before this point for ``user_id``"""
+    key = _generation_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def single_flight(key, compute):
+    """Return ``compute()``, sharing one computation among concurrent callers of ``key``"""
+    ttl = settings.STATS_COALESCE_TTL
+    # Inside a transaction the caller may have uncommitted writes the shared
+    # result would not reflect
+    if ttl <= 0 or connection.in_atomic_block:
+        return compute()
+
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, True, timeout=settings.STATS_COALESCE_WAIT):
+        try:
+            value = compute()
+            cache.set(key, value, timeout=ttl)
+            return value
+        finally:
+            cache.delete(lock_key)
+
+    deadline = time.monotonic() + settings.STATS_COALESCE_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+        if cache.get(lock_key) is None:
+            # The computing caller failed; nothing to wait for
+            break
+    logger.debug(f'[SINGLE-FLIGHT] {key} computed without coalescing')
+    return compute()
+
+
+async def asingle_flight(key, compute):
+    """``single_flight`` for async views; ``compute`` is an async callable"""
+    ttl = settings.STATS_COALESCE_TTL
+    if ttl <= 0:
+        return await compute()
+
+    value = await cache.aget(key)
+    if value is not None:
+        return value
+
+    lock_key = f'{key}:lock'
+    if await cache.aadd(lock_key, True, timeout=settings.STATS_COALESCE_WAIT):
+        try:
+            value = await compute()
+            await cache.aset(key, value, timeout=ttl)
+            return value
+        finally:
+            await cache.adelete(lock_key)
+
+    deadline = time.monotonic() + settings.STATS_COALESCE_WAIT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(POLL_INTERVAL)
+        value = await cache.aget(key)
+        if value is not None:
+            return value
+        if await cache.aget(lock_key) is None:
+            break
+    logger.debug(f'[SINGLE-FLIGHT] {key} computed without coalescing')
+    return await compute()
@@ -0,0 +1,213 @@
+"""
+Live dashboard updates over Server-Sent Events.
+
+The write paths in ``views.py`` call ``publish_*`` to append a ``ChangeEvent``
+row once their transaction commits. ``event_stream`` (``GET /api/events/``)
+is an async view that tails the current user's rows and forwards them as SSE:
+
+    id: 42
+    event: application.updated
+    data: {"id": 7, "company": "Acme", ...}
+
+Because the log lives in the database, an event written by any worker reaches
+streams held open by every other worker, with no broker to run. Each stream
+checks for new rows every ``LIVE_UPDATES_POLL_INTERVAL`` seconds with one
+indexed query. After each batch of changes it also sends a ``stats`` event
+carrying fresh ``job_stats`` / ``interview_stats``, so the numbers are
+computed once per batch, and only while someone is listening; streams in
+several tabs share one computation.
+
+Streams close after ``LIVE_UPDATES_MAX_STREAM`` seconds. Clients reconnect
+with ``Last-Event-ID`` (header or ``?last_event_id=``) and continue where they
+left off. If that id has been pruned, or none was sent, the stream starts with
+a ``resync`` event and the client should re-fetch everything once.
+
+Holding a connection open only makes sense under ASGI; under WSGI the
+endpoint answers 503 and clients fall back to re-fetching after mutations.
+"""
+import asyncio
+import json
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Max
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+
+from .async_views import async_authenticated, concurrently
+from .coalesce import invalidate_user
+from .models import ChangeEvent
+from .pruning import delete_in_batches, should_prune
+from .routers import pin_to_primary
+from .serializers import JobApplicationSerializer, InterviewSerializer
+from .stats import shared_job_stats, shared_interview_stats
+
+logger = logging.getLogger('applications')
+
+APPLICATION_CREATED = 'application.created'
+APPLICATION_UPDATED = 'application.updated'
+APPLICATION_DELETED = 'application.deleted'
+INTERVIEW_CREATED = 'interview.created'
+INTERVIEW_UPDATED = 'interview.updated'
+INTERVIEW_DELETED = 'interview.deleted'
+STATS = 'stats'
+RESYNC = 'resync'
+
+# Rows fetched per poll; a stream with more pending drains them without sleeping
+BATCH_SIZE = 100
+# Every PRUNE_EVERY-th event, rows older than the retention window are deleted
+PRUNE_EVERY = 200
+RETRY_MS = 3000
+
+
+# ─── Publishing ──────────────────────────────────────────────
+
+def publish(user, kind, payload):
+    """Queue a change event for ``user``, written once the current transaction commits"""
+    transaction.on_commit(lambda: _write_event(user.pk, kind, payload))
+
+
+def _write_event(user_id, kind, payload):
+    try:
+        # Shared stats computed before this change must not be handed out, and
+        # the user's next reads must not come from a lagging replica
+        invalidate_user(user_id)
+        pin_to_primary(user_id)
+        event = ChangeEvent.objects.create(user_id=user_id, kind=kind, payload=payload)
+        if should_prune(event.pk, PRUNE_EVERY):
+            prune_events()
+    except Exception:
+        # The change itself is committed; a lost event only costs a stale tab
+        logger.exception(f'Failed to publish {kind} event for user {user_id}')
+
+
+def publish_to_users(user_ids, kind, payload):
+    """``publish`` the same event to many users, written with one insert after commit"""
+    user_ids = list(user_ids)
+    if user_ids:
+        transaction.on_commit(lambda: _write_events(user_ids, kind, payload))
+
+
+def _write_events(user_ids, kind, payload):
+    try:
+        for user_id in user_ids:
+            invalidate_user(user_id)
+            pin_to_primary(user_id)
+        ChangeEvent.objects.bulk_create(
+            [ChangeEvent(user_id=user_id, kind=kind, payload=payload) for user_id in user_ids]
+        )
+    except Exception:
+        logger.exception(f'Failed to publish {kind} events for {len(user_ids)} users')
+
+
+def prune_events(retention=None):
+    """Delete events older than the retention window, in batches. Returns the count."""
+    if retention is None:
+        retention = settings.CHANGE_EVENT_RETENTION
+    cutoff = timezone.now() - timedelta(seconds=retention)
+    return delete_in_batches(ChangeEvent.objects.filter(created_at__lt=cutoff))
+
+
+def publish_application(user, job, created=False):
+    kind = APPLICATION_CREATED if created else APPLICATION_UPDATED
+    publish(user, kind, JobApplicationSerializer(job).data)
+
+
+def publish_application_deleted(user, job_id, interview_ids=()):
+    for interview_id in interview_ids:
+        publish(user, INTERVIEW_DELETED, {'id': interview_id, 'job_application_id': job_id})
+    publish(user, APPLICATION_DELETED, {'id': job_id})
+
+
+def publish_interview(user, interview, created=False):
+    kind = INTERVIEW_CREATED if created else INTERVIEW_UPDATED
+    publish(user, kind, InterviewSerializer(interview).data)
+
+
+# ─── Streaming ───────────────────────────────────────────────
+
+def format_event(kind, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {kind}')
+    lines.append(f'data: {json.dumps(data, cls=DjangoJSONEncoder)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def _last_event_id(request):
+    raw = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    try:
+        return int(raw) if raw else None
+    except ValueError:
+        return None
+
+
+async def _starting_point(user, last_event_id):
+    """Return (id to stream after, whether the client must resync)"""
+    if last_event_id is not None:
+        [known] = await concurrently(
+            lambda: ChangeEvent.objects.filter(user=user, pk=last_event_id).exists()
+        )
+        if known:
+            return last_event_id, False
+    [latest] = await concurrently(lambda: ChangeEvent.objects.aggregate(latest=Max('id'))['latest'])
+    return latest or 0, True
+
+
+async def stream_events(user, last_event_id=None):
+    """Async generator of SSE frames for ``user``"""
+    poll_interval = settings.LIVE_UPDATES_POLL_INTERVAL
+    heartbeat = settings.LIVE_UPDATES_HEARTBEAT
+    deadline = time.monotonic() + settings.LIVE_UPDATES_MAX_STREAM
+
+    after, resync = await _starting_point(user, last_event_id)
+    yield f'retry: {RETRY_MS}\n\n'
+    if resync:
+        yield format_event(RESYNC, {}, event_id=after)
+    last_sent = time.monotonic()
+
+    while time.monotonic() < deadline:
+        [events] = await concurrently(lambda: list(
+            ChangeEvent.objects.filter(user=user, pk__gt=after)
+            .order_by('id')
+            .values_list('id', 'kind', 'payload')[:BATCH_SIZE]
+        ))
+        if events:
+            for event_id, kind, payload in events:
+                yield format_event(kind, payload, event_id=event_id)
+            after = events[-1][0]
+            jobs, interviews = await concurrently(
+                lambda: shared_job_stats(user),
+                lambda: shared_interview_stats(user),
+            )
+            yield format_event(STATS, {'jobs': jobs, 'interviews': interviews})
+            last_sent = time.monotonic()
+            if len(events) == BATCH_SIZE:
+                continue
+        elif time.monotonic() - last_sent >= heartbeat:
+            # SSE comment line; keeps proxies from timing out an idle stream
+            yield ': ping\n\n'
+            last_sent = time.monotonic()
+        await asyncio.sleep(poll_interval)
+
+
+@async_authenticated
+async def event_stream(request):
+    """Stream the authenticated user's change events as Server-Sent Events"""
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'detail': 'Live updates require the ASGI server.'}, status=503)
+
+    response = StreamingHttpResponse(
+        stream_events(request.user, _last_event_id(request)),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
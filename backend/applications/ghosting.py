@@ -0,0 +1,164 @@
+"""
+Automatic ghosting sweep.
+
+An "Applied" application with no interview and no change for N days is
+moved to "Ghosted". N is the owner's ``UserPreferences.ghost_after_days``,
+or ``GHOST_AFTER_DAYS`` if they have not set one; 0 turns the sweep off.
+
+``sweep`` walks users in id chunks. For each chunk and each distinct N, it
+runs one set-based UPDATE per database, shards included. A chunk costs a
+handful of statements however many rows move. ``.update()`` skips auto_now,
+so the UPDATE sets ``updated_at`` itself and delta sync picks the rows up.
+Each affected user's shared stats are dropped and their open dashboards get
+one ``resync`` event.
+
+Run it with ``manage.py sweep_ghosted`` (e.g. from cron). Alternatively, set
+``GHOSTING_SWEEP_INTERVAL`` to run it in a background thread of each server
+process. A lock in the shared cache keeps sweeps on a node from overlapping,
+and a marker lets only one process per node do each round. The lock is a
+short lease renewed after every chunk, so a process that dies mid-sweep
+holds it up for at most ``LOCK_LEASE`` seconds.
+"""
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from . import events
+from .models import Interview, JobApplication, UserPreferences
+from .sharding import shard_aliases
+
+logger = logging.getLogger('applications')
+
+# Users per chunk; also bounds the id lists bound into each UPDATE
+CHUNK_SIZE = 500
+LOCK_KEY = 'ghosting-sweep:lock'
+ROUND_KEY = 'ghosting-sweep:round'
+# Seconds the lock lasts unless renewed; far above one chunk's work
+LOCK_LEASE = 60
+
+_scheduler_started = False
+_scheduler_lock = threading.Lock()
+
+
+def stale_applied(alias, cutoff):
+    """"Applied" applications in ``alias`` unchanged since ``cutoff`` and never interviewed"""
+    return JobApplication.objects.using(alias).filter(
+        ~Exists(Interview.objects.filter(job_application=OuterRef('pk'))),
+        status='Applied',
+        updated_at__lt=cutoff,
+    )
+
+
+def _plans(first_id, last_id):
+    """(days, filter) pairs covering the users in [first_id, last_id]"""
+    overrides = defaultdict(list)
+    preferences = UserPreferences.objects.filter(
+        user_id__gte=first_id, user_id__lte=last_id, ghost_after_days__isnull=False,
+    ).values_list('user_id', 'ghost_after_days')
+    for user_id, days in preferences:
+        overrides[days].append(user_id)
+
+    # Related fields have no __range lookup
+    in_range = {'user_id__gte': first_id, 'user_id__lte': last_id}
+    custom = [user_id for user_ids in overrides.values() for user_id in user_ids]
+    plans = [(settings.GHOST_AFTER_DAYS, in_range, custom)]
+    plans += [(days, {'user_id__in': user_ids}, []) for days, user_ids in overrides.items()]
+    return [plan for plan in plans if plan[0] > 0]
+
+
+def _sweep_chunk(first_id, last_id, now, dry_run):
+    moved = 0
+    affected = set()
+    for days, lookup, excluded in _plans(first_id, last_id):
+        cutoff = now - timedelta(days=days)
+        for alias in [DEFAULT_DB_ALIAS, *shard_aliases()]:
+            stale = stale_applied(alias, cutoff).filter(**lookup).exclude(user_id__in=excluded)
+            if dry_run:
+                moved += stale.count()
+                continue
+            with transaction.atomic(using=alias):
+                count = stale.update(status='Ghosted', updated_at=now)
+                if count:
+                    # The rows this UPDATE touched carry its exact timestamp
+                    affected.update(
+                        JobApplication.objects.using(alias)
+                        .filter(**lookup, status='Ghosted', updated_at=now)
+                        .values_list('user_id', flat=True).distinct()
+                    )
+            moved += count
+    if affected:
+        events.publish_to_users(affected, events.RESYNC, {'reason': 'ghosted'})
+    return moved
+
+
+def sweep(dry_run=False, chunk_size=CHUNK_SIZE, renew=None):
+    """
+    Ghost every stale application; returns how many moved (or would, with
+    ``dry_run``). ``renew`` is called after each chunk; the sweep stops
+    early when it returns False.
+    """
+    now = timezone.now()
+    users = get_user_model().objects.order_by('pk').values_list('pk', flat=True)
+    moved = 0
+    last_id = 0
+    while user_ids := list(users.filter(pk__gt=last_id)[:chunk_size]):
+        last_id = user_ids[-1]
+        moved += _sweep_chunk(user_ids[0], last_id, now, dry_run)
+        if renew is not None and not renew():
+            logger.warning(f'[GHOSTING] Lost the sweep lock after user {last_id}; stopping')
+            break
+    return moved
+
+
+def _renew_lock(token):
+    # Only while the lease is still ours: once it lapsed, another process may hold it
+    return cache.get(LOCK_KEY) == token and cache.touch(LOCK_KEY, LOCK_LEASE)
+
+
+def run_scheduled(interval):
+    """One scheduled round; skipped if a sweep is running or another process ran this interval"""
+    token = uuid.uuid4().hex
+    if not cache.add(LOCK_KEY, token, timeout=LOCK_LEASE):
+        return None
+    try:
+        if not cache.add(ROUND_KEY, True, timeout=interval):
+            return None
+        moved = sweep(renew=lambda: _renew_lock(token))
+        logger.info(f'[GHOSTING] Moved {moved} applications to Ghosted')
+        return moved
+    except Exception:
+        logger.exception('[GHOSTING] Sweep failed')
+        return None
+    finally:
+        if cache.get(LOCK_KEY) == token:
+            cache.delete(LOCK_KEY)
+        connections.close_all()
+
+
+def _run_forever(interval):
+    while True:
+        time.sleep(interval)
+        run_scheduled(interval)
+
+
+def start_scheduler():
+    """Start the in-process sweep thread if GHOSTING_SWEEP_INTERVAL is set; safe to call twice"""
+    global _scheduler_started
+    interval = settings.GHOSTING_SWEEP_INTERVAL
+    if interval <= 0:
+        return
+    with _scheduler_lock:
+        if _scheduler_started:
+            return
+        _scheduler_started = True
+    threading.Thread(target=_run_forever, args=(interval,), name='ghosting-sweep', daemon=True).start()
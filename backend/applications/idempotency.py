@@ -0,0 +1,183 @@
+"""
+Idempotency keys for write endpoints.
+
+A client that may retry a write (e.g. after a timeout) sends a unique
+``Idempotency-Key`` header. The first request with a key runs normally and
+its response is stored; a repeat within ``IDEMPOTENCY_KEY_TTL_HOURS`` gets the
+stored response back (with ``Idempotent-Replayed: true``) instead of running
+the write again.
+
+- Keys are scoped to the authenticated user; anonymous requests are not
+  deduplicated.
+- Reusing a key for a different request (method, path or data) is a 422.
+- A repeat that arrives while the first request is still running is a 409.
+  A claim still pending after ``IDEMPOTENCY_PENDING_TIMEOUT`` seconds belongs
+  to a request that died (worker killed or timed out) and is taken over.
+- Server errors (5xx), 429s and responses marked ``retryable`` (e.g. quota
+  rejections) are not stored, so the client can retry with the same key.
+- Replays carry the headers the view set (e.g. ``Retry-After``,
+  ``Preference-Applied``) along with the status and body.
+
+Apply ``@idempotent`` between ``@permission_classes`` and the view function.
+Expired keys are pruned in batches from the write path.
+"""
+import hashlib
+import json
+import logging
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+from .pruning import delete_in_batches, should_prune
+
+logger = logging.getLogger('applications')
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+# Every PRUNE_EVERY-th key, expired keys are deleted
+PRUNE_EVERY = 200
+# Set by the renderer, not the view; replays get their own
+UNSTORED_HEADERS = {'content-type', 'content-length', 'vary', 'allow'}
+
+
+def _json_value(value):
+    if isinstance(value, UploadedFile):
+        return {'file': value.name, 'size': value.size}
+    return value
+
+
+def request_fingerprint(request):
+    """sha256 of the method, path and request data (uploads by name and size)"""
+    data = request.data
+    if hasattr(data, 'lists'):
+        data = {key: [_json_value(v) for v in values] for key, values in data.lists()}
+    payload = json.dumps(
+        [request.method, request.get_full_path(), data],
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def prune_idempotency_keys(ttl_hours=None):
+    """Delete keys past their TTL, in batches. Returns the count."""
+    if ttl_hours is None:
+        ttl_hours = settings.IDEMPOTENCY_KEY_TTL_HOURS
+    cutoff = timezone.now() - timedelta(hours=ttl_hours)
+    return delete_in_batches(IdempotencyKey.objects.filter(created_at__lt=cutoff))
+
+
+def retryable(response):
+    """Mark a rejection that may pass later (e.g. a quota) so its key is not spent on it"""
+    response.idempotent_retryable = True
+    return response
+
+
+def _stored(response):
+    return not (
+        response.status_code >= 500
+        or response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        or getattr(response, 'idempotent_retryable', False)
+    )
+
+
+def _error(message, status_code):
+    return Response({"error": message}, status=status_code)
+
+
+def _stored_headers(response):
+    return {
+        name: value for name, value in response.items()
+        if name.lower() not in UNSTORED_HEADERS and name != REPLAYED_HEADER
+    }
+
+
+def _abandoned(record, now):
+    """Expired, or pending for longer than any live request runs"""
+    if record.created_at < now - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS):
+        return True
+    return (record.status_code is None
+            and record.created_at < now - timedelta(seconds=settings.IDEMPOTENCY_PENDING_TIMEOUT))
+
+
+def _claim(user, key, fingerprint):
+    """Return (record, None) if this request owns the key, else (None, response to send)"""
+    existing = IdempotencyKey.objects.filter(user=user, key=key).first()
+    if existing is not None and _abandoned(existing, timezone.now()):
+        # Conditional, so two retries racing for an abandoned claim delete it once
+        IdempotencyKey.objects.filter(pk=existing.pk, created_at=existing.created_at).delete()
+        existing = None
+
+    if existing is None:
+        try:
+            # Savepoint, so a lost race does not break an enclosing transaction
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(user=user, key=key, fingerprint=fingerprint)
+        except IntegrityError:
+            existing = IdempotencyKey.objects.filter(user=user, key=key).first()
+            if existing is None:
+                return None, _error("Idempotency key is being reused concurrently.", status.HTTP_409_CONFLICT)
+        else:
+            if should_prune(record.pk, PRUNE_EVERY):
+                prune_idempotency_keys()
+            return record, None
+
+    if existing.fingerprint != fingerprint:
+        return None, _error(
+            "Idempotency-Key was already used for a different request.",
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    if existing.status_code is None:
+        return None, _error(
+            "A request with this Idempotency-Key is still being processed.",
+            status.HTTP_409_CONFLICT,
+        )
+    response = Response(existing.response_body, status=existing.status_code, headers=existing.response_headers)
+    response[REPLAYED_HEADER] = 'true'
+    return None, response
+
+
+def idempotent(view):
+    """Replay the stored response when a write is retried with the same Idempotency-Key"""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key or not request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return _error(
+                f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters.",
+                status.HTTP_400_BAD_REQUEST,
+            )
+
+        record, replay = _claim(request.user, key, request_fingerprint(request))
+        if replay is not None:
+            return replay
+
+        # By pk and still pending: a request outliving its lease may have lost
+        # the key to a retry meanwhile, whose record this must not touch
+        claim = IdempotencyKey.objects.filter(pk=record.pk, status_code__isnull=True)
+        try:
+            response = view(request, *args, **kwargs)
+        except BaseException:
+            # Including SystemExit from a worker timeout, so the key is not
+            # left pending
+            claim.delete()
+            raise
+        if not _stored(response):
+            claim.delete()
+        else:
+            claim.update(
+                status_code=response.status_code,
+                response_body=getattr(response, 'data', None),
+                response_headers=_stored_headers(response),
+            )
+        return response
+    return wrapper
@@ -0,0 +1,76 @@
+"""
+Request-scoped database instrumentation.
+
+A single execute wrapper is installed on every database connection as soon as
+it is opened (see ``ApplicationsConfig.ready``). The wrapper times each query
+and adds it to the ``QueryStats`` of the request currently being served. The
+active stats object lives in a ``ContextVar`` so the same hook works for WSGI
+worker threads and for ASGI tasks that hop through ``sync_to_async``.
+
+Tracked blocks nest: when an inner block exits, its totals are added to the
+enclosing block, so e.g. a test assertion inside a request still leaves the
+request-level metrics complete.
+
+Outside of a tracked block the wrapper is a single ContextVar lookup, so it is
+cheap enough to leave installed in production.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current_stats = ContextVar('applications_query_stats', default=None)
+
+
+class QueryStats:
+    """Running totals for the queries executed inside a tracked block"""
+
+    __slots__ = ('count', 'duration')
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+def current_stats():
+    """Return the QueryStats of the active tracked block, or None"""
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries():
+    """
+    Collect query count and total DB time for the enclosed block:
+
+        with track_queries() as stats:
+            ...
+        print(stats.count, stats.duration)
+    """
+    parent = _current_stats.get()
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+        if parent is not None:
+            parent.count += stats.count
+            parent.duration += stats.duration
+
+
+def _execute_wrapper(execute, sql, params, many, context):
+    stats = _current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.count += 1
+        stats.duration += time.perf_counter() - start
+
+
+def install_execute_wrapper(sender, connection, **kwargs):
+    """connection_created handler; idempotent across reconnects"""
+    if _execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute_wrapper)
@@ -0,0 +1,197 @@
+"""
+Set-based data integrity checks behind ``manage.py verify_user_isolation``.
+
+Every check is a handful of aggregate queries per database (shards
+included), never one query per user. Anything keyed by user is streamed in
+chunks of ``CHUNK_SIZE`` users. A check returns how many rows are affected
+and up to ``SAMPLE_SIZE`` of their ids.
+
+``run_checks`` runs the (check, database) pairs in a pool of forked
+processes when asked for more than one worker. SQLite serves concurrent
+readers under WAL, so the checks overlap instead of queueing.
+"""
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Count, Exists, F, OuterRef, Sum
+from django.db.models.functions import Coalesce, Lower
+
+from . import quotas
+from .models import Interview, JobApplication
+from .resume_gc import find_orphans
+from .sharding import shard_aliases, shard_for
+
+CHUNK_SIZE = 1000
+SAMPLE_SIZE = 20
+# The statuses unique_user_application covers; it compares company and
+# position exactly, so duplicates that differ only in case slip past it
+ACTIVE_STATUSES = ('Applied', 'Interviewing', 'Assessment', 'Offered')
+
+CHECKS = {}
+
+
+def _check(name, per_database=True):
+    def register(func):
+        CHECKS[name] = (func, per_database)
+        return func
+    return register
+
+
+def databases():
+    return [DEFAULT_DB_ALIAS, *shard_aliases()]
+
+
+def chunked(iterable, size=CHUNK_SIZE):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _result(ids):
+    count, samples = 0, []
+    for value in ids:
+        count += 1
+        if len(samples) < SAMPLE_SIZE:
+            samples.append(value)
+    return count, samples
+
+
+def application_counts(alias):
+    """
+    (user_id, username, applications) for every user with applications in
+    ``alias``, in user id order, from one GROUP BY. ``username`` is None if
+    the user no longer exists.
+    """
+    rows = (
+        JobApplication.objects.using(alias).order_by('user_id')
+        .values_list('user_id').annotate(count=Count('id')).iterator(chunk_size=CHUNK_SIZE)
+    )
+    for chunk in chunked(rows):
+        usernames = dict(
+            get_user_model().objects.filter(pk__in=[user_id for user_id, _ in chunk]).values_list('pk', 'username')
+        )
+        for user_id, count in chunk:
+            yield user_id, usernames.get(user_id), count
+
+
+@_check('applications_without_user')
+def applications_without_user(alias):
+    # Shards keep no users and no foreign keys, so look the owners up in default
+    missing = [user_id for user_id, username, _ in application_counts(alias) if username is None]
+    if not missing:
+        return 0, []
+    return _result(
+        JobApplication.objects.using(alias).filter(user_id__in=missing)
+        .order_by('pk').values_list('pk', flat=True)
+    )
+
+
+@_check('interviews_without_application')
+def interviews_without_application(alias):
+    return _result(
+        Interview.objects.using(alias)
+        .filter(~Exists(JobApplication.objects.filter(pk=OuterRef('job_application_id'))))
+        .order_by('pk').values_list('pk', flat=True).iterator(chunk_size=CHUNK_SIZE)
+    )
+
+
+@_check('interviews_before_application')
+def interviews_before_application(alias):
+    return _result(
+        Interview.objects.using(alias).filter(date__lt=F('job_application__applied_date'))
+        .order_by('pk').values_list('pk', flat=True).iterator(chunk_size=CHUNK_SIZE)
+    )
+
+
+@_check('duplicate_active_applications')
+def duplicate_active_applications(alias):
+    """Groups of a user's active applications to the same company and position"""
+    groups = (
+        JobApplication.objects.using(alias).filter(status__in=ACTIVE_STATUSES)
+        .values_list('user_id', Lower('company'), Lower('position'))
+        .annotate(count=Count('id')).filter(count__gt=1).order_by()
+    )
+    count, samples = 0, []
+    for user_id, company, position, _ in groups.iterator(chunk_size=CHUNK_SIZE):
+        count += 1
+        if len(samples) < SAMPLE_SIZE:
+            samples.append(list(
+                JobApplication.objects.using(alias)
+                .filter(user_id=user_id, status__in=ACTIVE_STATUSES, company__iexact=company, position__iexact=position)
+                .order_by('pk').values_list('pk', flat=True)
+            ))
+    return count, samples
+
+
+@_check('quota_counter_drift', per_database=False)
+def quota_counter_drift(alias=None):
+    """
+    Users whose cached quota counters (``quotas.usage``) disagree with a
+    ``COUNT`` / ``SUM(resume_size)`` over their rows. Only users with a
+    counter are compared; a write in flight can show up until it commits.
+    """
+    users = get_user_model().objects.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=CHUNK_SIZE)
+    drifted = []
+    for chunk in chunked(users):
+        cached = quotas.cached_usage(chunk)
+        by_alias = defaultdict(list)
+        for user_id in cached:
+            by_alias[shard_for(user_id)].append(user_id)
+        counted = {}
+        for user_alias, user_ids in by_alias.items():
+            rows = (
+                JobApplication.objects.using(user_alias).filter(user_id__in=user_ids).order_by('user_id')
+                .values_list('user_id').annotate(count=Count('id'), size=Coalesce(Sum('resume_size'), 0))
+            )
+            counted.update({
+                user_id: {quotas.APPLICATIONS: count, quotas.RESUME_BYTES: size} for user_id, count, size in rows
+            })
+        for user_id, counters in sorted(cached.items()):
+            actual = counted.get(user_id, {quotas.APPLICATIONS: 0, quotas.RESUME_BYTES: 0})
+            if any(actual[name] != value for name, value in counters.items()):
+                drifted.append(user_id)
+    return _result(drifted)
+
+
+@_check('orphan_resume_files', per_database=False)
+def orphan_resume_files(alias=None):
+    """Stored resumes no application, hot or archived, points at (what ``gc_resumes`` deletes)"""
+    return _result(find_orphans())
+
+
+def run_check(name, alias):
+    func, _ = CHECKS[name]
+    count, samples = func(alias)
+    return {'check': name, 'database': alias, 'count': count, 'samples': samples}
+
+
+def _run_in_worker(name, alias):
+    try:
+        return run_check(name, alias)
+    finally:
+        connections.close_all()
+
+
+def run_checks(workers=1):
+    """Yield the result of each check on each database; ``workers`` > 1 runs them in forked processes"""
+    units = [
+        (name, alias)
+        for name, (_, per_database) in CHECKS.items()
+        for alias in (databases() if per_database else [None])
+    ]
+    if workers <= 1:
+        for unit in units:
+            yield run_check(*unit)
+        return
+
+    # Forked children must not share the parent's open database handles
+    connections.close_all()
+    context = multiprocessing.get_context('fork')
+    with ProcessPoolExecutor(max_workers=min(workers, len(units)), mp_context=context) as pool:
+        futures = [pool.submit(_run_in_worker, *unit) for unit in units]
+        for future in futures:
+            yield future.result()
@@ -0,0 +1,337 @@
+"""
+End-to-end load generator.
+
+Virtual users are asyncio tasks, each driving a weighted mix of dashboard
+reads, creates, updates, resume uploads and logins against a running stack.
+The HTTP client is a minimal HTTP/1.1 implementation on asyncio streams (one
+connection per request, like gunicorn's sync workers expect), so the
+generator needs nothing beyond the standard library. Plain ``http://`` only;
+point it at the local gunicorn or nginx port.
+
+Resume uploads can be throttled with ``upload_kbps`` to reproduce slow mobile
+clients holding a sync worker for the whole upload.
+"""
+import asyncio
+import json
+import random
+import time
+import uuid
+from datetime import date
+from urllib.parse import urlsplit
+
+from .benchmarks import percentile
+
+DEFAULT_MIX = 'dashboard=60,create=10,update=15,upload=5,login=10'
+
+# The dashboard page loads these in parallel (Promise.all in dashboard/page.js)
+DASHBOARD_PATHS = {
+    'job_stats': '/api/job-stats/',
+    'recent_applications': '/api/recent-applications/',
+    'upcoming_interviews': '/api/upcoming-interviews/',
+    'interview_stats': '/api/interview-stats/',
+}
+
+LOADTEST_PASSWORD = 'Lt-Secret-2024!'
+
+
+class HttpError(Exception):
+    pass
+
+
+class HttpResponse:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body or b'null')
+
+
+async def _read_body(reader, headers):
+    if 'content-length' in headers:
+        return await reader.readexactly(int(headers['content-length']))
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b';')[0].strip(), 16)
+            if size == 0:
+                await reader.readline()
+                return b''.join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+    return await reader.read()
+
+
+async def http_request(base_url, method, path, body=b'', headers=None, upload_kbps=None, timeout=60):
+    """Send one HTTP/1.1 request on a fresh connection and return the response"""
+    url = urlsplit(base_url)
+    if url.scheme != 'http':
+        raise HttpError(f'Only http:// targets are supported, got {base_url}')
+    host, port = url.hostname, url.port or 80
+
+    async def exchange():
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            lines = [
+                f'{method} {path} HTTP/1.1',
+                f'Host: {url.netloc}',
+                'Connection: close',
+                f'Content-Length: {len(body)}',
+            ]
+            lines += [f'{name}: {value}' for name, value in (headers or {}).items()]
+            writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+
+            if upload_kbps and body:
+                chunk_size = max(1024, upload_kbps * 1024 // 10)
+                for offset in range(0, len(body), chunk_size):
+                    writer.write(body[offset:offset + chunk_size])
+                    await writer.drain()
+                    await asyncio.sleep(chunk_size / (upload_kbps * 1024))
+            else:
+                writer.write(body)
+            await writer.drain()
+
+            status_line = await reader.readline()
+            if not status_line:
+                raise HttpError('Connection closed before response')
+            status = int(status_line.split()[1])
+            response_headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                response_headers[name.strip().lower()] = value.strip()
+            return HttpResponse(status, response_headers, await _read_body(reader, response_headers))
+        finally:
+            writer.close()
+
+    return await asyncio.wait_for(exchange(), timeout)
+
+
+def encode_multipart(fields, files):
+    """Encode form fields and {name: (filename, bytes, content_type)} files"""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    for name, (filename, content, content_type) in files.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'.encode() + content + b'\r\n'
+        )
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+def parse_mix(value):
+    """Parse 'dashboard=60,create=10,...' into ([actions], [weights])"""
+    actions, weights = [], []
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name not in VirtualUser.ACTIONS:
+            raise ValueError(f'Unknown action "{name}", expected one of {sorted(VirtualUser.ACTIONS)}')
+        actions.append(name)
+        weights.append(float(weight or 1))
+    return actions, weights
+
+
+class LoadStats:
+    """Latencies and errors per endpoint"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.statuses = {}
+
+    def record(self, endpoint, elapsed_ms, status):
+        self.latencies.setdefault(endpoint, []).append(elapsed_ms)
+        key = (endpoint, status)
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        if status is None or status >= 400:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def report(self, duration_s):
+        endpoints = {}
+        total = total_errors = 0
+        for endpoint, samples in sorted(self.latencies.items()):
+            samples = sorted(samples)
+            errors = self.errors.get(endpoint, 0)
+            total += len(samples)
+            total_errors += errors
+            endpoints[endpoint] = {
+                'requests': len(samples),
+                'errors': errors,
+                'error_rate': round(errors / len(samples), 4),
+                'rps': round(len(samples) / duration_s, 2),
+                'p50_ms': round(percentile(samples, 50), 2),
+                'p95_ms': round(percentile(samples, 95), 2),
+                'p99_ms': round(percentile(samples, 99), 2),
+                'max_ms': round(samples[-1], 2),
+                'statuses': {
+                    str(status): count for (name, status), count in sorted(
+                        self.statuses.items(), key=lambda item: str(item[0][1])
+                    ) if name == endpoint
+                },
+            }
+        return {
+            'duration_s': round(duration_s, 2),
+            'requests': total,
+            'errors': total_errors,
+            'error_rate': round(total_errors / total, 4) if total else 0.0,
+            'rps': round(total / duration_s, 2) if duration_s else 0.0,
+            'endpoints': endpoints,
+        }
+
+
+class VirtualUser:
+    """One simulated client: logs in, then loops over weighted actions"""
+
+    ACTIONS = ('dashboard', 'create', 'update', 'upload', 'login')
+
+    def __init__(self, index, config, stats, rng):
+        self.index = index
+        self.config = config
+        self.stats = stats
+        self.rng = rng
+        self.username = f"{config['username_prefix']}{index % config['user_pool']}"
+        self.access_token = None
+        self.application_ids = []
+        self.counter = 0
+
+    async def _call(self, endpoint, method, path, body=b'', content_type=None, auth=True, upload_kbps=None):
+        headers = {}
+        if content_type:
+            headers['Content-Type'] = content_type
+        if auth and self.access_token:
+            headers['Authorization'] = f'Bearer {self.access_token}'
+        start = time.perf_counter()
+        try:
+            response = await http_request(
+                self.config['base_url'], method, path, body, headers,
+                upload_kbps=upload_kbps, timeout=self.config['timeout'],
+            )
+        except (OSError, asyncio.TimeoutError, HttpError, ValueError):
+            self.stats.record(endpoint, (time.perf_counter() - start) * 1000, None)
+            return None
+        self.stats.record(endpoint, (time.perf_counter() - start) * 1000, response.status)
+        return response
+
+    async def _post_json(self, endpoint, path, payload, auth=True, method='POST'):
+        return await self._call(endpoint, method, path, json.dumps(payload).encode(), 'application/json', auth)
+
+    async def authenticate(self):
+        """Log in, registering the account on first use. Recorded as setup_* calls."""
+        credentials = {'username': self.username, 'password': self.config['password']}
+        response = await self._post_json('setup_login', '/api/auth/login/', credentials, auth=False)
+        if response is not None and response.status == 401:
+            response = await self._post_json('setup_register', '/api/auth/register/', {
+                **credentials, 'email': f'{self.username}@example.com',
+            }, auth=False)
+            if response is not None and response.status == 400:
+                # Another virtual user sharing this account registered it first
+                response = await self._post_json('setup_login', '/api/auth/login/', credentials, auth=False)
+        if response is not None and response.status < 400:
+            self.access_token = response.json()['tokens']['access']
+        return self.access_token is not None
+
+    async def login(self):
+        credentials = {'username': self.username, 'password': self.config['password']}
+        response = await self._post_json('login', '/api/auth/login/', credentials, auth=False)
+        if response is not None and response.status < 400:
+            self.access_token = response.json()['tokens']['access']
+
+    async def dashboard(self):
+        responses = await asyncio.gather(*(
+            self._call(name, 'GET', path) for name, path in DASHBOARD_PATHS.items()
+        ))
+        recent = responses[1]
+        if recent is not None and recent.status == 200:
+            self.application_ids = [row['id'] for row in recent.json()[:50]]
+
+    def _new_application(self):
+        self.counter += 1
+        return {
+            'company': f'LoadTest {self.index}-{self.counter}-{self.rng.randrange(10**6)}',
+            'position': 'Engineer',
+            'status': self.rng.choice(['Applied', 'Interviewing']),
+            'applied_date': date.today().isoformat(),
+            'interview_date': '2030-01-01',
+            'notes': 'x' * self.config['notes_length'],
+        }
+
+    async def create(self):
+        await self._post_json('add_job_application', '/api/add-job-application/', self._new_application())
+
+    async def update(self):
+        if not self.application_ids:
+            await self.dashboard()
+        if not self.application_ids:
+            return await self.create()
+        pk = self.rng.choice(self.application_ids)
+        await self._post_json(
+            'update_job_application', f'/api/applications/{pk}/update/',
+            {'notes': f'updated {self.counter}'}, method='PATCH',
+        )
+
+    async def upload(self):
+        body, content_type = encode_multipart(self._new_application(), {
+            'resume': ('resume.pdf', self.config['resume_bytes'], 'application/pdf'),
+        })
+        await self._call(
+            'upload_resume', 'POST', '/api/add-job-application/', body, content_type,
+            upload_kbps=self.config['upload_kbps'],
+        )
+
+    async def run(self, deadline):
+        if not await self.authenticate():
+            return
+        actions, weights = self.config['mix']
+        think = self.config['think_time_ms'] / 1000
+        while time.monotonic() < deadline:
+            action = self.rng.choices(actions, weights)[0]
+            await getattr(self, action)()
+            if think:
+                await asyncio.sleep(self.rng.uniform(0, 2 * think))
+
+
+async def run_load(config):
+    """Run ``config['users']`` virtual users for ``config['duration']`` seconds"""
+    stats = LoadStats()
+    rng = random.Random(config['seed'])
+    started = time.monotonic()
+    deadline = started + config['ramp_up'] + config['duration']
+
+    async def start_user(index):
+        if config['ramp_up']:
+            await asyncio.sleep(config['ramp_up'] * index / config['users'])
+        user = VirtualUser(index, config, stats, random.Random(rng.random()))
+        await user.run(deadline)
+
+    await asyncio.gather(*(start_user(i) for i in range(config['users'])))
+    return stats.report(time.monotonic() - started)
+
+
+def build_config(**overrides):
+    config = {
+        'base_url': 'http://127.0.0.1:8000',
+        'users': 20,
+        'duration': 30,
+        'ramp_up': 0,
+        'think_time_ms': 0,
+        'mix': parse_mix(DEFAULT_MIX),
+        'username_prefix': 'loadtest_vu_',
+        'user_pool': 20,
+        'password': LOADTEST_PASSWORD,
+        'upload_kb': 512,
+        'upload_kbps': None,
+        'notes_length': 200,
+        'timeout': 130,
+        'seed': 42,
+    }
+    config.update(overrides)
+    config['resume_bytes'] = b'%PDF-1.4\n' + b'0' * max(0, config['upload_kb'] * 1024 - 9)
+    return config
@@ -0,0 +1,53 @@
+"""
+Management command to move old, closed applications into the archive table.
+"""
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from applications.archive import BATCH_SIZE, archivable, archive_batch
+from applications.models import JobApplication
+from applications.sharding import shard_aliases
+
+
+class Command(BaseCommand):
+    help = 'Archive applications in the given statuses applied more than N days ago, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--status', action='append', dest='statuses',
+                            help='Status to archive; repeat for several (default: ARCHIVE_STATUSES)')
+        parser.add_argument('--older-than-days', type=int, default=None,
+                            help='Archive applications applied more than this many days ago (default: ARCHIVE_AFTER_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Applications moved per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the applications that would move')
+
+    def handle(self, *args, **options):
+        statuses = options['statuses'] or settings.ARCHIVE_STATUSES
+        valid = {value for value, _ in JobApplication.STATUS_CHOICES}
+        unknown = sorted(set(statuses) - valid)
+        if unknown:
+            raise CommandError(f"Unknown status {', '.join(unknown)}; choose from {', '.join(sorted(valid))}")
+        days = options['older_than_days']
+        if days is None:
+            days = settings.ARCHIVE_AFTER_DAYS
+        before = date.today() - timedelta(days=days)
+
+        total = 0
+        for alias in [DEFAULT_DB_ALIAS, *shard_aliases()]:
+            if options['dry_run']:
+                total += archivable(alias, statuses, before).count()
+                continue
+            after_id = 0
+            while ids := archive_batch(alias, statuses, before, after_id, options['batch_size']):
+                after_id = ids[-1]
+                total += len(ids)
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'  {total} applications archived...')
+
+        summary = f"{total} {'/'.join(statuses)} applications applied before {before}"
+        if options['dry_run']:
+            self.stdout.write(f'{summary} would be archived')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'[OK] Archived {summary}'))
@@ -0,0 +1,102 @@
+"""
+Management command to benchmark the API endpoints against fixed-size datasets.
+
+Runs in throwaway test databases, one per configured alias (shards
+included; the read replica mirrors default), so it never touches real data:
+
+    python manage.py benchmark_endpoints --output benchmarks/baseline.json
+    python manage.py benchmark_endpoints --compare benchmarks/baseline.json
+"""
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from applications.benchmarks import (
+    DEFAULT_SIZES,
+    SCENARIOS,
+    BenchmarkError,
+    compare_results,
+    run_benchmarks,
+)
+
+
+class Command(BaseCommand):
+    help = 'Measure latency percentiles and query counts per endpoint at fixed dataset sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                            help='Comma-separated applications-per-user dataset sizes')
+        parser.add_argument('--views', default='',
+                            help=f'Comma-separated subset of: {", ".join(s.name for s in SCENARIOS)}')
+        parser.add_argument('--iterations', type=int, default=20, help='Measured requests per view')
+        parser.add_argument('--warmup', type=int, default=3, help='Unmeasured requests per view')
+        parser.add_argument('--seed', type=int, default=42, help='Dataset seed')
+        parser.add_argument('--output', help='Write results to this JSON baseline file')
+        parser.add_argument('--compare', help='Compare results against this JSON baseline file')
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='Allowed latency growth before flagging a regression (0.25 = 25%%)')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',') if size]
+        except ValueError:
+            raise CommandError('--sizes must be a comma-separated list of integers')
+        views = [view for view in options['views'].split(',') if view]
+        unknown = set(views) - {s.name for s in SCENARIOS}
+        if unknown:
+            raise CommandError(f'Unknown views: {", ".join(sorted(unknown))}')
+
+        baseline = None
+        if options['compare']:
+            try:
+                baseline = json.loads(Path(options['compare']).read_text())
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Could not read baseline {options["compare"]}: {e}')
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, serialized_aliases=set())
+        try:
+            report = run_benchmarks(
+                sizes=sizes,
+                iterations=options['iterations'],
+                warmup=options['warmup'],
+                views=views,
+                seed=options['seed'],
+                progress=self._progress,
+            )
+        except BenchmarkError as e:
+            raise CommandError(str(e))
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        if options['output']:
+            path = Path(options['output'])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, indent=2) + '\n')
+            self.stdout.write(self.style.SUCCESS(f'[OK] Results written to {path}'))
+
+        if baseline is not None:
+            regressions = compare_results(baseline, report, tolerance=options['tolerance'])
+            if regressions:
+                for r in regressions:
+                    self.stdout.write(self.style.ERROR(
+                        f"REGRESSION size={r['size']} {r['view']} {r['metric']}: "
+                        f"{r['baseline']} -> {r['current']}"
+                    ))
+                raise CommandError(f'{len(regressions)} regression(s) against {options["compare"]}')
+            self.stdout.write(self.style.SUCCESS('[OK] No regressions against baseline'))
+
+    def _progress(self, size, view, result):
+        self.stdout.write(
+            f"size={size:<6} {view:<22} p50={result['p50_ms']:>8.2f}ms "
+            f"p95={result['p95_ms']:>8.2f}ms p99={result['p99_ms']:>8.2f}ms "
+            f"queries={result['queries']}"
+        )
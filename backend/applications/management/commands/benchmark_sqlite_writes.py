@@ -0,0 +1,65 @@
+"""
+Management command to measure concurrent SQLite write throughput with and
+without the connection profile (SQLITE_PRAGMAS, persistent connections).
+
+Runs against scratch database files in a temporary directory:
+
+    python manage.py benchmark_sqlite_writes --writers 4 --readers 2 --duration 5
+"""
+import json
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from applications.write_benchmark import DEFAULT_PRAGMAS, write_throughput
+
+
+class Command(BaseCommand):
+    help = 'Compare concurrent write throughput of the default and tuned SQLite connection profiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=4, help='Concurrent writer processes')
+        parser.add_argument('--readers', type=int, default=2, help='Concurrent reader processes')
+        parser.add_argument('--duration', type=float, default=5, help='Seconds per profile')
+        parser.add_argument('--json', action='store_true', help='Output results as JSON')
+
+    def handle(self, *args, **options):
+        profiles = [
+            ('default', DEFAULT_PRAGMAS, False),
+            ('pragmas', settings.SQLITE_PRAGMAS, False),
+            ('pragmas+persistent', settings.SQLITE_PRAGMAS, True),
+        ]
+        results = {}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name, pragmas, persistent in profiles:
+                results[name] = write_throughput(
+                    os.path.join(tmpdir, f'{name}.sqlite3'),
+                    pragmas,
+                    persistent,
+                    writers=options['writers'],
+                    readers=options['readers'],
+                    duration=options['duration'],
+                )
+                if not options['json']:
+                    self._report(name, results[name])
+
+        baseline = results['default']['commits_per_sec'] or 1
+        for result in results.values():
+            result['speedup'] = round(result['commits_per_sec'] / baseline, 2)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        tuned = results['pragmas+persistent']
+        self.stdout.write(self.style.SUCCESS(
+            f"[OK] Tuned profile: {tuned['speedup']}x the default write throughput"
+        ))
+
+    def _report(self, name, result):
+        self.stdout.write(
+            f"{name:<20} {result['commits_per_sec']:>9.1f} commits/s "
+            f"p50={result['p50_ms']:>8.2f}ms p95={result['p95_ms']:>8.2f}ms "
+            f"errors={result['errors']}"
+        )
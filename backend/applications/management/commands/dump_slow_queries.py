@@ -0,0 +1,43 @@
+"""
+Management command to print the slow-query log shared by all workers.
+"""
+import json
+
+from django.core.management.base import BaseCommand
+
+from applications.slow_queries import get_slow_query_log
+
+
+class Command(BaseCommand):
+    help = 'Dump the slow-query ring buffer (most recent first)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=50, help='Number of entries to show (0 for all)')
+        parser.add_argument('--json', action='store_true', help='Output entries as JSON')
+        parser.add_argument('--full-scans', action='store_true', help='Only show queries that scan a whole table')
+        parser.add_argument('--clear', action='store_true', help='Empty the log after dumping it')
+
+    def handle(self, *args, **options):
+        log = get_slow_query_log()
+        entries = log.entries(limit=options['limit'] or None)
+        if options['full_scans']:
+            entries = [entry for entry in entries if entry['full_scan']]
+
+        if options['json']:
+            self.stdout.write(json.dumps(entries, indent=2))
+        elif not entries:
+            self.stdout.write('No slow queries recorded')
+        else:
+            for entry in entries:
+                header = f"#{entry['seq']} {entry['recorded_at']} {entry['duration_ms']:.1f} ms view={entry['view'] or '-'}"
+                if entry['full_scan']:
+                    self.stdout.write(self.style.WARNING(header + ' [FULL SCAN]'))
+                else:
+                    self.stdout.write(header)
+                self.stdout.write(f"  {entry['sql']}")
+                for step in entry['plan'] or []:
+                    self.stdout.write(f'    {step}')
+
+        if options['clear']:
+            log.clear()
+            self.stdout.write(self.style.SUCCESS('[OK] Slow query log cleared'))
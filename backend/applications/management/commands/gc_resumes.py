@@ -0,0 +1,41 @@
+"""
+Management command to delete resume files that no application references.
+"""
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from applications.integrity import chunked
+from applications.resume_gc import BATCH_SIZE, RUN_SIZE, delete_files, find_orphans
+
+
+class Command(BaseCommand):
+    help = 'Delete files under media/resumes/ that no application, hot or archived, points at'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-age-hours', type=float, default=24,
+                            help='Leave files modified more recently than this alone (uploads in flight)')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Files deleted per batch')
+        parser.add_argument('--run-size', type=int, default=RUN_SIZE,
+                            help='Names held in memory while sorting; larger runs spill fewer temporary files')
+        parser.add_argument('--dry-run', action='store_true', help='Only list the files that would be deleted')
+
+    def handle(self, *args, **options):
+        files = total_bytes = 0
+        orphans = find_orphans(options['min_age_hours'] * 3600, options['run_size'])
+        for batch in chunked(orphans, options['batch_size']):
+            files += len(batch)
+            if options['dry_run']:
+                total_bytes += sum(default_storage.size(name) for name in batch)
+                if options['verbosity'] > 1:
+                    for name in batch:
+                        self.stdout.write(f'  {name}')
+                continue
+            total_bytes += delete_files(batch)
+            if options['verbosity'] > 1:
+                self.stdout.write(f'  {files} files deleted...')
+
+        summary = f'{files} orphaned resume files ({total_bytes / 1024 / 1024:.1f} MiB)'
+        if options['dry_run']:
+            self.stdout.write(f'{summary} would be deleted')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'[OK] Deleted {summary}'))
@@ -0,0 +1,224 @@
+"""
+Management command to generate a reproducible synthetic dataset for load and
+performance testing.
+
+Users, applications and interviews are written with batched bulk_create inside
+one transaction per batch, so a million-row database builds in minutes:
+
+    python manage.py generate_synthetic_data --users 1000 --applications-per-user 1000
+"""
+import hashlib
+import itertools
+import random
+import time
+from datetime import date, time as time_of_day, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from applications.models import JobApplication, Interview, resume_path
+from applications.sharding import shard_for
+
+User = get_user_model()
+
+DEFAULT_STATUS_WEIGHTS = 'Applied=45,Ghosted=30,Interviewing=12,Assessment=8,Offered=5'
+
+WORDS = (
+    'python django react api design scalable team product remote hybrid '
+    'backend frontend engineer experience testing cloud data pipeline '
+    'ownership mentor customers latency reliability startup growth '
+    'benefits salary equity onsite interview culture agile sprint'
+).split()
+
+POSITIONS = [
+    'Software Engineer', 'Backend Developer', 'Frontend Developer', 'Data Scientist',
+    'DevOps Engineer', 'Full Stack Developer', 'ML Engineer', 'Product Engineer',
+]
+
+INTERVIEW_TYPES = [choice for choice, _ in Interview.TYPE_CHOICES]
+
+# Smallest well-formed PDF, so generated resumes pass type sniffing
+RESUME_BYTES = (
+    b'%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n'
+    b'2 0 obj<</Type/Pages/Kids[]/Count 0>>endobj\n'
+    b'trailer<</Root 1 0 R>>\n%%EOF\n'
+)
+RESUME_METADATA = {
+    'resume_sha256': hashlib.sha256(RESUME_BYTES).hexdigest(),
+    'resume_size': len(RESUME_BYTES),
+    'resume_content_type': 'application/pdf',
+}
+
+
+def parse_status_weights(value):
+    """Parse 'Applied=45,Ghosted=30,...' into ([statuses], [weights])"""
+    valid = {choice for choice, _ in JobApplication.STATUS_CHOICES}
+    statuses, weights = [], []
+    for part in value.split(','):
+        try:
+            name, weight = part.split('=')
+            weight = float(weight)
+        except ValueError:
+            raise CommandError(f'Invalid status weight "{part}", expected Status=weight')
+        if name not in valid:
+            raise CommandError(f'Unknown status "{name}", expected one of {sorted(valid)}')
+        statuses.append(name)
+        weights.append(weight)
+    return statuses, weights
+
+
+class TextPool:
+    """Cheap random text: slices of one large pre-generated blob"""
+
+    def __init__(self, rng, size=200_000):
+        self.rng = rng
+        self.blob = ' '.join(rng.choice(WORDS) for _ in range(size // 6))
+
+    def text(self, mean_length):
+        if mean_length <= 0:
+            return None
+        length = max(1, int(self.rng.expovariate(1 / mean_length)))
+        length = min(length, len(self.blob) // 2)
+        start = self.rng.randrange(0, len(self.blob) - length)
+        return self.blob[start:start + length]
+
+
+class Command(BaseCommand):
+    help = 'Generate a seeded synthetic dataset of users, applications and interviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='Number of users to create')
+        parser.add_argument('--applications-per-user', type=int, default=100,
+                            help='Mean applications per user (actual count varies +/-50%%)')
+        parser.add_argument('--exact', action='store_true',
+                            help='Give every user exactly --applications-per-user applications')
+        parser.add_argument('--status-weights', default=DEFAULT_STATUS_WEIGHTS,
+                            help=f'Relative status distribution (default: {DEFAULT_STATUS_WEIGHTS})')
+        parser.add_argument('--interview-rate', type=float, default=0.9,
+                            help='Probability that an Interviewing/Assessment/Offered application has interviews')
+        parser.add_argument('--max-interviews', type=int, default=3,
+                            help='Maximum interviews per application that has any')
+        parser.add_argument('--description-length', type=int, default=1500,
+                            help='Mean job_description length in characters (0 for none)')
+        parser.add_argument('--notes-length', type=int, default=200,
+                            help='Mean notes length in characters (0 for none)')
+        parser.add_argument('--resume-rate', type=float, default=0.0,
+                            help='Fraction of applications that get a resume file')
+        parser.add_argument('--days', type=int, default=365, help='Spread applied dates over this many past days')
+        parser.add_argument('--username-prefix', default='loadtest_user_', help='Prefix for generated usernames')
+        parser.add_argument('--password', default='loadtest-pass-123', help='Password for every generated user')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducible output')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk_create batch')
+        parser.add_argument('--clear', action='store_true',
+                            help='Delete previously generated users (matching the prefix) first')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        statuses, weights = parse_status_weights(options['status_weights'])
+        cum_weights = list(itertools.accumulate(weights))
+        prefix = options['username_prefix']
+        batch_size = options['batch_size']
+        started = time.monotonic()
+
+        if options['clear']:
+            deleted, _ = User.objects.filter(username__startswith=prefix).delete()
+            self.stdout.write(f'Deleted {deleted} existing rows for users starting with "{prefix}"')
+
+        if User.objects.filter(username__startswith=prefix).exists():
+            raise CommandError(f'Users starting with "{prefix}" already exist; use --clear or another --username-prefix')
+
+        # Hash once: create_user would run the password hasher for every user
+        password = make_password(options['password'])
+        users = [
+            User(username=f'{prefix}{i}', email=f'{prefix}{i}@example.com', password=password)
+            for i in range(options['users'])
+        ]
+        with transaction.atomic():
+            User.objects.bulk_create(users, batch_size=batch_size)
+        user_ids = list(
+            User.objects.filter(username__startswith=prefix).order_by('id').values_list('id', flat=True)
+        )
+        self.stdout.write(f'Created {len(user_ids)} users')
+
+        texts = TextPool(rng)
+        today = date.today()
+        mean = options['applications_per_user']
+        app_total = interview_total = resume_total = 0
+        pending = []
+
+        for user_id in user_ids:
+            if options['exact'] or mean <= 1:
+                count = mean
+            else:
+                count = rng.randint(mean // 2, mean + mean // 2)
+            for n in range(count):
+                status = rng.choices(statuses, cum_weights=cum_weights)[0]
+                job = JobApplication(
+                    user_id=user_id,
+                    # The index keeps (user, company, position) unique for active statuses
+                    company=f'Company {n}',
+                    position=rng.choice(POSITIONS),
+                    applied_date=today - timedelta(days=rng.randrange(options['days'])),
+                    status=status,
+                    job_description=texts.text(options['description_length']),
+                    notes=texts.text(options['notes_length']),
+                    contact_email=f'hr{n}@company{n}.example.com',
+                )
+                if options['resume_rate'] and rng.random() < options['resume_rate']:
+                    job.resume = default_storage.save(
+                        resume_path(user_id, f'synthetic_{n}.pdf'), ContentFile(RESUME_BYTES)
+                    )
+                    for field, value in RESUME_METADATA.items():
+                        setattr(job, field, value)
+                    resume_total += 1
+                pending.append(job)
+
+                if len(pending) >= batch_size:
+                    interview_total += self._flush(pending, rng, options)
+                    app_total += len(pending)
+                    pending = []
+                    self.stdout.write(f'  {app_total} applications written...')
+
+        if pending:
+            interview_total += self._flush(pending, rng, options)
+            app_total += len(pending)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'[OK] Generated {len(user_ids)} users, {app_total} applications, '
+            f'{interview_total} interviews and {resume_total} resumes in {elapsed:.1f}s '
+            f'(seed={options["seed"]})'
+        ))
+
+    def _flush(self, jobs, rng, options):
+        """Write one batch of applications and their interviews, per shard when sharded"""
+        by_shard = {}
+        for job in jobs:
+            by_shard.setdefault(shard_for(job.user_id), []).append(job)
+        return sum(
+            self._flush_shard(alias, shard_jobs, rng, options)
+            for alias, shard_jobs in by_shard.items()
+        )
+
+    def _flush_shard(self, alias, jobs, rng, options):
+        with transaction.atomic(using=alias):
+            JobApplication.objects.using(alias).bulk_create(jobs, batch_size=options['batch_size'])
+            interviews = []
+            for job in jobs:
+                if job.status not in ('Interviewing', 'Assessment', 'Offered'):
+                    continue
+                if rng.random() >= options['interview_rate']:
+                    continue
+                for _ in range(rng.randint(1, max(1, options['max_interviews']))):
+                    interviews.append(Interview(
+                        job_application_id=job.pk,
+                        date=job.applied_date + timedelta(days=rng.randint(3, 60)),
+                        time=time_of_day(rng.randint(9, 17), rng.choice((0, 30))),
+                        type=rng.choice(INTERVIEW_TYPES),
+                    ))
+            Interview.objects.using(alias).bulk_create(interviews, batch_size=options['batch_size'])
+        return len(interviews)
@@ -0,0 +1,185 @@
+"""
+Management command to run a concurrent end-to-end load test.
+
+Either targets a running stack (--url) or boots one locally (--boot): gunicorn
+with the same flags as start.sh, optionally behind nginx (--nginx). The booted
+server uses the configured database, so point DATABASES at a scratch copy
+before load testing.
+
+    python manage.py load_test --boot --users 50 --duration 60 --upload-kbps 64
+"""
+import asyncio
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from applications.loadtest import DEFAULT_MIX, build_config, parse_mix, run_load
+
+NGINX_CONF = """
+worker_processes 1;
+pid {prefix}/nginx.pid;
+error_log {prefix}/error.log;
+events {{ worker_connections 4096; }}
+http {{
+    access_log off;
+    client_max_body_size 20m;
+    client_body_temp_path {prefix}/client_body;
+    proxy_temp_path {prefix}/proxy;
+    fastcgi_temp_path {prefix}/fastcgi;
+    uwsgi_temp_path {prefix}/uwsgi;
+    scgi_temp_path {prefix}/scgi;
+    upstream backend {{ server 127.0.0.1:{backend_port}; }}
+    server {{
+        listen 127.0.0.1:{port};
+        location / {{
+            proxy_pass http://backend;
+            proxy_set_header Host $host;
+            proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
+        }}
+    }}
+}}
+"""
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+class Command(BaseCommand):
+    help = 'Drive a concurrent mix of API traffic and report throughput, latency and errors per endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Target base URL (ignored with --boot)')
+        parser.add_argument('--boot', action='store_true', help='Start gunicorn locally for the duration of the test')
+        parser.add_argument('--port', type=int, default=8765, help='Port for the booted gunicorn')
+        parser.add_argument('--workers', type=int, default=3, help='gunicorn --workers for the booted server')
+        parser.add_argument('--worker-class', default='sync', help='gunicorn --worker-class for the booted server')
+        parser.add_argument('--timeout', type=int, default=120, help='gunicorn --timeout for the booted server')
+        parser.add_argument('--nginx', action='store_true', help='Put nginx in front of the booted gunicorn')
+        parser.add_argument('--nginx-port', type=int, default=8766, help='Port for the booted nginx')
+        parser.add_argument('--users', type=int, default=20, help='Concurrent virtual users')
+        parser.add_argument('--user-pool', type=int, default=None,
+                            help='Distinct accounts shared by virtual users (default: one per user)')
+        parser.add_argument('--duration', type=float, default=30, help='Seconds of steady load')
+        parser.add_argument('--ramp-up', type=float, default=0, help='Seconds over which users are started')
+        parser.add_argument('--think-time', type=int, default=0, help='Mean pause between actions in ms')
+        parser.add_argument('--mix', default=DEFAULT_MIX, help=f'Weighted action mix (default: {DEFAULT_MIX})')
+        parser.add_argument('--upload-kb', type=int, default=512, help='Resume upload size in KB')
+        parser.add_argument('--upload-kbps', type=int, default=None,
+                            help='Throttle resume uploads to this many KB/s (simulates slow clients)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the action mix')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+        parser.add_argument('--output', help='Also write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options['mix'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        processes = []
+        tmpdir = None
+        base_url = options['url']
+        try:
+            if options['boot']:
+                processes.append(self._boot_gunicorn(options))
+                base_url = f"http://127.0.0.1:{options['port']}"
+                if options['nginx']:
+                    tmpdir = tempfile.mkdtemp(prefix='job_journey_nginx_')
+                    processes.append(self._boot_nginx(options, tmpdir))
+                    base_url = f"http://127.0.0.1:{options['nginx_port']}"
+
+            config = build_config(
+                base_url=base_url,
+                users=options['users'],
+                user_pool=options['user_pool'] or options['users'],
+                duration=options['duration'],
+                ramp_up=options['ramp_up'],
+                think_time_ms=options['think_time'],
+                mix=mix,
+                upload_kb=options['upload_kb'],
+                upload_kbps=options['upload_kbps'],
+                timeout=options['timeout'] + 10,
+                seed=options['seed'],
+            )
+            self.stdout.write(
+                f"Running {options['users']} virtual users against {base_url} for {options['duration']}s..."
+            )
+            report = asyncio.run(run_load(config))
+        finally:
+            for process in reversed(processes):
+                process.terminate()
+                try:
+                    process.wait(timeout=15)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+            if tmpdir:
+                shutil.rmtree(tmpdir, ignore_errors=True)
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(report, indent=2) + '\n')
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self._print_report(report)
+
+    def _boot_gunicorn(self, options):
+        app = 'job_journey.asgi:application' if 'uvicorn' in options['worker_class'] else 'job_journey.wsgi:application'
+        command = [
+            sys.executable, '-m', 'gunicorn',
+            '--bind', f"127.0.0.1:{options['port']}",
+            '--workers', str(options['workers']),
+            '--worker-class', options['worker_class'],
+            '--timeout', str(options['timeout']),
+            app,
+        ]
+        self.stdout.write(f"Starting {' '.join(command[2:])}")
+        # Run from BASE_DIR so gunicorn.conf.py is picked up like in production
+        process = subprocess.Popen(command, cwd=settings.BASE_DIR, env=os.environ.copy())
+        if not wait_for_port(options['port']):
+            process.kill()
+            raise CommandError('gunicorn did not start listening within 30s')
+        return process
+
+    def _boot_nginx(self, options, tmpdir):
+        nginx = shutil.which('nginx')
+        if not nginx:
+            raise CommandError('nginx is not installed; drop --nginx to test gunicorn directly')
+        conf = Path(tmpdir) / 'nginx.conf'
+        conf.write_text(NGINX_CONF.format(prefix=tmpdir, port=options['nginx_port'], backend_port=options['port']))
+        process = subprocess.Popen([nginx, '-p', tmpdir, '-c', str(conf), '-g', 'daemon off;'])
+        if not wait_for_port(options['nginx_port']):
+            process.kill()
+            raise CommandError('nginx did not start listening within 30s')
+        return process
+
+    def _print_report(self, report):
+        self.stdout.write(
+            f"\n{report['requests']} requests in {report['duration_s']}s: "
+            f"{report['rps']} req/s, error rate {report['error_rate']:.2%}\n"
+        )
+        self.stdout.write(
+            f"{'endpoint':<24}{'reqs':>7}{'rps':>9}{'err%':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}"
+        )
+        for name, row in report['endpoints'].items():
+            line = (
+                f"{name:<24}{row['requests']:>7}{row['rps']:>9.2f}{row['error_rate']:>8.1%}"
+                f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['max_ms']:>10.1f}"
+            )
+            self.stdout.write(self.style.ERROR(line) if row['errors'] else line)
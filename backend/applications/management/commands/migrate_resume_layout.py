@@ -0,0 +1,37 @@
+"""
+Management command to move resumes uploaded under the old flat ``resumes/``
+directory into the sharded layout. Safe to interrupt and run again.
+"""
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from applications.models import ArchivedApplication, JobApplication
+from applications.resume_layout import BATCH_SIZE, relocate_batch
+from applications.sharding import shard_aliases
+
+
+class Command(BaseCommand):
+    help = 'Move existing resume files into resumes/<hash prefix>/<user id>/ and rewrite their paths, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Rows rewritten per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the files that would move')
+
+    def handle(self, *args, **options):
+        moved = missing = 0
+        for alias in [DEFAULT_DB_ALIAS, *shard_aliases()]:
+            for model in (JobApplication, ArchivedApplication):
+                after_id = 0
+                while batch := relocate_batch(model, alias, after_id, options['batch_size'], options['dry_run']):
+                    after_id, batch_moved, batch_missing = batch
+                    moved += batch_moved
+                    missing += batch_missing
+                    if options['verbosity'] > 1:
+                        self.stdout.write(f'  {alias} {model._meta.model_name} up to id {after_id}: {moved} moved')
+
+        if missing:
+            self.stdout.write(self.style.WARNING(f'{missing} rows point at missing files; left as they are'))
+        if options['dry_run']:
+            self.stdout.write(f'{moved} resume files would move')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'[OK] Moved {moved} resume files'))
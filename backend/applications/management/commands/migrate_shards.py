@@ -0,0 +1,23 @@
+"""
+Management command to migrate the default database and every shard.
+"""
+import os
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from applications.sharding import shard_aliases
+
+
+class Command(BaseCommand):
+    help = 'Run migrate on the default database and on each of the DB_SHARDS shard files'
+
+    def handle(self, *args, **options):
+        os.makedirs(settings.SHARD_DIR, exist_ok=True)
+        for alias in [DEFAULT_DB_ALIAS, *shard_aliases()]:
+            self.stdout.write(f'Migrating {alias}...')
+            call_command('migrate', database=alias, interactive=False,
+                         verbosity=options['verbosity'], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f'[OK] Migrated default and {settings.DB_SHARDS} shards'))
@@ -0,0 +1,60 @@
+"""
+Management command to move each user's applications and interviews onto the
+shard they hash to: after DB_SHARDS was raised, or when sharding is first
+turned on with the data still in the default database.
+
+Run it with the API stopped. A user's reads move to the new shard as soon as
+DB_SHARDS changes, and rows written to the old database during the move
+would be left behind.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from applications.models import ArchivedApplication, JobApplication
+from applications.sharding import id_range, is_shard, move_user_rows, shard_aliases, shard_for
+
+
+class Command(BaseCommand):
+    help = 'Move users whose rows are not on the shard they hash to (run after raising DB_SHARDS)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report which users would move')
+
+    def handle(self, *args, **options):
+        if settings.DB_SHARDS <= 0:
+            raise CommandError('Sharding is off; set DB_SHARDS and run migrate_shards first')
+
+        users = applications = interviews = 0
+        for source in [DEFAULT_DB_ALIAS, *shard_aliases()]:
+            user_ids = sorted({
+                user_id
+                for model in (JobApplication, ArchivedApplication)
+                for user_id in model.objects.using(source).order_by().values_list('user_id', flat=True).distinct()
+            })
+            for user_id in user_ids:
+                target = shard_for(user_id)
+                if target == source:
+                    continue
+                if is_shard(source) and id_range(target) < id_range(source):
+                    # Only happens if DB_SHARDS went down: the rows' ids would
+                    # sit above the target's own range and collide later
+                    raise CommandError(f'User {user_id} would move from {source} down to {target}; '
+                                       'removing shards is not supported')
+                users += 1
+                if options['dry_run']:
+                    self.stdout.write(f'  user {user_id}: {source} -> {target}')
+                    continue
+                moved_applications, moved_interviews = move_user_rows(user_id, source, target)
+                applications += moved_applications
+                interviews += moved_interviews
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'  user {user_id}: {source} -> {target} '
+                                      f'({moved_applications} applications, {moved_interviews} interviews)')
+
+        if options['dry_run']:
+            self.stdout.write(f'{users} users would move')
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'[OK] Moved {users} users ({applications} applications, {interviews} interviews)'
+            ))
@@ -0,0 +1,29 @@
+"""
+Management command to mark stale "Applied" applications as "Ghosted".
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from applications.ghosting import CHUNK_SIZE, sweep
+
+
+class Command(BaseCommand):
+    help = ('Move "Applied" applications with no interview and no change for GHOST_AFTER_DAYS '
+            '(or the user\'s ghost_after_days) to "Ghosted"')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Users per UPDATE')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the applications that would move')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        moved = sweep(dry_run=options['dry_run'], chunk_size=options['chunk_size'])
+        if options['dry_run']:
+            self.stdout.write(f'{moved} applications would be marked Ghosted')
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'[OK] Marked {moved} applications Ghosted in {time.monotonic() - started:.1f}s '
+                f'(default after {settings.GHOST_AFTER_DAYS} days)'
+            ))
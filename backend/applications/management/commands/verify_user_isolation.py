@@ -1,60 +1,75 @@
 """
 Management command to verify that all job applications are properly linked to users
-and that user isolation is working correctly.
+and that user isolation is working correctly, plus further data integrity checks
+(see ``applications.integrity``).
 """
-from django.core.management.base import BaseCommand
-from django.contrib.auth.models import User
-from applications.models import JobApplication, Interview
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from applications.integrity import application_counts, databases, run_checks
+from applications.models import Interview
+
+MESSAGES = {
+    'applications_without_user': 'applications without users',
+    'interviews_without_application': 'interviews linked to missing applications',
+    'interviews_before_application': 'interviews dated before their application',
+    'duplicate_active_applications': 'groups of duplicate active applications',
+    'quota_counter_drift': 'users whose cached quota counters disagree with their rows',
+    'orphan_resume_files': 'resume files no application references',
+}
 
 
 class Command(BaseCommand):
     help = 'Verify that all job applications are linked to users and user isolation is working'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help='Write one JSON object per line instead of text')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Processes running the checks in parallel (default: 1, in this process)')
+
     def handle(self, *args, **options):
-        self.stdout.write('Verifying user isolation...\n')
-        
-        # Check for applications without users
-        apps_without_user = JobApplication.objects.filter(user__isnull=True)
-        if apps_without_user.exists():
-            self.stdout.write(
-                self.style.ERROR(
-                    f'ERROR: Found {apps_without_user.count()} applications without users!'
-                )
-            )
-            return
-        
-        self.stdout.write(self.style.SUCCESS('[OK] All applications have users assigned'))
-        
-        # Check user distribution
-        user_counts = {}
-        for user in User.objects.all():
-            count = JobApplication.objects.filter(user=user).count()
-            if count > 0:
-                user_counts[user.username] = count
-        
-        if user_counts:
-            self.stdout.write('\nUser application counts:')
-            for username, count in user_counts.items():
-                self.stdout.write(f'  {username}: {count} applications')
+        as_json = options['json']
+        if not as_json:
+            self.stdout.write('Verifying user isolation...\n')
+            self.stdout.write('User application counts:')
+
+        found = False
+        for alias in databases():
+            for user_id, username, count in application_counts(alias):
+                found = True
+                if as_json:
+                    self._json(type='user', user_id=user_id, username=username, database=alias, applications=count)
+                else:
+                    self.stdout.write(f'  {username or f"<missing user {user_id}>"}: {count} applications')
+        if not found and not as_json:
+            self.stdout.write('  No applications found in database')
+
+        total_interviews = sum(Interview.objects.using(alias).count() for alias in databases())
+        if as_json:
+            self._json(type='interviews', total=total_interviews)
         else:
-            self.stdout.write('\nNo applications found in database')
-        
-        # Check interviews
-        total_interviews = Interview.objects.count()
-        self.stdout.write(f'\nTotal interviews: {total_interviews}')
-        
-        # Verify all interviews belong to applications with users
-        interviews_without_user = Interview.objects.filter(
-            job_application__user__isnull=True
-        )
-        if interviews_without_user.exists():
-            self.stdout.write(
-                self.style.ERROR(
-                    f'ERROR: Found {interviews_without_user.count()} interviews linked to applications without users!'
-                )
-            )
-            return
-        
-        self.stdout.write(self.style.SUCCESS('[OK] All interviews are linked to applications with users'))
-        
-        self.stdout.write(self.style.SUCCESS('\n[OK] User isolation verification complete!'))
+            self.stdout.write(f'\nTotal interviews: {total_interviews}\n')
+
+        failed = 0
+        for result in run_checks(options['workers']):
+            failed += bool(result['count'])
+            if as_json:
+                self._json(type='check', **result)
+                continue
+            where = f" in {result['database']}" if result['database'] else ''
+            if result['count']:
+                self.stdout.write(self.style.ERROR(
+                    f"ERROR: Found {result['count']} {MESSAGES[result['check']]}{where} "
+                    f"(e.g. {', '.join(map(str, result['samples']))})"
+                ))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"[OK] No {MESSAGES[result['check']]}{where}"))
+
+        if failed:
+            raise CommandError(f'{failed} integrity checks failed')
+        if not as_json:
+            self.stdout.write(self.style.SUCCESS('\n[OK] User isolation verification complete!'))
+
+    def _json(self, **fields):
+        self.stdout.write(json.dumps(fields))
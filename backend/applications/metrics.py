@@ -0,0 +1,117 @@
+"""
+Per-route request metrics exposed in Prometheus text format.
+
+``MetricsMiddleware`` records request counts, latency, DB query counts and DB
+time for every request, labelled by the matched URL pattern (not the raw
+path, so ``/api/applications/<int:pk>/`` is one series regardless of pk).
+
+Under gunicorn every worker is a separate process. When
+``PROMETHEUS_MULTIPROC_DIR`` is set (``gunicorn.conf.py`` does this), each
+worker writes its samples to mmap'd files in that directory and ``/metrics``
+aggregates all of them, so any worker can answer a scrape.
+"""
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from .instrumentation import track_queries
+
+UNMATCHED_ROUTE = '<unmatched>'
+
+REQUESTS = Counter(
+    'job_journey_http_requests_total',
+    'HTTP requests by route, method and response status',
+    ['route', 'method', 'status'],
+)
+LATENCY = Histogram(
+    'job_journey_http_request_duration_seconds',
+    'End-to-end request latency in seconds',
+    ['route', 'method'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+DB_QUERIES = Histogram(
+    'job_journey_http_request_db_queries',
+    'Database queries executed per request',
+    ['route', 'method'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250, 1000),
+)
+DB_DURATION = Histogram(
+    'job_journey_http_request_db_duration_seconds',
+    'Time spent in the database per request in seconds',
+    ['route', 'method'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+
+
+def _route_label(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None or not match.route:
+        return UNMATCHED_ROUTE
+    return '/' + match.route
+
+
+class MetricsMiddleware:
+    """Record per-route latency, status and DB usage for each request"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with track_queries() as stats:
+            response = self.get_response(request)
+        self._observe(request, response, stats, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with track_queries() as stats:
+            response = await self.get_response(request)
+        self._observe(request, response, stats, time.perf_counter() - start)
+        return response
+
+    def _observe(self, request, response, stats, elapsed):
+        route = _route_label(request)
+        method = request.method
+        REQUESTS.labels(route, method, response.status_code).inc()
+        LATENCY.labels(route, method).observe(elapsed)
+        DB_QUERIES.labels(route, method).observe(stats.count)
+        DB_DURATION.labels(route, method).observe(stats.duration)
+
+
+def metrics(request):
+    """Prometheus scrape endpoint, aggregated across all workers"""
+    token = settings.METRICS_TOKEN
+    if not token:
+        # Open only in development; per-route traffic is not for everyone
+        if not settings.DEBUG:
+            return HttpResponseForbidden()
+    elif request.headers.get('Authorization') != f'Bearer {token}':
+        return HttpResponseForbidden()
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.7 on 2026-10-19 18:55
+
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0013_idempotency_key'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedApplication',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('company', models.CharField(max_length=100)),
+                ('position', models.CharField(max_length=100)),
+                ('applied_date', models.DateField()),
+                ('status', models.CharField(choices=[('Applied', 'Applied'), ('Ghosted', 'Ghosted'), ('Interviewing', 'Interviewing'), ('Assessment', 'Assessment'), ('Offered', 'Offered')], max_length=20)),
+                ('resume', models.FileField(blank=True, null=True, upload_to='resumes/')),
+                ('job_description', models.TextField(blank=True, null=True)),
+                ('contact_email', models.EmailField(blank=True, max_length=254, null=True)),
+                ('contact_phone', models.CharField(blank=True, max_length=20, null=True)),
+                ('company_website', models.URLField(blank=True, null=True)),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField()),
+                ('interviews', models.JSONField(default=list, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_applications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-applied_date'],
+                'indexes': [models.Index(fields=['user', 'applied_date'], name='application_user_id_790e4d_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.7 on 2026-10-19 19:10
+
+import applications.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0015_user_preferences'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedapplication',
+            name='resume',
+            field=models.FileField(blank=True, max_length=255, null=True, upload_to=applications.models.resume_upload_to),
+        ),
+        migrations.AlterField(
+            model_name='jobapplication',
+            name='resume',
+            field=models.FileField(blank=True, max_length=255, null=True, upload_to=applications.models.resume_upload_to),
+        ),
+    ]
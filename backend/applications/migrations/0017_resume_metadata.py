@@ -0,0 +1,43 @@
+# Generated by Django 5.0.7 on 2026-10-19 19:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0016_resume_layout'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedapplication',
+            name='resume_content_type',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedapplication',
+            name='resume_sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedapplication',
+            name='resume_size',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='resume_content_type',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='resume_sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='resume_size',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
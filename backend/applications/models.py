@@ -1,7 +1,39 @@
 from django.db import models
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
 from datetime import date as date_func
+import hashlib
+import posixpath
+
+from .sharding import shard_for
+
+
+def resume_path(user_id, filename):
+    """
+    ``resumes/<2 hex>/<2 hex>/<user id>/<filename>``: the hash prefix spreads
+    users over 65536 directories, so no directory grows with the user base
+    """
+    digest = hashlib.md5(str(user_id).encode()).hexdigest()
+    return f'resumes/{digest[:2]}/{digest[2:4]}/{user_id}/{posixpath.basename(filename)}'
+
+
+def resume_upload_to(instance, filename):
+    return resume_path(instance.user_id, filename)
+
+
+class UserScopedQuerySet(models.QuerySet):
+    # Lookup from the model to its owning user
+    user_lookup = 'user'
+
+    def for_user(self, user):
+        """``user``'s rows, read from their shard when sharding is on"""
+        return self.using(shard_for(user.pk)).filter(**{self.user_lookup: user})
+
+
+class InterviewQuerySet(UserScopedQuerySet):
+    user_lookup = 'job_application__user'
+
 
 class JobApplication(models.Model):
     STATUS_CHOICES = [
@@ -24,7 +56,11 @@ class JobApplication(models.Model):
     position = models.CharField(max_length=100)
     applied_date = models.DateField(default=date_func.today, db_index=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="Applied")
-    resume = models.FileField(upload_to="resumes/", blank=True, null=True)
+    resume = models.FileField(upload_to=resume_upload_to, max_length=255, blank=True, null=True)
+    # Computed while the upload streams in (see uploads.py)
+    resume_sha256 = models.CharField(max_length=64, blank=True, null=True, db_index=True)
+    resume_size = models.PositiveIntegerField(blank=True, null=True)
+    resume_content_type = models.CharField(max_length=100, blank=True, null=True)
     
     # Additional details
     job_description = models.TextField(blank=True, null=True)
@@ -32,12 +68,17 @@ class JobApplication(models.Model):
     contact_phone = models.CharField(max_length=20, blank=True, null=True)
     company_website = models.URLField(blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
+    # Bumped on every save(); bulk .update() calls must set it explicitly
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = UserScopedQuerySet.as_manager()
 
     class Meta:
         # Composite index for common query patterns
         indexes = [
             models.Index(fields=['user', 'applied_date']),
             models.Index(fields=['user', 'status']),
+            models.Index(fields=['user', 'updated_at']),
         ]
         # Ordering for default queries
         ordering = ['-applied_date']
@@ -73,12 +114,16 @@ class Interview(models.Model):
     date = models.DateField(db_index=True)
     time = models.TimeField()
     type = models.CharField(max_length=20, choices=TYPE_CHOICES)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = InterviewQuerySet.as_manager()
 
     class Meta:
         # Index for filtering upcoming interviews
         indexes = [
             models.Index(fields=['date', 'time']),
             models.Index(fields=['job_application', 'date']),
+            models.Index(fields=['job_application', 'updated_at']),
         ]
         # Ordering for default queries
         ordering = ['date', 'time']
@@ -89,4 +134,147 @@ class Interview(models.Model):
     @property
     def user(self):
         """Convenience property to access the user through job_application"""
-        return self.job_application.user
\ No newline at end of file
+        return self.job_application.user
+
+class ArchivedApplication(models.Model):
+    """
+    A job application moved out of the hot ``JobApplication`` table by
+    ``manage.py archive_applications``, with the same id. Its interviews are
+    kept inline in ``interviews``. Endpoints only read it with
+    ``?include_archived=1``.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_applications',
+    )
+    company = models.CharField(max_length=100)
+    position = models.CharField(max_length=100)
+    applied_date = models.DateField()
+    status = models.CharField(max_length=20, choices=JobApplication.STATUS_CHOICES)
+    resume = models.FileField(upload_to=resume_upload_to, max_length=255, blank=True, null=True)
+    # Computed while the upload streams in (see uploads.py)
+    resume_sha256 = models.CharField(max_length=64, blank=True, null=True, db_index=True)
+    resume_size = models.PositiveIntegerField(blank=True, null=True)
+    resume_content_type = models.CharField(max_length=100, blank=True, null=True)
+    job_description = models.TextField(blank=True, null=True)
+    contact_email = models.EmailField(blank=True, null=True)
+    contact_phone = models.CharField(max_length=20, blank=True, null=True)
+    company_website = models.URLField(blank=True, null=True)
+    notes = models.TextField(blank=True, null=True)
+    # Last change while the application was hot
+    updated_at = models.DateTimeField()
+    # [{"id", "date", "time", "type", "updated_at"}, ...] in date/time order
+    interviews = models.JSONField(default=list, encoder=DjangoJSONEncoder)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    objects = UserScopedQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'applied_date']),
+        ]
+        ordering = ['-applied_date']
+
+    def __str__(self):
+        return f"{self.company} - {self.position} (archived)"
+
+
+class UserPreferences(models.Model):
+    """Per-user settings; a user without a row gets the site defaults"""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='preferences',
+    )
+    # Days an "Applied" application may sit without an interview or a change
+    # before the ghosting sweep marks it "Ghosted"; null = GHOST_AFTER_DAYS, 0 = never
+    ghost_after_days = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Preferences for user {self.user_id}"
+
+
+class ChangeEvent(models.Model):
+    """
+    A change to one user's data, appended by the write paths and streamed to
+    that user's open dashboards by the SSE endpoint. Old rows are pruned.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='change_events',
+    )
+    kind = models.CharField(max_length=40)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        # Streams read "this user's events after id N"
+        indexes = [
+            models.Index(fields=['user', 'id']),
+        ]
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} for user {self.user_id}"
+
+
+class Tombstone(models.Model):
+    """
+    Records a deleted application or interview so delta sync (/api/sync/)
+    can tell clients to drop it. Pruned after SYNC_TOMBSTONE_RETENTION_DAYS.
+    """
+    APPLICATION = 'application'
+    INTERVIEW = 'interview'
+    KIND_CHOICES = [
+        (APPLICATION, 'Application'),
+        (INTERVIEW, 'Interview'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='tombstones',
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'deleted_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} deleted at {self.deleted_at}"
+
+
+class IdempotencyKey(models.Model):
+    """
+    A client-supplied Idempotency-Key and the response it produced, replayed
+    when the same request is retried. ``status_code`` is NULL while the first
+    request is still running. Pruned after IDEMPOTENCY_KEY_TTL_HOURS.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='idempotency_keys',
+    )
+    key = models.CharField(max_length=255)
+    # sha256 of method, path and request data; a reused key must match it
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    # Headers the view set, e.g. Retry-After; replayed with the body
+    response_headers = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='unique_user_idempotency_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.key} for user {self.user_id}"
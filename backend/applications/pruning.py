@@ -0,0 +1,25 @@
+"""
+Batched deletes for the append-only housekeeping tables (change events,
+tombstones, idempotency keys).
+
+Deleting a large backlog in one statement holds SQLite's write lock for the
+whole delete and blocks every other writer; deleting a bounded batch per
+statement lets regular writes interleave.
+"""
+BATCH_SIZE = 1000
+
+
+def delete_in_batches(queryset, batch_size=BATCH_SIZE):
+    """Delete the rows matched by ``queryset``, ``batch_size`` at a time. Returns the count."""
+    model = queryset.model
+    deleted = 0
+    while True:
+        ids = list(queryset.order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += model.objects.filter(pk__in=ids).delete()[0]
+
+
+def should_prune(pk, every):
+    """True for every ``every``-th inserted row, so pruning runs occasionally on the write path"""
+    return bool(pk) and pk % every == 0
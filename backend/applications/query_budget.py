@@ -0,0 +1,89 @@
+"""
+Per-request query budget.
+
+``QueryBudgetMiddleware`` counts the queries each request runs (using the
+execute wrapper from ``instrumentation``). Requests over ``QUERY_BUDGET`` are
+logged, and when ``QUERY_BUDGET_HEADERS`` is on (the default in DEBUG) every
+response carries ``X-DB-Query-Count`` and ``X-DB-Query-Duration-Ms``.
+
+``max_queries`` enforces a budget in tests, as a context manager or decorator:
+
+    with max_queries(5):
+        self.client.get(reverse('recent_applications'))
+"""
+import logging
+from contextlib import ContextDecorator
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .instrumentation import track_queries
+
+logger = logging.getLogger('applications')
+
+QUERY_COUNT_HEADER = 'X-DB-Query-Count'
+QUERY_DURATION_HEADER = 'X-DB-Query-Duration-Ms'
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised by max_queries when the enclosed block runs too many queries"""
+
+
+class max_queries(ContextDecorator):
+    """Fail if the enclosed block executes more than ``limit`` queries"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.stats = None
+        self._tracker = None
+
+    def __enter__(self):
+        self._tracker = track_queries()
+        self.stats = self._tracker.__enter__()
+        return self.stats
+
+    def __exit__(self, exc_type, exc, tb):
+        self._tracker.__exit__(exc_type, exc, tb)
+        if exc_type is None and self.stats.count > self.limit:
+            raise QueryBudgetExceeded(
+                f'{self.stats.count} queries executed, budget is {self.limit}'
+            )
+        return False
+
+
+class QueryBudgetMiddleware:
+    """Log requests over the query budget and expose counts in debug mode"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with track_queries() as stats:
+            response = self.get_response(request)
+        return self._check(request, response, stats)
+
+    async def __acall__(self, request):
+        with track_queries() as stats:
+            response = await self.get_response(request)
+        return self._check(request, response, stats)
+
+    def _check(self, request, response, stats):
+        duration_ms = stats.duration * 1000
+        if settings.QUERY_BUDGET_HEADERS:
+            response[QUERY_COUNT_HEADER] = str(stats.count)
+            response[QUERY_DURATION_HEADER] = f'{duration_ms:.1f}'
+
+        if stats.count > settings.QUERY_BUDGET:
+            logger.warning(
+                f"[QUERY BUDGET] {request.method} {request.path} ran {stats.count} queries "
+                f"({duration_ms:.1f} ms), budget is {settings.QUERY_BUDGET}"
+            )
+        return response
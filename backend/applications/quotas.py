@@ -0,0 +1,196 @@
+"""
+Per-user quotas on applications, resume storage and write rate.
+
+Checking a quota must not cost a ``COUNT`` / ``SUM`` over the user's rows on
+every write. The usage lives as counters in the shared cache (``sqlite_cache``,
+one per node):
+
+- ``usage`` reads both counters in one ``get_many``. A missing counter is
+  seeded with one aggregate query over the user's hot applications. Archived
+  ones do not count.
+- ``reserve`` wraps a write. It raises the counters with ``incr`` before the
+  write and lowers them again if the write is refused or fails, so the
+  limit holds under concurrent writes.
+- ``record`` adjusts them once a write commits (deletes, shrinking
+  resumes). A counter that is gone by then is simply seeded again on the
+  next read.
+- Code that changes rows outside the views (archiving, user deletion) calls
+  ``forget``.
+
+Seeds expire after ``QUOTA_COUNTER_TTL`` seconds, so a counter that drifted
+(e.g. a write racing the seed) is corrected within that time.
+
+Writes per minute are counted in a key per user and minute, for writes
+that pass validation and go ahead. Each limit is off when set to 0.
+"""
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+from rest_framework import status
+
+from .models import JobApplication
+
+KEY_PREFIX = 'quota'
+APPLICATIONS = 'applications'
+RESUME_BYTES = 'resume_bytes'
+
+
+class QuotaExceeded:
+    def __init__(self, message, status_code, retry_after=None):
+        self.message = message
+        self.status_code = status_code
+        self.headers = {'Retry-After': str(retry_after)} if retry_after else None
+
+
+def _key(user_id, name):
+    return f'{KEY_PREFIX}:{name}:{user_id}'
+
+
+def usage(user):
+    """{"applications": n, "resume_bytes": n} for ``user``, from the cached counters"""
+    keys = {_key(user.pk, name): name for name in (APPLICATIONS, RESUME_BYTES)}
+    cached = cache.get_many(list(keys))
+    if len(cached) == len(keys):
+        return {keys[key]: value for key, value in cached.items()}
+
+    counted = JobApplication.objects.for_user(user).aggregate(
+        **{APPLICATIONS: Count('id'), RESUME_BYTES: Coalesce(Sum('resume_size'), 0)},
+    )
+    for name, value in counted.items():
+        # add, not set: a counter another request seeded meanwhile may be newer
+        cache.add(_key(user.pk, name), value, timeout=settings.QUOTA_COUNTER_TTL)
+    return counted
+
+
+def cached_usage(user_ids):
+    """{user_id: {name: value}} of the counters currently cached for ``user_ids``, in one round trip"""
+    keys = {_key(user_id, name): (user_id, name) for user_id in user_ids for name in (APPLICATIONS, RESUME_BYTES)}
+    counters = {}
+    for key, value in cache.get_many(list(keys)).items():
+        user_id, name = keys[key]
+        counters.setdefault(user_id, {})[name] = value
+    return counters
+
+
+def _adjust(user_id, changes):
+    for name, delta in changes.items():
+        if delta:
+            try:
+                cache.incr(_key(user_id, name), delta)
+            except ValueError:
+                pass  # Not seeded; the next read counts afresh
+
+
+def record(user, applications=0, resume_bytes=0):
+    """Adjust ``user``'s counters once the current transaction commits"""
+    changes = {APPLICATIONS: applications, RESUME_BYTES: resume_bytes}
+    transaction.on_commit(lambda: _adjust(user.pk, changes))
+
+
+def forget(user_id):
+    """Drop ``user_id``'s counters after rows changed behind ``record``'s back"""
+    cache.delete_many([_key(user_id, APPLICATIONS), _key(user_id, RESUME_BYTES)])
+
+
+def _take(key, amount, limit):
+    """Add ``amount`` to the counter ``key``; undo it and return False if that passes ``limit``"""
+    if cache.incr(key, amount) <= limit:
+        return True
+    cache.decr(key, amount)
+    return False
+
+
+def _give_back(taken):
+    for key, amount in taken:
+        try:
+            cache.decr(key, amount)
+        except ValueError:
+            pass  # Expired or evicted; recounted on the next read
+
+
+def _take_write(user, taken):
+    limit = settings.QUOTA_WRITES_PER_MINUTE
+    if limit <= 0:
+        return None
+    minute, elapsed = divmod(int(time.time()), 60)
+    key = _key(user.pk, f'writes:{minute}')
+    cache.add(key, 0, timeout=120)
+    if not _take(key, 1, limit):
+        return QuotaExceeded(
+            f'Too many changes; at most {limit} per minute.',
+            status.HTTP_429_TOO_MANY_REQUESTS,
+            retry_after=60 - elapsed,
+        )
+    taken.append((key, 1))
+    return None
+
+
+def _take_usage(user, name, amount, limit, taken):
+    key = _key(user.pk, name)
+    usage(user)  # Seeds the counters if missing
+    try:
+        fits = _take(key, amount, limit)
+    except ValueError:
+        # Evicted since; count afresh and try once more
+        usage(user)
+        fits = _take(key, amount, limit)
+    if fits:
+        taken.append((key, amount))
+    return fits
+
+
+def _take_all(user, applications, resume_bytes, taken):
+    exceeded = _take_write(user, taken)
+    if exceeded:
+        return exceeded
+    max_applications = settings.QUOTA_MAX_APPLICATIONS
+    if applications > 0 and max_applications > 0 and not _take_usage(
+            user, APPLICATIONS, applications, max_applications, taken):
+        return QuotaExceeded(
+            f'Application limit reached ({max_applications}); delete some to add more.',
+            status.HTTP_403_FORBIDDEN,
+        )
+    max_bytes = settings.QUOTA_MAX_RESUME_BYTES
+    if resume_bytes > 0 and max_bytes > 0 and not _take_usage(
+            user, RESUME_BYTES, resume_bytes, max_bytes, taken):
+        return QuotaExceeded(
+            f'Resume storage limit reached ({max_bytes // (1024 * 1024)} MB); remove some resumes to upload more.',
+            status.HTTP_403_FORBIDDEN,
+        )
+    return None
+
+
+@contextmanager
+def reserve(user, applications=0, resume_bytes=0):
+    """
+    Count one write for ``user`` and reserve the applications and resume bytes
+    it adds against their quotas. Yields a ``QuotaExceeded`` (nothing is kept)
+    or None if the write may go ahead.
+
+    The counters are raised up front with ``incr``, so concurrent writes
+    cannot all pass against the same usage. If the block raises, the write
+    never happened and the reservation is given back. Changes the limits do
+    not guard (decreases, or a limit set to 0) are recorded on commit.
+    """
+    taken = []
+    exceeded = _take_all(user, applications, resume_bytes, taken)
+    if exceeded:
+        _give_back(taken)
+        yield exceeded
+        return
+    try:
+        yield None
+    except BaseException:
+        _give_back(taken)
+        raise
+    reserved = {key for key, _ in taken}
+    record(
+        user,
+        applications=0 if _key(user.pk, APPLICATIONS) in reserved else applications,
+        resume_bytes=0 if _key(user.pk, RESUME_BYTES) in reserved else resume_bytes,
+    )
@@ -0,0 +1,120 @@
+"""
+Garbage collection of resume files no application points at.
+
+Deleting an application, or uploading a new resume over an old one, leaves
+the old file in ``MEDIA_ROOT/resumes/``. ``manage.py gc_resumes`` finds those
+files and deletes them in batches.
+
+Memory stays bounded however many files there are:
+
+- the media tree is walked with ``os.scandir``, one entry at a time;
+- the referenced paths are streamed from every database (shards included,
+  hot and archived rows) with ``values_list().iterator()``;
+- both streams go through ``external_sort``, which spills sorted runs of
+  ``RUN_SIZE`` names to temporary files and merges them back, so the sort
+  order is Python's on both sides whatever the database collation;
+- ``orphans`` walks the two sorted streams side by side.
+
+Files younger than the grace period are skipped: an upload is written
+before the row that references it commits.
+"""
+import heapq
+import os
+import tempfile
+import time
+from contextlib import ExitStack
+
+from django.core.files.storage import default_storage
+from django.db import DEFAULT_DB_ALIAS
+
+from .models import ArchivedApplication, JobApplication
+from .sharding import shard_aliases
+
+RESUME_DIR = 'resumes'
+# Names held in memory at once while sorting
+RUN_SIZE = 100_000
+BATCH_SIZE = 1000
+
+
+def stored_resumes(min_age=0, root=RESUME_DIR):
+    """Storage names of the files under ``root`` last modified more than ``min_age`` seconds ago"""
+    top = default_storage.path(root)
+    if not os.path.isdir(top):
+        return
+    newest = time.time() - min_age
+    stack = [(top, root)]
+    while stack:
+        path, prefix = stack.pop()
+        with os.scandir(path) as entries:
+            for entry in entries:
+                name = f'{prefix}/{entry.name}'
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, name))
+                elif entry.is_file(follow_symlinks=False) and '\n' not in name:
+                    if entry.stat().st_mtime <= newest:
+                        yield name
+
+
+def referenced_resumes():
+    """Every ``resume`` path stored on an application, hot or archived, in any database"""
+    for alias in [DEFAULT_DB_ALIAS, *shard_aliases()]:
+        for model in (JobApplication, ArchivedApplication):
+            yield from (
+                model.objects.using(alias).exclude(resume='').exclude(resume__isnull=True)
+                .values_list('resume', flat=True).iterator(chunk_size=BATCH_SIZE)
+            )
+
+
+def _spill(run, stack):
+    spilled = stack.enter_context(tempfile.TemporaryFile('w+', encoding='utf-8'))
+    spilled.writelines(f'{name}\n' for name in sorted(run))
+    spilled.seek(0)
+    return (line[:-1] for line in spilled)
+
+
+def external_sort(names, run_size=RUN_SIZE):
+    """Yield ``names`` (no newlines) sorted, holding at most ``run_size`` of them in memory"""
+    with ExitStack() as stack:
+        runs, run = [], []
+        for name in names:
+            run.append(name)
+            if len(run) >= run_size:
+                runs.append(_spill(run, stack))
+                run = []
+        if not runs:
+            yield from sorted(run)
+            return
+        if run:
+            runs.append(_spill(run, stack))
+        yield from heapq.merge(*runs)
+
+
+def orphans(stored, referenced):
+    """Names in sorted ``stored`` that are not in sorted ``referenced``"""
+    referenced = iter(referenced)
+    current = next(referenced, None)
+    for name in stored:
+        while current is not None and current < name:
+            current = next(referenced, None)
+        if name != current:
+            yield name
+
+
+def find_orphans(min_age=0, run_size=RUN_SIZE):
+    """Sorted storage names of the unreferenced resume files older than ``min_age`` seconds"""
+    return orphans(
+        external_sort(stored_resumes(min_age), run_size),
+        external_sort(referenced_resumes(), run_size),
+    )
+
+
+def delete_files(names):
+    """Delete ``names`` from storage; returns the bytes freed"""
+    freed = 0
+    for name in names:
+        try:
+            freed += default_storage.size(name)
+            default_storage.delete(name)
+        except FileNotFoundError:
+            pass
+    return freed
@@ -0,0 +1,89 @@
+"""
+Moving existing resumes into the sharded layout of ``models.resume_path``.
+
+New uploads land in ``resumes/<hash prefix>/<user id>/``; files uploaded
+before that sit flat in ``resumes/``. ``manage.py migrate_resume_layout``
+walks the applications with a resume (hot and archived, every database) by
+id. For each batch it:
+
+1. hard-links each file to its new name (copying across filesystems) and
+   touches it, so a concurrent ``gc_resumes`` sees a new file;
+2. rewrites the batch's ``resume`` paths in one transaction, bumping
+   ``updated_at`` (``bulk_update`` skips auto_now) so delta sync clients
+   pick up the new URLs;
+3. deletes the old names.
+
+Every row points at an existing file at every step. The command is
+resumable: a rerun skips rows already in the layout and reuses links a
+crash left behind. A copy left behind by a crash is an ordinary orphan for
+``gc_resumes``.
+"""
+import os
+import shutil
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from . import events
+from .models import JobApplication, resume_path
+
+BATCH_SIZE = 500
+
+
+def _place(name, target):
+    """Make the stored file ``name`` available at ``target`` too, or at a free variant of it"""
+    source = default_storage.path(name)
+    if default_storage.exists(target) and not os.path.samefile(source, default_storage.path(target)):
+        target = default_storage.get_available_name(target, max_length=255)
+    destination = default_storage.path(target)
+    if not os.path.exists(destination):
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copy2(source, destination)
+    # A link or copy keeps the old mtime. No row points at the new name until
+    # the batch commits, and gc_resumes only spares unreferenced files that
+    # are younger than its --min-age-hours.
+    os.utime(destination)
+    return target
+
+
+def relocate_batch(model, alias, after_id=0, batch_size=BATCH_SIZE, dry_run=False):
+    """
+    Move the resumes of up to ``batch_size`` ``model`` rows in ``alias`` with
+    ids above ``after_id``. Returns (last id seen, moved, missing), or None
+    when no rows are left.
+    """
+    rows = list(
+        model.objects.using(alias).filter(pk__gt=after_id).exclude(resume='').exclude(resume__isnull=True)
+        .order_by('pk').values_list('pk', 'user_id', 'resume')[:batch_size]
+    )
+    if not rows:
+        return None
+
+    moves, missing = [], 0
+    for pk, user_id, name in rows:
+        target = resume_path(user_id, name)
+        if name == target:
+            continue
+        if not default_storage.exists(name):
+            missing += 1
+            continue
+        moves.append((pk, user_id, name, target if dry_run else _place(name, target)))
+    if dry_run or not moves:
+        return rows[-1][0], len(moves), missing
+
+    now = timezone.now()
+    with transaction.atomic(using=alias):
+        model.objects.using(alias).bulk_update(
+            [model(pk=pk, resume=new_name, updated_at=now) for pk, _, _, new_name in moves],
+            ['resume', 'updated_at'],
+        )
+    for _, _, old_name, _ in moves:
+        default_storage.delete(old_name)
+    if model is JobApplication:
+        # Open dashboards hold the old URLs
+        events.publish_to_users({user_id for _, user_id, _, _ in moves}, events.RESYNC, {'reason': 'resumes_moved'})
+    return rows[-1][0], len(moves), missing
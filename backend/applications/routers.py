@@ -0,0 +1,101 @@
+"""
+Read/write database routing.
+
+Views decorated with ``@use_read_replica`` (the GET views) read through the
+``replica`` alias; everything else, including every write, uses ``default``.
+On SQLite the replica is a ``mode=ro`` connection to the same file. With WAL
+its reads never wait on a writer and it cannot take a write lock by mistake.
+For a server database it is a replica DSN.
+
+Read-your-writes: once a user's write commits, ``pin_to_primary`` records it
+in the shared cache. That user's reads stay on ``default`` for
+``READ_YOUR_WRITES_SECONDS`` afterwards, so a lagging replica never hides a
+change they just made. Reads inside a transaction (e.g. an atomic batch) also
+stay on ``default``.
+"""
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+READ_REPLICA_ALIAS = 'replica'
+
+_read_alias = ContextVar('applications_read_alias', default=None)
+
+
+def replica_configured():
+    return READ_REPLICA_ALIAS in settings.DATABASES
+
+
+def _pin_key(user_id):
+    return f'db-pin:{user_id}'
+
+
+def pin_to_primary(user_id):
+    """Keep ``user_id``'s reads on the primary for the read-your-writes window"""
+    if replica_configured() and settings.READ_YOUR_WRITES_SECONDS > 0:
+        cache.set(_pin_key(user_id), True, timeout=settings.READ_YOUR_WRITES_SECONDS)
+
+
+def _alias_for(pinned):
+    if pinned or transaction.get_connection(DEFAULT_DB_ALIAS).in_atomic_block:
+        # Reads inside a transaction must see its uncommitted writes
+        return DEFAULT_DB_ALIAS
+    return READ_REPLICA_ALIAS
+
+
+def read_alias_for(user):
+    """The alias a GET view should read from for ``user``"""
+    if not replica_configured():
+        return DEFAULT_DB_ALIAS
+    return _alias_for(user.is_authenticated and cache.get(_pin_key(user.pk)) is not None)
+
+
+async def aread_alias_for(user):
+    if not replica_configured():
+        return DEFAULT_DB_ALIAS
+    return _alias_for(user.is_authenticated and await cache.aget(_pin_key(user.pk)) is not None)
+
+
+def use_read_replica(view):
+    """Serve the view's reads from the replica; apply below the authentication decorators"""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            token = _read_alias.set(await aread_alias_for(request.user))
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _read_alias.reset(token)
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        token = _read_alias.set(read_alias_for(request.user))
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+    return wrapper
+
+
+class ReadReplicaRouter:
+    """Send reads from ``use_read_replica`` views to the replica; all else to default"""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as default
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == READ_REPLICA_ALIAS:
+            return False
+        return None
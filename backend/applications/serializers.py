@@ -1,7 +1,8 @@
 # serializers.py
 
+from django.conf import settings
 from rest_framework import serializers
-from .models import JobApplication, Interview
+from .models import ArchivedApplication, JobApplication, Interview, UserPreferences
 
 # class JobApplicationSerializer(serializers.ModelSerializer):
 #     class Meta:
@@ -19,8 +20,8 @@ class JobApplicationSerializer(serializers.ModelSerializer):
         model = JobApplication
         fields = ['id', 'company', 'position', 'applied_date', 'status', 'resume',
                   'job_description', 'contact_email', 'contact_phone', 'company_website', 'notes',
-                  'interview_date', 'interview_time', 'interview_type']
-        read_only_fields = ['id']  # ID is read-only
+                  'interview_date', 'interview_time', 'interview_type', 'updated_at']
+        read_only_fields = ['id', 'updated_at']
     
     def validate(self, data):
         """Ensure user cannot be changed through serializer"""
@@ -29,19 +30,54 @@ class JobApplicationSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("User field cannot be modified")
         return data
 
+    def _first_interview(self, obj):
+        # Uses prefetch_related('interviews') when the view provides it,
+        # otherwise falls back to one query per call
+        interviews = obj.interviews.all()
+        return interviews[0] if interviews else None
+
     def get_interview_date(self, obj):
-        interview = Interview.objects.filter(job_application=obj).first()
+        interview = self._first_interview(obj)
         return interview.date if interview else None
 
     def get_interview_time(self, obj):
-        interview = Interview.objects.filter(job_application=obj).first()
+        interview = self._first_interview(obj)
         return interview.time if interview else None
 
     def get_interview_type(self, obj):
-        interview = Interview.objects.filter(job_application=obj).first()
+        interview = self._first_interview(obj)
         return interview.type if interview else None
 
 
+class ArchivedApplicationSerializer(serializers.ModelSerializer):
+    """The JobApplicationSerializer shape for an archived application, plus ``archived: true``"""
+    interview_date = serializers.SerializerMethodField()
+    interview_time = serializers.SerializerMethodField()
+    interview_type = serializers.SerializerMethodField()
+    archived = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArchivedApplication
+        fields = JobApplicationSerializer.Meta.fields + ['archived']
+        read_only_fields = fields
+
+    def _first_interview(self, obj):
+        # Stored in date/time order, like Interview's default ordering
+        return obj.interviews[0] if obj.interviews else {}
+
+    def get_interview_date(self, obj):
+        return self._first_interview(obj).get('date')
+
+    def get_interview_time(self, obj):
+        return self._first_interview(obj).get('time')
+
+    def get_interview_type(self, obj):
+        return self._first_interview(obj).get('type')
+
+    def get_archived(self, obj):
+        return True
+
+
 class InterviewSerializer(serializers.ModelSerializer):
     company = serializers.CharField(source='job_application.company')
     position = serializers.CharField(source='job_application.position')
@@ -49,4 +85,16 @@ class InterviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Interview
-        fields = ['id', 'company', 'position', 'date', 'time', 'type', 'job_application_id']
+        fields = ['id', 'company', 'position', 'date', 'time', 'type', 'job_application_id', 'updated_at']
+
+
+class UserPreferencesSerializer(serializers.ModelSerializer):
+    # The value that applies while ghost_after_days is null
+    default_ghost_after_days = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UserPreferences
+        fields = ['ghost_after_days', 'default_ghost_after_days']
+
+    def get_default_ghost_after_days(self, obj):
+        return settings.GHOST_AFTER_DAYS
@@ -0,0 +1,24 @@
+"""
+SQLite backend for the user shards (see ``applications.sharding``).
+
+Shard files hold applications and interviews but not ``auth_user``, so the
+``user`` foreign keys point at a table that only exists in ``default``.
+SQLite would reject every insert (and ``foreign_key_check`` would report every
+row), so shard connections run with foreign key enforcement off. Deletes still
+cascade, since Django emulates ``on_delete`` itself.
+"""
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        conn.execute('PRAGMA foreign_keys = OFF')
+        return conn
+
+    def enable_constraint_checking(self):
+        # Migrations turn enforcement back on when they finish; keep it off
+        pass
+
+    def check_constraints(self, table_names=None):
+        pass
@@ -0,0 +1,197 @@
+"""
+Per-user sharding of application data across several SQLite files.
+
+SQLite allows one writer per file, so with a single database every user's
+writes queue behind each other. With ``DB_SHARDS = K`` (K > 0), each user's
+job applications and interviews live in one of K databases, ``shard_0`` to
+``shard_<K-1>``, picked from the user id by a jump consistent hash. Users,
+tokens, change events, tombstones and idempotency keys stay in ``default``.
+Writers on different shards no longer wait for each other.
+
+Code reaches a user's rows through ``JobApplication.objects.for_user(user)`` /
+``Interview.objects.for_user(user)``, related managers (``user.job_applications``,
+``job.interviews``) or instances already loaded from a shard. ``ShardRouter``
+follows those hints. Writes that must commit together use ``atomic(user)``,
+which opens a transaction on ``default`` and on the user's shard.
+With ``DB_SHARDS = 0`` (the default), all of these fall through to the
+normal routing.
+
+IDs stay unique across shards: each shard allocates ids from its own range
+(``id_range``), above any id ``default`` handed out. When shards are added,
+jump hashing only moves users onto the new shards. ``rebalance_shards`` then
+moves their rows upwards into a higher range, and the ids are kept.
+Removing shards is not supported.
+"""
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+SHARD_PREFIX = 'shard_'
+# Models whose rows live on the owner's shard
+SHARDED_MODELS = {'applications.jobapplication', 'applications.interview', 'applications.archivedapplication'}
+# Ids allocated by each shard; shard N uses [(N + 1) * SPAN, (N + 2) * SPAN)
+ID_SPAN = 1 << 40
+
+
+def shard_alias(index):
+    return f'{SHARD_PREFIX}{index}'
+
+
+def shard_aliases():
+    return [shard_alias(index) for index in range(settings.DB_SHARDS)]
+
+
+def is_shard(alias):
+    return bool(alias) and alias.startswith(SHARD_PREFIX)
+
+
+def is_sharded(model):
+    return model._meta.label_lower in SHARDED_MODELS
+
+
+def jump_hash(key, buckets):
+    """Jump consistent hash (Lamping & Veach): growing ``buckets`` only moves keys to the new buckets"""
+    bucket, candidate = -1, 0
+    while candidate < buckets:
+        bucket = candidate
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        candidate = int((bucket + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return bucket
+
+
+def shard_for(user_id):
+    """The alias holding ``user_id``'s rows, or None when sharding is off"""
+    if settings.DB_SHARDS <= 0:
+        return None
+    return shard_alias(jump_hash(int(user_id), settings.DB_SHARDS))
+
+
+def id_range(alias):
+    """The [start, end) range of ids ``alias`` allocates"""
+    index = int(alias[len(SHARD_PREFIX):])
+    return (index + 1) * ID_SPAN, (index + 2) * ID_SPAN
+
+
+@contextmanager
+def atomic(user):
+    """``transaction.atomic()`` on default and, when sharded, on ``user``'s shard"""
+    alias = shard_for(user.pk)
+    with transaction.atomic():
+        if alias is None:
+            yield
+        else:
+            with transaction.atomic(using=alias):
+                yield
+
+
+def set_rollback(user):
+    """Mark the transactions opened by ``atomic(user)`` for rollback"""
+    transaction.set_rollback(True)
+    alias = shard_for(user.pk)
+    if alias is not None:
+        transaction.set_rollback(True, using=alias)
+
+
+def _instance_shard(instance):
+    if instance._state.db:
+        return instance._state.db
+    user_id = getattr(instance, 'user_id', None)
+    if user_id is None and instance._meta.label_lower == 'applications.interview':
+        field = instance._meta.get_field('job_application')
+        if field.is_cached(instance):
+            return _instance_shard(field.get_cached_value(instance))
+    return shard_for(user_id) if user_id is not None else None
+
+
+class ShardRouter:
+    """
+    Route sharded models to the owner's shard and keep everything else off
+    the shards. Returns None (defer to the next router) when sharding is off
+    or the hints do not say which shard.
+    """
+
+    def _db(self, model, hints):
+        if settings.DB_SHARDS <= 0:
+            return None
+        instance = hints.get('instance')
+        if instance is None:
+            return None
+        if not is_sharded(model):
+            # e.g. ``job.user``: users live in default, not on the job's shard
+            return DEFAULT_DB_ALIAS if is_shard(instance._state.db) else None
+        if is_sharded(type(instance)):
+            return _instance_shard(instance)
+        if instance._meta.label_lower == settings.AUTH_USER_MODEL.lower():
+            # Related managers such as ``user.job_applications``
+            return shard_for(instance.pk)
+        return None
+
+    def db_for_read(self, model, **hints):
+        return self._db(model, hints)
+
+    def db_for_write(self, model, **hints):
+        return self._db(model, hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if is_shard(obj1._state.db) or is_shard(obj2._state.db):
+            # Rows reference their owner in default and each other within a shard
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if not is_shard(db):
+            return None
+        # Shards only get the sharded tables; data migrations run on default
+        return model_name is not None and f'{app_label}.{model_name}' in SHARDED_MODELS
+
+
+def seed_id_ranges(sender, using, **kwargs):
+    """post_migrate handler: start a shard's id sequences at the bottom of its range"""
+    if not is_shard(using):
+        return
+    from .models import Interview, JobApplication
+
+    start, _ = id_range(using)
+    with connections[using].cursor() as cursor:
+        for model in (JobApplication, Interview):
+            table = model._meta.db_table
+            cursor.execute('SELECT seq FROM sqlite_sequence WHERE name = %s', [table])
+            row = cursor.fetchone()
+            if row is None:
+                cursor.execute('INSERT INTO sqlite_sequence (name, seq) VALUES (%s, %s)', [table, start])
+            elif row[0] < start:
+                cursor.execute('UPDATE sqlite_sequence SET seq = %s WHERE name = %s', [start, table])
+
+
+def move_user_rows(user_id, source, target):
+    """
+    Copy ``user_id``'s applications and interviews from ``source`` to
+    ``target`` with their ids, archived ones included, then delete them from
+    ``source``; returns the number of (applications, interviews) moved. Rerunning after a failure
+    between the two steps skips the rows already copied.
+    """
+    from .models import ArchivedApplication, Interview, JobApplication
+
+    jobs = list(JobApplication.objects.using(source).filter(user_id=user_id))
+    interviews = list(Interview.objects.using(source).filter(job_application__user_id=user_id))
+    archived = list(ArchivedApplication.objects.using(source).filter(user_id=user_id))
+    with transaction.atomic(using=target):
+        JobApplication.objects.using(target).bulk_create(jobs, ignore_conflicts=True)
+        Interview.objects.using(target).bulk_create(interviews, ignore_conflicts=True)
+        ArchivedApplication.objects.using(target).bulk_create(archived, ignore_conflicts=True)
+    with transaction.atomic(using=source):
+        JobApplication.objects.using(source).filter(user_id=user_id).delete()
+        ArchivedApplication.objects.using(source).filter(user_id=user_id).delete()
+    return len(jobs) + len(archived), len(interviews)
+
+
+def delete_user_rows(sender, instance, **kwargs):
+    """pre_delete handler for users: the cascade only reaches default, so clear their shard"""
+    alias = shard_for(instance.pk)
+    if alias is None:
+        return
+    from .models import ArchivedApplication, JobApplication
+
+    JobApplication.objects.using(alias).filter(user_id=instance.pk).delete()
+    ArchivedApplication.objects.using(alias).filter(user_id=instance.pk).delete()
@@ -0,0 +1,235 @@
+"""
+Slow-query log.
+
+An execute wrapper (installed next to the one in ``instrumentation``) times
+every query. Queries slower than ``SLOW_QUERY_THRESHOLD_MS`` are recorded with
+their normalized SQL, the view that issued them and, on SQLite, the
+``EXPLAIN QUERY PLAN`` output. Plans that scan a whole table are flagged.
+
+Entries go to a fixed-size ring buffer kept in a small side SQLite file
+(``SLOW_QUERY_LOG_PATH``) so every gunicorn worker writes to the same log and
+both the staff endpoint and ``manage.py dump_slow_queries`` can read it. Slow
+queries are rare, so opening a connection per record is acceptable.
+"""
+import json
+import logging
+import re
+import sqlite3
+import time
+from contextlib import closing
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+logger = logging.getLogger('applications')
+
+_current_request = ContextVar('applications_current_request', default=None)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_sql(sql):
+    """Replace literals and placeholders with '?' and collapse IN lists"""
+    sql = sql.replace('%s', '?')
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _PLACEHOLDER_LIST.sub('(...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def full_scan_tables(plan):
+    """Tables that an EXPLAIN QUERY PLAN walks end to end"""
+    tables = []
+    for row in plan:
+        detail = row[-1]
+        if detail.startswith('SCAN ') and not detail.startswith('SCAN CONSTANT ROW'):
+            words = detail.split()
+            # SQLite before 3.36 writes "SCAN TABLE <table>"
+            tables.append(words[2] if words[1] == 'TABLE' and len(words) > 2 else words[1])
+    return tables
+
+
+def explain_query_plan(connection, sql, params):
+    """Return EXPLAIN QUERY PLAN rows for a SELECT on SQLite, else None"""
+    if connection.vendor != 'sqlite' or not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+        return None
+    from django.db.backends.sqlite3.base import SQLiteCursorWrapper
+
+    # A raw cursor bypasses the execute wrappers, so this cannot recurse
+    cursor = connection.connection.cursor(factory=SQLiteCursorWrapper)
+    try:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        return [tuple(row) for row in cursor.fetchall()]
+    except Exception:
+        logger.exception('Could not capture query plan for slow query')
+        return None
+    finally:
+        cursor.close()
+
+
+class SlowQueryLog:
+    """Fixed-capacity ring buffer of slow queries stored in a side SQLite file"""
+
+    def __init__(self, path, capacity):
+        self.path = str(path)
+        self.capacity = capacity
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute(
+            'CREATE TABLE IF NOT EXISTS slow_queries ('
+            ' slot INTEGER PRIMARY KEY,'
+            ' seq INTEGER NOT NULL,'
+            ' recorded_at TEXT NOT NULL,'
+            ' duration_ms REAL NOT NULL,'
+            ' view TEXT,'
+            ' sql TEXT NOT NULL,'
+            ' plan TEXT,'
+            ' full_scan INTEGER NOT NULL)'
+        )
+        db.execute('CREATE INDEX IF NOT EXISTS slow_queries_seq ON slow_queries (seq)')
+        return db
+
+    def record(self, duration_ms, view, sql, plan):
+        scanned = full_scan_tables(plan or [])
+        with closing(self._connect()) as db:
+            db.execute('BEGIN IMMEDIATE')
+            seq = db.execute('SELECT COALESCE(MAX(seq), 0) + 1 FROM slow_queries').fetchone()[0]
+            db.execute(
+                'INSERT OR REPLACE INTO slow_queries'
+                ' (slot, seq, recorded_at, duration_ms, view, sql, plan, full_scan)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    seq % self.capacity,
+                    seq,
+                    timezone.now().isoformat(),
+                    round(duration_ms, 3),
+                    view,
+                    sql,
+                    json.dumps(plan) if plan is not None else None,
+                    int(bool(scanned)),
+                ),
+            )
+            db.execute('COMMIT')
+
+    def entries(self, limit=None):
+        """Most recent entries first"""
+        query = (
+            'SELECT seq, recorded_at, duration_ms, view, sql, plan, full_scan'
+            ' FROM slow_queries ORDER BY seq DESC'
+        )
+        params = ()
+        if limit:
+            query += ' LIMIT ?'
+            params = (limit,)
+        with closing(self._connect()) as db:
+            rows = db.execute(query, params).fetchall()
+        return [
+            {
+                'seq': seq,
+                'recorded_at': recorded_at,
+                'duration_ms': duration_ms,
+                'view': view,
+                'sql': sql,
+                'plan': [row[-1] for row in json.loads(plan)] if plan else None,
+                'full_scan': bool(full_scan),
+            }
+            for seq, recorded_at, duration_ms, view, sql, plan, full_scan in rows
+        ]
+
+    def clear(self):
+        with closing(self._connect()) as db:
+            db.execute('DELETE FROM slow_queries')
+
+
+def _current_view_name():
+    request = _current_request.get()
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else None
+
+
+def get_slow_query_log():
+    return SlowQueryLog(settings.SLOW_QUERY_LOG_PATH, settings.SLOW_QUERY_LOG_SIZE)
+
+
+def _slow_query_wrapper(execute, sql, params, many, context):
+    start = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration_ms = (time.perf_counter() - start) * 1000
+    if duration_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+        return result
+
+    try:
+        view = _current_view_name()
+        plan = None if many else explain_query_plan(context['connection'], sql, params)
+        normalized = normalize_sql(sql)
+        get_slow_query_log().record(duration_ms, view, normalized, plan)
+        logger.warning(f"[SLOW QUERY] {duration_ms:.1f} ms in {view or '-'}: {normalized[:200]}")
+    except Exception:
+        # Never let the slow-query log break the query that triggered it
+        logger.exception('Failed to record slow query')
+    return result
+
+
+def install_slow_query_wrapper(sender, connection, **kwargs):
+    """connection_created handler; idempotent across reconnects"""
+    if _slow_query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_slow_query_wrapper)
+
+
+class SlowQueryMiddleware:
+    """Remember the current request so slow queries can be attributed to its view"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = _current_request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            _current_request.reset(token)
+
+    async def __acall__(self, request):
+        token = _current_request.set(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            _current_request.reset(token)
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def slow_queries(request):
+    """Dump (GET) or clear (DELETE) the slow-query log. Staff only."""
+    log = get_slow_query_log()
+    if request.method == 'DELETE':
+        log.clear()
+        return Response({'message': 'Slow query log cleared'})
+
+    try:
+        limit = int(request.query_params.get('limit', 100))
+    except ValueError:
+        limit = 100
+    return Response({
+        'threshold_ms': settings.SLOW_QUERY_THRESHOLD_MS,
+        'capacity': log.capacity,
+        'entries': log.entries(limit=limit),
+    })
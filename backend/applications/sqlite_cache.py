@@ -0,0 +1,237 @@
+"""
+Django cache backend stored in a side SQLite file.
+
+Every gunicorn worker on a node opens the same file (``CACHE_PATH``), so they
+share one cache: a value set or invalidated by one worker is seen by all of
+them, with no Redis or memcached to run. The file is in WAL mode, so readers
+never wait for a writer.
+
+- Entries expire after their timeout, like any Django cache.
+- The cache holds at most ``MAX_ENTRIES`` rows. When a write goes over, expired
+  rows are dropped first, then the least recently read ``1/CULL_FREQUENCY``.
+- ``add``, ``incr`` / ``decr`` and ``touch`` are atomic across workers (one
+  statement, or one ``BEGIN IMMEDIATE`` transaction).
+- ``get_many`` / ``set_many`` / ``delete_many`` use one query or transaction
+  for the whole batch.
+
+Each thread keeps its own connection. A read records its access time for LRU
+only when the stored one is more than ``access_resolution`` seconds old, so
+hot keys do not turn every read into a write.
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+# Seconds a connection waits for another worker's write to finish
+BUSY_TIMEOUT = 5
+# Keys per query in the bulk operations; well under SQLite's variable limit
+CHUNK_SIZE = 500
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS cache_entries ('
+    ' key TEXT PRIMARY KEY,'
+    ' value BLOB NOT NULL,'
+    ' expires REAL,'
+    ' accessed REAL NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS cache_entries_expires ON cache_entries (expires)',
+    'CREATE INDEX IF NOT EXISTS cache_entries_accessed ON cache_entries (accessed)',
+)
+_LIVE = '(expires IS NULL OR expires > ?)'
+_UPSERT = (
+    'INSERT INTO cache_entries (key, value, expires, accessed) VALUES (?, ?, ?, ?)'
+    ' ON CONFLICT (key) DO UPDATE SET'
+    ' value = excluded.value, expires = excluded.expires, accessed = excluded.accessed'
+)
+
+
+def _dumps(value):
+    return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+
+def _chunks(items):
+    for start in range(0, len(items), CHUNK_SIZE):
+        yield items[start:start + CHUNK_SIZE]
+
+
+class SQLiteCache(BaseCache):
+    """Cache shared by all processes that open the same SQLite file"""
+
+    access_resolution = 1.0
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self.path = str(location)
+        self._local = threading.local()
+
+    # ─── Connection ──────────────────────────────────────────────
+
+    def _db(self):
+        db = getattr(self._local, 'db', None)
+        # A forked worker must not reuse its parent's connection
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            for statement in _SCHEMA:
+                db.execute(statement)
+            self._local.db, self._local.pid = db, os.getpid()
+        return db
+
+    @contextmanager
+    def _write(self):
+        """One write transaction; taken up front so read-modify-write is atomic"""
+        db = self._db()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            yield db
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        db.execute('COMMIT')
+
+    def close(self, **kwargs):
+        # Connections are per thread and reused across requests
+        pass
+
+    # ─── Helpers ─────────────────────────────────────────────────
+
+    def _cull(self, db, now):
+        count = db.execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0]
+        if count <= self._max_entries:
+            return
+        if self._cull_frequency == 0:
+            db.execute('DELETE FROM cache_entries')
+            return
+        db.execute('DELETE FROM cache_entries WHERE expires IS NOT NULL AND expires <= ?', (now,))
+        count = db.execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0]
+        if count > self._max_entries:
+            db.execute(
+                'DELETE FROM cache_entries WHERE key IN'
+                ' (SELECT key FROM cache_entries ORDER BY accessed LIMIT ?)',
+                (max(count // self._cull_frequency, count - self._max_entries),),
+            )
+
+    def _mark_read(self, db, rows, now):
+        stale = [key for key, accessed in rows if now - accessed > self.access_resolution]
+        try:
+            for chunk in _chunks(stale):
+                placeholders = ', '.join('?' * len(chunk))
+                db.execute(f'UPDATE cache_entries SET accessed = ? WHERE key IN ({placeholders})', (now, *chunk))
+        except sqlite3.OperationalError:
+            # Recency is best effort; a busy database must not fail the read
+            pass
+
+    # ─── Single keys ─────────────────────────────────────────────
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        db = self._db()
+        row = db.execute(
+            f'SELECT value, accessed FROM cache_entries WHERE key = ? AND {_LIVE}', (key, now)
+        ).fetchone()
+        if row is None:
+            return default
+        self._mark_read(db, [(key, row[1])], now)
+        return pickle.loads(row[0])
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        with self._write() as db:
+            db.execute(_UPSERT, (key, _dumps(value), self.get_backend_timeout(timeout), now))
+            self._cull(db, now)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        with self._write() as db:
+            # Inserts, or replaces only an expired row; rowcount says which
+            added = db.execute(
+                _UPSERT + ' WHERE cache_entries.expires IS NOT NULL AND cache_entries.expires <= ?',
+                (key, _dumps(value), self.get_backend_timeout(timeout), now, now),
+            ).rowcount == 1
+            if added:
+                self._cull(db, now)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._db().execute(
+            f'UPDATE cache_entries SET expires = ? WHERE key = ? AND {_LIVE}',
+            (self.get_backend_timeout(timeout), key, time.time()),
+        )
+        return cursor.rowcount == 1
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._db().execute('DELETE FROM cache_entries WHERE key = ?', (key,)).rowcount == 1
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._db().execute(
+            f'SELECT 1 FROM cache_entries WHERE key = ? AND {_LIVE}', (key, time.time())
+        ).fetchone()
+        return row is not None
+
+    def incr(self, key, delta=1, version=None):
+        validated = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        with self._write() as db:
+            row = db.execute(
+                f'SELECT value FROM cache_entries WHERE key = ? AND {_LIVE}', (validated, now)
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Key '{key}' not found")
+            value = pickle.loads(row[0]) + delta
+            db.execute(
+                'UPDATE cache_entries SET value = ?, accessed = ? WHERE key = ?',
+                (_dumps(value), now, validated),
+            )
+        return value
+
+    # ─── Bulk ────────────────────────────────────────────────────
+
+    def get_many(self, keys, version=None):
+        originals = {self.make_and_validate_key(key, version=version): key for key in keys}
+        now = time.time()
+        db = self._db()
+        found, seen = {}, []
+        for chunk in _chunks(list(originals)):
+            placeholders = ', '.join('?' * len(chunk))
+            rows = db.execute(
+                f'SELECT key, value, accessed FROM cache_entries WHERE key IN ({placeholders}) AND {_LIVE}',
+                (*chunk, now),
+            )
+            for key, value, accessed in rows:
+                found[originals[key]] = pickle.loads(value)
+                seen.append((key, accessed))
+        self._mark_read(db, seen, now)
+        return found
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        now = time.time()
+        expires = self.get_backend_timeout(timeout)
+        rows = [
+            (self.make_and_validate_key(key, version=version), _dumps(value), expires, now)
+            for key, value in data.items()
+        ]
+        with self._write() as db:
+            db.executemany(_UPSERT, rows)
+            self._cull(db, now)
+        return []
+
+    def delete_many(self, keys, version=None):
+        keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        with self._write() as db:
+            for chunk in _chunks(keys):
+                placeholders = ', '.join('?' * len(chunk))
+                db.execute(f'DELETE FROM cache_entries WHERE key IN ({placeholders})', chunk)
+
+    def clear(self):
+        self._db().execute('DELETE FROM cache_entries')
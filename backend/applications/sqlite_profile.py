@@ -0,0 +1,48 @@
+"""
+SQLite connection profile.
+
+Django 5.0 opens SQLite with the library defaults: a rollback journal, where a
+writer blocks every reader and a reader holds off every commit, and a small
+page cache. ``configure_sqlite_connection`` runs on ``connection_created``
+(see ``ApplicationsConfig.ready``) and applies ``SQLITE_PRAGMAS`` to each new
+connection:
+
+- ``journal_mode=WAL``: readers and the writer no longer block each other.
+- ``synchronous=NORMAL``: safe with WAL (a power loss can drop the last
+  commits, never corrupt the file) and much cheaper than ``FULL``.
+- ``busy_timeout``: a writer waits for the lock instead of failing with
+  ``database is locked``.
+- ``mmap_size`` / ``cache_size`` / ``temp_store``: reads served from memory.
+
+The PRAGMAs go through the raw sqlite3 connection, so they are not counted as
+queries by the request instrumentation. ``manage.py benchmark_sqlite_writes``
+measures what the profile gains under concurrent writes.
+"""
+import logging
+import sqlite3
+
+from django.conf import settings
+
+logger = logging.getLogger('applications')
+
+
+def apply_pragmas(db, pragmas):
+    """Apply ``pragmas`` to a raw sqlite3 connection"""
+    for name, value in pragmas.items():
+        db.execute(f'PRAGMA {name}={value}')
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """connection_created handler; applies SQLITE_PRAGMAS to SQLite connections"""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = settings.SQLITE_PRAGMAS
+    if 'mode=ro' in str(connection.settings_dict['NAME']):
+        # A read-only connection cannot switch the journal mode; it follows the file's
+        pragmas = {name: value for name, value in pragmas.items() if name != 'journal_mode'}
+    try:
+        apply_pragmas(connection.connection, pragmas)
+    except sqlite3.Error:
+        # e.g. the WAL switch needs a moment without other writers; the
+        # connection still works with the file's current journal mode
+        logger.exception('Could not apply SQLite connection profile')
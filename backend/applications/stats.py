@@ -0,0 +1,99 @@
+"""
+Dashboard statistics for one user.
+
+Shared by the ``job_stats`` / ``interview_stats`` views and by the live-update
+stream, which pushes fresh numbers after each batch of changes. Both go
+through the ``shared_*`` variants, so identical concurrent requests are
+computed once (see ``coalesce``). Archived applications only count with
+``include_archived`` (``?include_archived=1``).
+"""
+from collections import Counter
+from datetime import date, timedelta
+
+from django.db.models import Count
+
+from .archive import archived_interview_counts, archived_status_counts
+from .coalesce import single_flight, stats_key
+from .models import JobApplication, Interview
+
+
+def job_stats_from_counts(summary):
+    """The ``job_stats`` payload from {"applied": n, ...} status counts"""
+    return {
+        "total": sum(summary.values()),
+        "applied": summary.get("applied", 0),
+        "ghosted": summary.get("ghosted", 0),
+        "interviewing": summary.get("interviewing", 0),
+        "assessment": summary.get("assessment", 0),
+    }
+
+
+def job_stats_for(user, include_archived=False):
+    user_applications = JobApplication.objects.for_user(user)
+    stats = user_applications.values('status').annotate(count=Count('id')).order_by()
+    summary = Counter({s['status'].lower(): s['count'] for s in stats})
+    if include_archived:
+        summary.update(archived_status_counts(user))
+    return job_stats_from_counts(summary)
+
+
+def interview_stats_for(user, include_archived=False):
+    # Get all interviews for user's applications
+    all_interviews = Interview.objects.for_user(user)
+
+    # Upcoming interviews (today and future)
+    upcoming_count = all_interviews.filter(date__gte=date.today()).count()
+
+    # Completed interviews (in the last 30 days)
+    thirty_days_ago = date.today() - timedelta(days=30)
+    completed_count = all_interviews.filter(
+        date__lt=date.today(),
+        date__gte=thirty_days_ago
+    ).count()
+
+    # Total interviews
+    total_count = all_interviews.count()
+
+    if include_archived:
+        archived = archived_interview_counts(user)
+        upcoming_count += archived['upcoming']
+        completed_count += archived['completed']
+        total_count += archived['total']
+
+    # Calculate success rate (if we had offer data, but for now just return 0)
+    # This could be enhanced later to track offers/acceptances
+    success_rate = "0%"
+
+    return {
+        "upcoming": upcoming_count,
+        "completed": completed_count,
+        "total": total_count,
+        "success_rate": success_rate,
+    }
+
+
+def dashboard_stats_for(user):
+    """Both stats blocks, in the shape pushed by the live-update stream"""
+    return {
+        "jobs": job_stats_for(user),
+        "interviews": interview_stats_for(user),
+    }
+
+
+def stats_name(name, include_archived):
+    """The coalescing key name; results with and without the archive differ"""
+    return f'{name}+archived' if include_archived else name
+
+
+def shared_job_stats(user, include_archived=False):
+    return single_flight(
+        stats_key(user.pk, stats_name('job_stats', include_archived)),
+        lambda: job_stats_for(user, include_archived),
+    )
+
+
+def shared_interview_stats(user, include_archived=False):
+    return single_flight(
+        stats_key(user.pk, stats_name('interview_stats', include_archived)),
+        lambda: interview_stats_for(user, include_archived),
+    )
@@ -0,0 +1,123 @@
+"""
+Delta sync for offline and mobile clients.
+
+``GET /api/sync/`` returns all of the user's applications and interviews plus
+a ``token``. Passing that token back (``?since=<token>``) returns only rows
+whose ``updated_at`` moved since then, and the ids of rows deleted since then
+(from ``Tombstone``), so a client can catch up in one small response:
+
+    {
+        "token": "1760900000123456",
+        "full": false,
+        "applications": [...],
+        "interviews": [...],
+        "deleted": {"applications": [12], "interviews": [40, 41]}
+    }
+
+Tokens are server timestamps. Each delta looks back ``TOKEN_OVERLAP`` before
+the token, so a write committed just after a sync started is not missed; a
+client may see a row twice and should treat rows as upserts. Tokens older than
+the tombstone retention window get a full response (``"full": true``) and
+the client should replace its local copy.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from .models import JobApplication, Interview, Tombstone
+from .pruning import delete_in_batches, should_prune
+from .serializers import JobApplicationSerializer, InterviewSerializer
+
+TOKEN_OVERLAP = timedelta(seconds=5)
+# Every PRUNE_EVERY-th tombstone, rows past the retention window are deleted
+PRUNE_EVERY = 500
+# Rows fetched per round trip when serializing a sync response
+ITERATOR_CHUNK_SIZE = 2000
+
+
+def make_token(moment):
+    return str(int(moment.timestamp() * 1_000_000))
+
+
+def parse_token(token):
+    """Return the aware datetime a token encodes; ValueError if malformed"""
+    micros = int(token)
+    if micros < 0:
+        raise ValueError('negative sync token')
+    return datetime.fromtimestamp(micros / 1_000_000, tz=dt_timezone.utc)
+
+
+def record_deletions(user, application_ids=(), interview_ids=()):
+    """Write tombstones for rows that are about to disappear"""
+    now = timezone.now()
+    tombstones = [
+        Tombstone(user=user, kind=Tombstone.APPLICATION, object_id=pk, deleted_at=now)
+        for pk in application_ids
+    ] + [
+        Tombstone(user=user, kind=Tombstone.INTERVIEW, object_id=pk, deleted_at=now)
+        for pk in interview_ids
+    ]
+    created = Tombstone.objects.bulk_create(tombstones)
+    if any(should_prune(t.pk, PRUNE_EVERY) for t in created):
+        prune_tombstones()
+
+
+def prune_tombstones(retention_days=None):
+    """Delete tombstones past the retention window, in batches. Returns the count."""
+    if retention_days is None:
+        retention_days = settings.SYNC_TOMBSTONE_RETENTION_DAYS
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    return delete_in_batches(Tombstone.objects.filter(deleted_at__lt=cutoff))
+
+
+def changes_since(user, since=None):
+    """Build the sync payload for ``user``; ``since`` is an aware datetime or None"""
+    now = timezone.now()
+    retention = timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    full = since is None or since < now - retention
+
+    applications = JobApplication.objects.for_user(user).prefetch_related('interviews')
+    interviews = Interview.objects.for_user(user).select_related('job_application')
+    deleted = {'applications': [], 'interviews': []}
+
+    if not full:
+        cutoff = since - TOKEN_OVERLAP
+        applications = applications.filter(updated_at__gte=cutoff)
+        interviews = interviews.filter(updated_at__gte=cutoff)
+        tombstones = Tombstone.objects.filter(user=user, deleted_at__gte=cutoff).values_list('kind', 'object_id')
+        for kind, object_id in tombstones:
+            key = 'applications' if kind == Tombstone.APPLICATION else 'interviews'
+            deleted[key].append(object_id)
+
+    # A full sync can cover every row the user has; stream them in chunks
+    # (a server-side cursor on PostgreSQL) instead of loading them at once
+    return {
+        'token': make_token(now),
+        'full': full,
+        'applications': JobApplicationSerializer(
+            applications.order_by('id').iterator(chunk_size=ITERATOR_CHUNK_SIZE), many=True
+        ).data,
+        'interviews': InterviewSerializer(
+            interviews.order_by('id').iterator(chunk_size=ITERATOR_CHUNK_SIZE), many=True
+        ).data,
+        'deleted': deleted,
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def sync(request):
+    """Rows changed or deleted since ?since=<token>, plus the next token"""
+    since = None
+    token = request.query_params.get('since')
+    if token:
+        try:
+            since = parse_token(token)
+        except (ValueError, OverflowError, OSError):
+            return Response({"error": "Invalid sync token."}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(changes_since(request.user, since))
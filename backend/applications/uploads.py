@@ -0,0 +1,128 @@
+"""
+Streaming validation of resume uploads.
+
+``ResumeUploadHandler`` sits first in ``FILE_UPLOAD_HANDLERS``. For the
+``resume`` field of a multipart request it sees every chunk on its way to
+Django's memory / temporary-file handlers, and in the same pass it:
+
+- sniffs the type from the magic bytes of the first chunk (PDF, DOCX, PNG,
+  JPEG, GIF, WebP), ignoring the client's Content-Type;
+- counts the bytes against ``RESUME_MAX_BYTES``;
+- feeds a SHA-256 of the content.
+
+A request whose declared length is already over the limit is refused
+before any of the file is read. A wrong type or an oversized file stops the
+upload at the offending chunk, without reading the rest of the body. The
+view then answers 415 / 413 through ``rejection``.
+
+The handler leaves the digest, size and sniffed type on the request. Views
+store them on the application (``resume_metadata``), so identical resumes
+can be found by hash without reading the files again.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+from rest_framework import status
+
+FIELD_NAME = 'resume'
+# Room for the other form fields and multipart framing on top of the file
+REQUEST_OVERHEAD = 64 * 1024
+# Enough of the file to tell the types apart
+SNIFF_BYTES = 16
+
+
+def sniff_content_type(head, file_name=''):
+    """The resume type the leading bytes ``head`` belong to, or None"""
+    if head.startswith(b'%PDF-'):
+        return 'application/pdf'
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'image/png'
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg'
+    if head.startswith((b'GIF87a', b'GIF89a')):
+        return 'image/gif'
+    if head.startswith(b'RIFF') and head[8:12] == b'WEBP':
+        return 'image/webp'
+    # A DOCX is a zip archive; other zips are not resumes
+    if head.startswith(b'PK\x03\x04') and file_name.lower().endswith('.docx'):
+        return 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+    return None
+
+
+class UploadRejected:
+    def __init__(self, message, status_code):
+        self.message = message
+        self.status_code = status_code
+
+
+class ResumeUploadHandler(FileUploadHandler):
+    request_length = None
+    active = False
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        self.request_length = content_length
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        self.active = field_name == FIELD_NAME
+        if not self.active:
+            return
+        self.head = b''
+        self.content_type = None
+        self.size = 0
+        self.digest = hashlib.sha256()
+        if self.request_length and self.request_length > settings.RESUME_MAX_BYTES + REQUEST_OVERHEAD:
+            self._reject(self._too_large(), status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.active:
+            return raw_data
+        self.size += len(raw_data)
+        if self.size > settings.RESUME_MAX_BYTES:
+            self._reject(self._too_large(), status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        if self.content_type is None:
+            self.head += raw_data[:SNIFF_BYTES - len(self.head)]
+            if len(self.head) >= SNIFF_BYTES:
+                self._sniff()
+        self.digest.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        if not self.active:
+            return None
+        if self.content_type is None:
+            # Files shorter than SNIFF_BYTES
+            self._sniff()
+        self.request.resume_upload = {
+            'resume_sha256': self.digest.hexdigest(),
+            'resume_size': self.size,
+            'resume_content_type': self.content_type,
+        }
+        # The next handler builds the uploaded file
+        return None
+
+    def _sniff(self):
+        self.content_type = sniff_content_type(self.head, self.file_name)
+        if self.content_type is None:
+            self._reject('Resume must be a PDF, DOCX or image (PNG, JPEG, GIF, WebP).',
+                         status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+    def _too_large(self):
+        return f'Resume must be at most {settings.RESUME_MAX_BYTES // 1024} KB.'
+
+    def _reject(self, message, status_code):
+        self.request.resume_rejection = UploadRejected(message, status_code)
+        # Stop reading the body; the rest of the upload is never received
+        raise StopUpload(connection_reset=True)
+
+
+def rejection(request):
+    """The ``UploadRejected`` for this request's resume, if the handler refused it; parses the body"""
+    request.FILES
+    return getattr(request, 'resume_rejection', None)
+
+
+def resume_metadata(request):
+    """Hash, size and sniffed type of the uploaded resume, as model fields ({} without one)"""
+    return getattr(request, 'resume_upload', {})
@@ -1,12 +1,24 @@
 # applications/urls.py
 
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from .views import  delete_job_application,update_job_application,get_job_application,job_stats, recent_applications, upcoming_interviews,add_job_application,interview_stats
+from .views import  delete_job_application,update_job_application,get_job_application,add_job_application,preferences
+from .metrics import metrics
+from .slow_queries import slow_queries
+from .events import event_stream
+from .sync import sync
+from .batch import batch
 from .auth_views import register, login, logout, get_user, refresh_token
 from .support_views import submit_support_request
 
+# Read-only dashboard endpoints: async versions when served over ASGI
+if settings.ASYNC_READ_VIEWS:
+    from .async_views import job_stats, recent_applications, upcoming_interviews, interview_stats
+else:
+    from .views import job_stats, recent_applications, upcoming_interviews, interview_stats
+
 router = DefaultRouter()
 # router.register(r'jobs', JobApplicationViewSet)
 
@@ -33,7 +45,25 @@ urlpatterns = [
     path('api/applications/<int:pk>/', get_job_application, name='get_job_application'),
     path('api/applications/<int:pk>/update/', update_job_application, name='update_job_application'),
     path('api/applications/<int:pk>/delete/', delete_job_application, name='delete_job_application'),
+
+    # Per-user settings (e.g. ghost_after_days for the ghosting sweep)
+    path('api/preferences/', preferences, name='preferences'),
+
+    # Several API calls in one request
+    path('api/batch/', batch, name='batch'),
+
+    # Delta sync for offline/mobile clients
+    path('api/sync/', sync, name='sync'),
+
+    # Live dashboard updates (Server-Sent Events, ASGI only)
+    path('api/events/', event_stream, name='event_stream'),
     
     # Support/Contact endpoint
     path('api/support/', submit_support_request, name='submit_support_request'),
+
+    # Prometheus scrape endpoint
+    path('metrics', metrics, name='metrics'),
+
+    # Staff-only diagnostics
+    path('api/admin/slow-queries/', slow_queries, name='slow_queries'),
 ]
@@ -1,17 +1,68 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Count
 from datetime import date
-from .models import JobApplication, Interview
-from .serializers import JobApplicationSerializer, InterviewSerializer
+from .models import ArchivedApplication, JobApplication, Interview, UserPreferences
+from .serializers import (
+    ArchivedApplicationSerializer, JobApplicationSerializer, InterviewSerializer, UserPreferencesSerializer,
+)
+from .stats import shared_job_stats, shared_interview_stats, dashboard_stats_for
+from . import events
+from .sync import record_deletions
+from .archive import archived_rows, include_archived, merge_archived
+from .idempotency import idempotent, retryable
+from .routers import use_read_replica
+from . import quotas
+from . import sharding
+from . import uploads
 from rest_framework import status
 
+RETURN_REPRESENTATION = 'return=representation'
+
+
+def wants_representation(request):
+    """True if the client sent "Prefer: return=representation" (RFC 7240)"""
+    prefer = request.headers.get('Prefer', '')
+    return RETURN_REPRESENTATION in (p.strip() for p in prefer.split(','))
+
+
+def mutation_result(user, application=None, interview=None, deleted=None):
+    """
+    The canonical rows a mutation touched plus fresh stats, so the client can
+    patch its local state without re-fetching. Call inside the mutation's
+    transaction so the stats match the write.
+    """
+    result = {
+        "application": application,
+        "interview": InterviewSerializer(interview).data if interview else None,
+        "stats": dashboard_stats_for(user),
+    }
+    if deleted is not None:
+        result["deleted"] = deleted
+    return result
+
+
+def _representation_response(response):
+    response['Preference-Applied'] = RETURN_REPRESENTATION
+    return response
+
+
+def _quota_response(exceeded):
+    # Quotas free up (the minute passes, rows are deleted), so a retry with
+    # the same Idempotency-Key runs again instead of replaying this
+    return retryable(Response({"error": exceeded.message}, status=exceeded.status_code, headers=exceeded.headers))
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@idempotent
 def add_job_application(request):
     try:
         resume_file = request.FILES.get('resume')  # Handle file
+        rejected = uploads.rejection(request)
+        if rejected:
+            # The body was cut off at the resume, so check this before the fields
+            return Response({"error": rejected.message}, status=rejected.status_code)
         data = request.data
         
         # Validate required fields before attempting to create
@@ -20,38 +71,58 @@ def add_job_application(request):
                 {"error": "Company and position are required fields."}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        # Create job application with validated data
-        # Status defaults to "Applied" if not provided (as per model default)
-        job = JobApplication.objects.create(
-            user=request.user,  # Link to authenticated user
-            company=data.get("company"),
-            position=data.get("position"),
-            status=data.get("status", "Applied"),  # Default to "Applied" if not provided
-            applied_date=data.get("applied_date"),
-            resume=resume_file,
-            job_description=data.get("job_description"),
-            contact_email=data.get("contact_email"),
-            contact_phone=data.get("contact_phone"),
-            company_website=data.get("company_website"),
-            notes=data.get("notes")
-        )
 
-        # Handle interview data if status is Interviewing
-        if data.get("status", "").lower() == "interviewing":
-            interview_date = data.get("interview_date")
-            interview_time = data.get("interview_time")
-            interview_type = data.get("interview_type")
-            
-            if interview_date:
-                Interview.objects.create(
-                    job_application=job,
-                    date=interview_date,
-                    time=interview_time or "10:00",
-                    type=interview_type or "Technical"
+        resume_bytes = uploads.resume_metadata(request).get('resume_size', 0)
+        with quotas.reserve(request.user, applications=1, resume_bytes=resume_bytes) as exceeded:
+            if exceeded:
+                return _quota_response(exceeded)
+
+            with sharding.atomic(request.user):
+                # Create job application with validated data
+                # Status defaults to "Applied" if not provided (as per model default)
+                # (through the user's related manager, so it lands on their shard)
+                job = request.user.job_applications.create(
+                    company=data.get("company"),
+                    position=data.get("position"),
+                    status=data.get("status", "Applied"),  # Default to "Applied" if not provided
+                    applied_date=data.get("applied_date"),
+                    resume=resume_file,
+                    **uploads.resume_metadata(request),
+                    job_description=data.get("job_description"),
+                    contact_email=data.get("contact_email"),
+                    contact_phone=data.get("contact_phone"),
+                    company_website=data.get("company_website"),
+                    notes=data.get("notes")
                 )
+                # Handle interview data if status is Interviewing
+                interview = None
+                if data.get("status", "").lower() == "interviewing":
+                    interview_date = data.get("interview_date")
+                    interview_time = data.get("interview_time")
+                    interview_type = data.get("interview_type")
+
+                    if interview_date:
+                        interview = job.interviews.create(
+                            date=interview_date,
+                            time=interview_time or "10:00",
+                            type=interview_type or "Technical"
+                        )
+                        events.publish_interview(request.user, interview, created=True)
 
-        return Response({"message": "Application and resume uploaded successfully."}, status=status.HTTP_201_CREATED)
+                # Push the change to the user's other open dashboards
+                events.publish_application(request.user, job, created=True)
+
+                body = {"message": "Application and resume uploaded successfully."}
+                representation = wants_representation(request)
+                if representation:
+                    # Re-read so dates and times given as strings come back normalized
+                    job.refresh_from_db()
+                    if interview:
+                        interview.refresh_from_db()
+                    body.update(mutation_result(request.user, JobApplicationSerializer(job).data, interview))
+
+        response = Response(body, status=status.HTTP_201_CREATED)
+        return _representation_response(response) if representation else response
 
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -59,79 +130,47 @@ def add_job_application(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@use_read_replica
 def job_stats(request):
     # Filter by authenticated user
-    user_applications = JobApplication.objects.filter(user=request.user)
-    stats = user_applications.values('status').annotate(count=Count('id'))
-    summary = {s['status'].lower(): s['count'] for s in stats}
-    data = {
-        "total": user_applications.count(),
-        "applied": summary.get("applied", 0),
-        "ghosted": summary.get("ghosted", 0),
-        "interviewing": summary.get("interviewing", 0),
-        "assessment": summary.get("assessment", 0),
-    }
-    return Response(data)
+    return Response(shared_job_stats(request.user, include_archived(request)))
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@use_read_replica
 def recent_applications(request):
     # Filter by authenticated user
-    applications = JobApplication.objects.filter(user=request.user).order_by('-applied_date')
+    applications = (
+        JobApplication.objects.for_user(request.user)
+        .prefetch_related('interviews')
+        .order_by('-applied_date')
+    )
     serializer = JobApplicationSerializer(applications, many=True)
+    if include_archived(request):
+        return Response(merge_archived(serializer.data, archived_rows(request.user)))
     return Response(serializer.data)
 
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@use_read_replica
 def upcoming_interviews(request):
     # Filter interviews by user's applications
-    user_applications = JobApplication.objects.filter(user=request.user)
-    interviews = Interview.objects.filter(
-        job_application__in=user_applications,
+    interviews = Interview.objects.for_user(request.user).filter(
         date__gte=date.today()
-    ).order_by('date', 'time')[:5]
+    ).select_related('job_application').order_by('date', 'time')[:5]
     serializer = InterviewSerializer(interviews, many=True)
     return Response(serializer.data)
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@use_read_replica
 def interview_stats(request):
     """Get interview statistics for the authenticated user"""
-    from datetime import timedelta
-    
-    user_applications = JobApplication.objects.filter(user=request.user)
-    
-    # Get all interviews for user's applications
-    all_interviews = Interview.objects.filter(job_application__in=user_applications)
-    
-    # Upcoming interviews (today and future)
-    upcoming_count = all_interviews.filter(date__gte=date.today()).count()
-    
-    # Completed interviews (in the last 30 days)
-    thirty_days_ago = date.today() - timedelta(days=30)
-    completed_count = all_interviews.filter(
-        date__lt=date.today(),
-        date__gte=thirty_days_ago
-    ).count()
-    
-    # Total interviews
-    total_count = all_interviews.count()
-    
-    # Calculate success rate (if we had offer data, but for now just return 0)
-    # This could be enhanced later to track offers/acceptances
-    success_rate = "0%"
-    
-    data = {
-        "upcoming": upcoming_count,
-        "completed": completed_count,
-        "total": total_count,
-        "success_rate": success_rate,
-    }
-    return Response(data)
+    return Response(shared_interview_stats(request.user, include_archived(request)))
 
 
 # views.py
@@ -144,63 +183,128 @@ def interview_stats(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@use_read_replica
 def get_job_application(request, pk):
     try:
         # Ensure user can only access their own applications
-        job = JobApplication.objects.get(pk=pk, user=request.user)
+        job = JobApplication.objects.for_user(request.user).prefetch_related('interviews').get(pk=pk)
         serializer = JobApplicationSerializer(job)
         return Response(serializer.data)
     except JobApplication.DoesNotExist:
-        return Response({"error": "Job application not found"}, status=status.HTTP_404_NOT_FOUND)
+        archived = None
+        if include_archived(request):
+            archived = ArchivedApplication.objects.for_user(request.user).filter(pk=pk).first()
+        if archived is None:
+            return Response({"error": "Job application not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(ArchivedApplicationSerializer(archived).data)
 
 @api_view(['PUT', 'PATCH'])
 @permission_classes([IsAuthenticated])
+@idempotent
 def update_job_application(request, pk):
     try:
         # Ensure user can only update their own applications
-        job = JobApplication.objects.get(pk=pk, user=request.user)
+        job = JobApplication.objects.for_user(request.user).get(pk=pk)
     except JobApplication.DoesNotExist:
         return Response({"error": "Job application not found"}, status=status.HTTP_404_NOT_FOUND)
 
+    rejected = uploads.rejection(request)
+    if rejected:
+        return Response({"error": rejected.message}, status=rejected.status_code)
+
     # Extract interview data before serialization
     interview_date = request.data.get('interview_date')
     interview_time = request.data.get('interview_time')
     interview_type = request.data.get('interview_type')
 
     serializer = JobApplicationSerializer(job, data=request.data, partial=(request.method == 'PATCH'))
-    if serializer.is_valid():
-        # Ensure user cannot be changed - always use the original user
-        updated_job = serializer.save(user=request.user)
-        
-        # Handle interview data if status is Interviewing
-        if updated_job.status == "Interviewing" and interview_date:
-            # Check if interview already exists
-            interview, created = Interview.objects.get_or_create(
-                job_application=updated_job,
-                defaults={
-                    'date': interview_date,
-                    'time': interview_time or '10:00',
-                    'type': interview_type or 'Technical'
-                }
-            )
-            # Update if already exists
-            if not created:
-                interview.date = interview_date
-                interview.time = interview_time or interview.time
-                interview.type = interview_type or interview.type
-                interview.save()
-        
-        return Response(serializer.data)
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    resume_fields = {}
+    resume_bytes = 0
+    if 'resume' in serializer.validated_data:
+        # A new resume, or none: the stored metadata follows the file
+        resume_fields = uploads.resume_metadata(request) or dict.fromkeys(
+            ('resume_sha256', 'resume_size', 'resume_content_type')
+        )
+        resume_bytes = (resume_fields['resume_size'] or 0) - (job.resume_size or 0)
+    with quotas.reserve(request.user, resume_bytes=resume_bytes) as exceeded:
+        if exceeded:
+            return _quota_response(exceeded)
+
+        with sharding.atomic(request.user):
+            # Ensure user cannot be changed - always use the original user
+            updated_job = serializer.save(user=request.user, **resume_fields)
+
+            # Handle interview data if status is Interviewing
+            interview = None
+            if updated_job.status == "Interviewing" and interview_date:
+                # Check if interview already exists
+                interview, created = updated_job.interviews.get_or_create(
+                    defaults={
+                        'date': interview_date,
+                        'time': interview_time or '10:00',
+                        'type': interview_type or 'Technical'
+                    }
+                )
+                # Update if already exists
+                if not created:
+                    interview.date = interview_date
+                    interview.time = interview_time or interview.time
+                    interview.type = interview_type or interview.type
+                    interview.save()
+                events.publish_interview(request.user, interview, created=created)
+
+            events.publish(request.user, events.APPLICATION_UPDATED, serializer.data)
+            representation = wants_representation(request)
+            if representation:
+                if interview:
+                    interview.refresh_from_db()  # Normalize values given as strings
+                body = mutation_result(request.user, serializer.data, interview)
+
+    if representation:
+        return _representation_response(Response(body))
+    return Response(serializer.data)
 
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
+@idempotent
 def delete_job_application(request, pk):
     try:
         # Ensure user can only delete their own applications
-        job = JobApplication.objects.get(pk=pk, user=request.user)
-        job.delete()
-        return Response({"message": "Job application deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
+        job = JobApplication.objects.for_user(request.user).get(pk=pk)
+        with sharding.atomic(request.user):
+            interview_ids = list(job.interviews.values_list('id', flat=True))
+            job.delete()
+            quotas.record(request.user, applications=-1, resume_bytes=-(job.resume_size or 0))
+            record_deletions(request.user, [pk], interview_ids)
+            events.publish_application_deleted(request.user, pk, interview_ids)
+
+            body = {"message": "Job application deleted successfully"}
+            representation = wants_representation(request)
+            if representation:
+                deleted = {"application": pk, "interviews": interview_ids}
+                body.update(mutation_result(request.user, deleted=deleted))
+
+        if representation:
+            # 204 cannot carry a body, so the representation comes with 200
+            return _representation_response(Response(body))
+        return Response(body, status=status.HTTP_204_NO_CONTENT)
     except JobApplication.DoesNotExist:
         return Response({"error": "Job application not found"}, status=status.HTTP_404_NOT_FOUND)
 
+
+@api_view(['GET', 'PATCH'])
+@permission_classes([IsAuthenticated])
+def preferences(request):
+    """The user's preferences; ghost_after_days null = site default, 0 = never auto-ghost"""
+    prefs = UserPreferences.objects.filter(user=request.user).first() or UserPreferences(user=request.user)
+    if request.method == 'GET':
+        return Response(UserPreferencesSerializer(prefs).data)
+
+    serializer = UserPreferencesSerializer(prefs, data=request.data, partial=True)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    serializer.save()
+    return Response(serializer.data)
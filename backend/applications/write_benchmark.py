@@ -0,0 +1,119 @@
+"""
+Concurrent SQLite write benchmark.
+
+Several processes (standing in for gunicorn workers) commit small write
+transactions shaped like the API's atomic writes, while reader processes scan
+the same table, for a fixed time against a scratch database file. Run once
+with Django's out-of-the-box settings and once with ``SQLITE_PRAGMAS`` and
+persistent connections to see the throughput the connection profile gains
+(``manage.py benchmark_sqlite_writes``).
+"""
+import multiprocessing
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+from .benchmarks import percentile
+from .sqlite_profile import apply_pragmas
+
+# What Django 5.0 runs with out of the box (sqlite3's 5 s timeout)
+DEFAULT_PRAGMAS = {'busy_timeout': 5000, 'journal_mode': 'DELETE', 'synchronous': 'FULL'}
+
+_BENCH_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS bench_rows ('
+    ' id INTEGER PRIMARY KEY AUTOINCREMENT, worker INTEGER NOT NULL,'
+    ' payload TEXT NOT NULL, created REAL NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS bench_counters (worker INTEGER PRIMARY KEY, writes INTEGER NOT NULL)',
+)
+
+
+def _write_worker(path, pragmas, persistent, worker, duration, start_at, results):
+    """One process issuing write transactions like the API's atomic writes"""
+    latencies, errors = [], 0
+    db = None
+    while time.time() < start_at:
+        time.sleep(0.001)
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        began = time.perf_counter()
+        try:
+            if db is None:
+                db = sqlite3.connect(path, timeout=0, isolation_level=None)
+                apply_pragmas(db, pragmas)
+            db.execute('BEGIN')
+            db.execute(
+                'INSERT INTO bench_rows (worker, payload, created) VALUES (?, ?, ?)',
+                (worker, 'x' * 200, time.time()),
+            )
+            db.execute(
+                'INSERT INTO bench_counters (worker, writes) VALUES (?, 1)'
+                ' ON CONFLICT (worker) DO UPDATE SET writes = writes + 1',
+                (worker,),
+            )
+            db.execute('COMMIT')
+            latencies.append((time.perf_counter() - began) * 1000)
+        except sqlite3.OperationalError:
+            errors += 1
+            if db is not None and db.in_transaction:
+                db.execute('ROLLBACK')
+        if not persistent and db is not None:
+            db.close()
+            db = None
+    results.put((latencies, errors))
+
+
+def _read_worker(path, pragmas, duration, start_at, stop):
+    db = sqlite3.connect(path, timeout=0, isolation_level=None)
+    apply_pragmas(db, pragmas)
+    while time.time() < start_at:
+        time.sleep(0.001)
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline and not stop.is_set():
+        try:
+            db.execute('SELECT worker, COUNT(*) FROM bench_rows GROUP BY worker').fetchall()
+        except sqlite3.OperationalError:
+            pass
+
+
+def write_throughput(path, pragmas, persistent, writers=4, readers=2, duration=3.0):
+    """
+    Run ``writers`` processes committing small transactions for ``duration``
+    seconds against a fresh database at ``path``, with ``readers`` processes
+    scanning it meanwhile. ``persistent`` keeps one connection per writer
+    instead of reconnecting per transaction (like CONN_MAX_AGE=0).
+    """
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    with closing(sqlite3.connect(path, isolation_level=None)) as db:
+        apply_pragmas(db, pragmas)
+        for statement in _BENCH_SCHEMA:
+            db.execute(statement)
+
+    # Workers connect with timeout=0, so only a busy_timeout in ``pragmas`` waits
+    context = multiprocessing.get_context('fork')
+    results, stop = context.Queue(), context.Event()
+    start_at = time.time() + 0.5
+    procs = [
+        context.Process(target=_write_worker, args=(path, pragmas, persistent, i, duration, start_at, results))
+        for i in range(writers)
+    ] + [
+        context.Process(target=_read_worker, args=(path, pragmas, duration, start_at, stop))
+        for _ in range(readers)
+    ]
+    for proc in procs:
+        proc.start()
+    collected = [results.get() for _ in range(writers)]
+    stop.set()
+    for proc in procs:
+        proc.join()
+
+    latencies = sorted(ms for worker_latencies, _ in collected for ms in worker_latencies)
+    return {
+        'commits': len(latencies),
+        'commits_per_sec': round(len(latencies) / duration, 1),
+        'errors': sum(errors for _, errors in collected),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+    }
@@ -0,0 +1,29 @@
+"""
+Gunicorn configuration, picked up automatically when gunicorn is started from
+the backend directory. Command-line flags (e.g. --workers) still take
+precedence over anything set here.
+"""
+import os
+import shutil
+
+# Each worker writes its Prometheus samples here so /metrics can aggregate
+# them. The directory must be emptied before workers start, otherwise counters
+# from a previous run would be reported again.
+PROMETHEUS_MULTIPROC_DIR = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', '/tmp/job_journey_metrics'
+)
+
+# Must be imported after the variable is set: prometheus_client picks its
+# storage (in-process vs. mmap files) at import time and workers inherit it
+from prometheus_client import multiprocess  # noqa: E402
+
+
+def on_starting(server):
+    shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+    os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+
+def child_exit(server, worker):
+    # Imported at module level: importing inside this hook can race when
+    # several workers exit at once during shutdown
+    multiprocess.mark_process_dead(worker.pid)
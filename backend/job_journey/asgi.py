@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_journey.settings')
 
 application = get_asgi_application()
+
+# Periodic ghosting sweep, when GHOSTING_SWEEP_INTERVAL is set
+from applications.ghosting import start_scheduler  # noqa: E402
+
+start_scheduler()
@@ -0,0 +1,27 @@
+/**
+ * Live Updates Stream Parser Tests
+ */
+
+import { parseEventStream } from '@/utils/liveUpdates'
+
+describe('parseEventStream', () => {
+  it('should parse complete frames and keep the partial rest', () => {
+    const buffer = 'id: 3\nevent: application.created\ndata: {"id": 7}\n\nid: 4\nevent: sta'
+    const { events, rest } = parseEventStream(buffer)
+    expect(events).toEqual([
+      { id: '3', type: 'application.created', data: { id: 7 }, retry: null },
+    ])
+    expect(rest).toBe('id: 4\nevent: sta')
+  })
+
+  it('should skip comments and report retry intervals', () => {
+    const { events } = parseEventStream('retry: 3000\n\n: ping\n\n')
+    expect(events).toEqual([{ id: null, type: 'message', data: '', retry: 3000 }])
+  })
+
+  it('should handle CRLF line endings', () => {
+    const { events } = parseEventStream('event: resync\r\ndata: {}\r\n\r\n')
+    expect(events[0].type).toBe('resync')
+    expect(events[0].data).toEqual({})
+  })
+})
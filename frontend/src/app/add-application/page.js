@@ -1,5 +1,5 @@
 "use client";
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { useRouter } from "next/navigation";
 import { API_ENDPOINTS, getAuthHeaders } from "@/config/api";
 import { useAuth } from "@/contexts/AuthContext";
@@ -61,6 +61,13 @@ export default function AddJobApplication() {
   const [showInterviewFields, setShowInterviewFields] = useState(false);
   const [resumeFileName, setResumeFileName] = useState("");
   const [dragActive, setDragActive] = useState(false);
+
+  // One Idempotency-Key per distinct submission: resubmitting the same form
+  // after a timeout cannot create a duplicate application
+  const idempotencyKeyRef = useRef(null);
+  useEffect(() => {
+    idempotencyKeyRef.current = null;
+  }, [formData, interviewData, showInterviewFields]);
   
   // Redirect to login if not authenticated
   useEffect(() => {
@@ -178,10 +185,17 @@ export default function AddJobApplication() {
         submitData.append("interview_type", interviewData.type);
       }
 
+      if (!idempotencyKeyRef.current) {
+        idempotencyKeyRef.current = crypto.randomUUID();
+      }
+
       // For FormData, don't include Content-Type header (browser sets it with boundary)
       const response = await fetch(API_ENDPOINTS.ADD_JOB_APPLICATION, {
         method: "POST",
-        headers: getAuthHeaders(false), // false = don't include Content-Type for FormData
+        headers: {
+          ...getAuthHeaders(false), // false = don't include Content-Type for FormData
+          "Idempotency-Key": idempotencyKeyRef.current,
+        },
         body: submitData,
       });
 
@@ -1,8 +1,9 @@
 "use client"
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { useRouter } from "next/navigation";
-import { API_ENDPOINTS, getAuthHeaders } from "@/config/api";
+import { API_ENDPOINTS, getAuthHeaders, RETURN_REPRESENTATION } from "@/config/api";
 import { useAuth } from "@/contexts/AuthContext";
+import { subscribeToChanges } from "@/utils/liveUpdates";
 
 // ─── Status Config ────────────────────────────────────────────
 const STATUS_CONFIG = {
@@ -80,6 +81,11 @@ export default function JobTrackingDashboard() {
     type: "Technical",
   });
 
+  // True once the live-update stream has done its first load; later
+  // resyncs reload quietly in the background
+  const liveRef = useRef(false);
+  const liveHandlerRef = useRef(null);
+
   const recent = apps.slice(0, 5);
 
   // Redirect to login if not authenticated
@@ -89,11 +95,22 @@ export default function JobTrackingDashboard() {
     }
   }, [authLoading, isAuthenticated, router]);
 
-  // Fetch data on component mount (only if authenticated)
+  // Subscribe to live updates on mount (only if authenticated). The stream
+  // opens with a "resync" event, which triggers the initial load; without a
+  // stream, load once. Our own mutations patch state from their responses.
   useEffect(() => {
-    if (isAuthenticated && !authLoading) {
-      fetchAllData();
-    }
+    if (!isAuthenticated || authLoading) return;
+    const unsubscribe = subscribeToChanges({
+      onEvent: (type, data) => liveHandlerRef.current && liveHandlerRef.current(type, data),
+      onUnavailable: () => {
+        liveRef.current = false;
+        fetchAllData();
+      },
+    });
+    return () => {
+      liveRef.current = false;
+      unsubscribe();
+    };
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [isAuthenticated, authLoading]);
 
@@ -111,8 +128,8 @@ export default function JobTrackingDashboard() {
     return null;
   }
 
-  const fetchAllData = async () => {
-    setIsLoading(true);
+  const fetchAllData = async ({ silent = false } = {}) => {
+    if (!silent) setIsLoading(true);
     setError(null);
     try {
       await Promise.all([fetchStats(), fetchApplications(), fetchInterviews(), fetchInterviewStats()]);
@@ -123,6 +140,75 @@ export default function JobTrackingDashboard() {
     }
   };
 
+  // ── Live updates ──
+  const byAppliedDateDesc = (a, b) => (b.applied_date || "").localeCompare(a.applied_date || "");
+  const byDateTime = (a, b) => `${a.date} ${a.time}`.localeCompare(`${b.date} ${b.time}`);
+
+  const upsert = (list, row, compare) =>
+    [...list.filter(item => item.id !== row.id), row].sort(compare);
+
+  const applyInterview = (interview) => {
+    if (interview.date >= getLocalISODate()) {
+      // Only the next five are shown
+      setInterviews(prev => upsert(prev, interview, byDateTime).slice(0, 5));
+    } else {
+      fetchInterviews().catch(() => {});
+    }
+  };
+
+  const removeInterviews = (ids) => {
+    // A slot may have opened up for the sixth interview
+    if (interviews.some(i => ids.includes(i.id))) {
+      setInterviews(prev => prev.filter(i => !ids.includes(i.id)));
+      fetchInterviews().catch(() => {});
+    }
+  };
+
+  // Patch local state from a mutation response (see RETURN_REPRESENTATION)
+  const applyMutationResult = (result) => {
+    if (result.stats) {
+      setStats(result.stats.jobs);
+      setInterviewStats(result.stats.interviews);
+    }
+    if (result.application) setApps(prev => upsert(prev, result.application, byAppliedDateDesc));
+    if (result.interview) applyInterview(result.interview);
+    if (result.deleted) {
+      setApps(prev => prev.filter(a => a.id !== result.deleted.application));
+      removeInterviews(result.deleted.interviews);
+    }
+  };
+
+  const handleLiveEvent = (type, data) => {
+    switch (type) {
+      case "resync":
+        // First connect, or the server could not resume: reload everything
+        fetchAllData({ silent: liveRef.current });
+        liveRef.current = true;
+        break;
+      case "stats":
+        setStats(data.jobs);
+        setInterviewStats(data.interviews);
+        break;
+      case "application.created":
+      case "application.updated":
+        setApps(prev => upsert(prev, data, byAppliedDateDesc));
+        break;
+      case "application.deleted":
+        setApps(prev => prev.filter(a => a.id !== data.id));
+        break;
+      case "interview.created":
+      case "interview.updated":
+        applyInterview(data);
+        break;
+      case "interview.deleted":
+        removeInterviews([data.id]);
+        break;
+      default:
+        break;
+    }
+  };
+  liveHandlerRef.current = handleLiveEvent;
+
   const fetchStats = async () => {
     const response = await fetch(API_ENDPOINTS.JOB_STATS, {
       headers: getAuthHeaders(),
@@ -187,17 +273,14 @@ export default function JobTrackingDashboard() {
     try {
       const response = await fetch(API_ENDPOINTS.UPDATE_JOB_APPLICATION(id), {
         method: "PATCH",
-        headers: getAuthHeaders(),
+        headers: { ...getAuthHeaders(), ...RETURN_REPRESENTATION },
         body: JSON.stringify({ status: val }),
       });
       if (!response.ok) throw new Error("Failed to update status");
       
-      // Update local state
-      setApps(prev => prev.map(a => a.id === id ? { ...a, status: val } : a));
+      // Update local state and stats from the response
+      applyMutationResult(await response.json());
       setEditingId(null);
-      
-      // Refresh stats
-      fetchStats();
     } catch (err) {
       console.error("Error updating status:", err);
       alert("Failed to update status. Please try again.");
@@ -210,7 +293,7 @@ export default function JobTrackingDashboard() {
     try {
       const response = await fetch(API_ENDPOINTS.UPDATE_JOB_APPLICATION(interviewModal), {
         method: "PATCH",
-        headers: getAuthHeaders(),
+        headers: { ...getAuthHeaders(), ...RETURN_REPRESENTATION },
         body: JSON.stringify({ 
           status: "Interviewing",
           interview_date: interviewData.date,
@@ -220,8 +303,8 @@ export default function JobTrackingDashboard() {
       });
       if (!response.ok) throw new Error("Failed to update status");
       
-      // Update local state
-      setApps(prev => prev.map(a => a.id === interviewModal ? { ...a, status: "Interviewing" } : a));
+      // Update local state, interviews and stats from the response
+      applyMutationResult(await response.json());
       setInterviewModal(null);
       
       // Reset interview data
@@ -230,11 +313,6 @@ export default function JobTrackingDashboard() {
         time: "10:00",
         type: "Technical",
       });
-      
-      // Refresh data
-      fetchStats();
-      fetchInterviews();
-      fetchInterviewStats();
     } catch (err) {
       console.error("Error updating status:", err);
       alert("Failed to update status. Please try again.");
@@ -245,23 +323,13 @@ export default function JobTrackingDashboard() {
     try {
       const response = await fetch(API_ENDPOINTS.DELETE_JOB_APPLICATION(id), {
         method: "DELETE",
-        headers: getAuthHeaders(),
+        headers: { ...getAuthHeaders(), ...RETURN_REPRESENTATION },
       });
       if (!response.ok) throw new Error("Failed to delete application");
       
-      // Update local state
-      setApps(prev => prev.filter(a => a.id !== id));
+      // Remove the application and its interviews, and update stats
+      applyMutationResult(await response.json());
       setDeleteConfirm(null);
-      
-      // Remove interviews tied to deleted application
-      setInterviews(prev => prev.filter(i => i.job_application_id !== id));
-      
-      // Refresh stats and interview data
-      await Promise.all([
-        fetchStats(),
-        fetchInterviews(),
-        fetchInterviewStats()
-      ]);
     } catch (err) {
       console.error("Error deleting application:", err);
       alert("Failed to delete application. Please try again.");
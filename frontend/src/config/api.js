@@ -71,6 +71,7 @@ const endpointDescriptors = {
   ADD_JOB_APPLICATION: { get: () => `${getBaseUrl()}/api/add-job-application/`, enumerable: true, configurable: true },
   MEDIA_BASE: { get: () => getBaseUrl(), enumerable: true, configurable: true },
   SUBMIT_SUPPORT: { get: () => `${getBaseUrl()}/api/support/`, enumerable: true, configurable: true },
+  EVENTS: { get: () => `${getBaseUrl()}/api/events/`, enumerable: true, configurable: true },
 };
 
 // Create the object with getters
@@ -114,6 +115,10 @@ export const getAuthHeaders = (includeContentType = true) => {
   return headers;
 };
 
+// Ask mutation endpoints to return the changed rows and fresh stats
+// ({ application, interview, stats }) so callers can skip follow-up GETs
+export const RETURN_REPRESENTATION = { Prefer: 'return=representation' };
+
 // Helper function to handle API errors
 export const handleApiError = (error, defaultMessage = 'An error occurred') => {
   if (error instanceof TypeError && error.message.includes('fetch')) {
@@ -0,0 +1,98 @@
+// Live dashboard updates (Server-Sent Events from /api/events/)
+//
+// EventSource cannot send an Authorization header, so the stream is read with
+// fetch() and parsed here. The server closes streams periodically; we
+// reconnect with Last-Event-ID so no change is missed. A "resync" event means
+// the server could not resume and the caller should reload its data.
+
+import { API_ENDPOINTS, getAuthHeaders } from '@/config/api';
+
+const DEFAULT_RETRY_MS = 3000;
+const MAX_RETRY_MS = 30000;
+
+// Parse complete SSE frames out of `buffer`; returns the frames and the unparsed rest
+export const parseEventStream = (buffer) => {
+  const events = [];
+  const blocks = buffer.replace(/\r\n/g, '\n').split('\n\n');
+  const rest = blocks.pop();
+
+  for (const block of blocks) {
+    const event = { id: null, type: 'message', data: '', retry: null };
+    const data = [];
+    for (const line of block.split('\n')) {
+      if (!line || line.startsWith(':')) continue;
+      const colon = line.indexOf(':');
+      const field = colon === -1 ? line : line.slice(0, colon);
+      const value = colon === -1 ? '' : line.slice(colon + 1).replace(/^ /, '');
+      if (field === 'id') event.id = value;
+      else if (field === 'event') event.type = value;
+      else if (field === 'data') data.push(value);
+      else if (field === 'retry') event.retry = parseInt(value, 10);
+    }
+    if (data.length) {
+      event.data = JSON.parse(data.join('\n'));
+      events.push(event);
+    } else if (event.retry !== null) {
+      events.push(event);
+    }
+  }
+  return { events, rest };
+};
+
+// Subscribe to the current user's change events.
+// onEvent(type, data) is called per event; onUnavailable() once if the server
+// cannot stream (e.g. running under WSGI). Returns an unsubscribe function.
+export const subscribeToChanges = ({ onEvent, onUnavailable }) => {
+  let stopped = false;
+  let controller = null;
+  let lastEventId = null;
+  let retryMs = DEFAULT_RETRY_MS;
+  let failures = 0;
+
+  const connect = async () => {
+    while (!stopped) {
+      controller = new AbortController();
+      try {
+        const headers = getAuthHeaders(false);
+        if (lastEventId) headers['Last-Event-ID'] = lastEventId;
+        const response = await fetch(API_ENDPOINTS.EVENTS, { headers, signal: controller.signal });
+
+        if (!response.ok || !response.body) {
+          // 401 is left to the auth flow; 404/503 mean no live updates here
+          if (response.status !== 401 && onUnavailable) onUnavailable();
+          return;
+        }
+        failures = 0;
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (!stopped) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += decoder.decode(value, { stream: true });
+          const parsed = parseEventStream(buffer);
+          buffer = parsed.rest;
+          for (const event of parsed.events) {
+            if (event.retry !== null) retryMs = event.retry;
+            if (event.id) lastEventId = event.id;
+            if (event.type !== 'message') onEvent(event.type, event.data);
+          }
+        }
+      } catch (error) {
+        if (stopped) return;
+        failures += 1;
+        console.warn('Live updates disconnected:', error);
+      }
+      const delay = Math.min(retryMs * 2 ** failures, MAX_RETRY_MS);
+      await new Promise((resolve) => setTimeout(resolve, delay));
+    }
+  };
+
+  connect();
+
+  return () => {
+    stopped = true;
+    if (controller) controller.abort();
+  };
+};
@@ -94,7 +94,9 @@ python manage.py migrate --noinput || true
 
 # Start backend with gunicorn in background
 echo "Starting backend server..."
-gunicorn --bind 0.0.0.0:8000 --workers 3 --timeout 120 job_journey.wsgi:application &
+# ASGI worker so the async dashboard views don't hold a worker per request
+export ASYNC_READ_VIEWS=${ASYNC_READ_VIEWS:-True}
+gunicorn --bind 0.0.0.0:8000 --workers 3 --worker-class uvicorn.workers.UvicornWorker --timeout 120 job_journey.asgi:application &
 BACKEND_PID=$!
 
 # Wait for backend to be ready
@@ -0,0 +1,126 @@
+"""
+Tests for the application archive: the archive command and ?include_archived=1
+"""
+import io
+import json
+from datetime import date, time, timedelta
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import AsyncRequestFactory, TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from applications import async_views
+from applications.models import ArchivedApplication, Interview, JobApplication, Tombstone
+
+User = get_user_model()
+
+OLD = date.today() - timedelta(days=400)
+
+
+def _archive(*args):
+    out = io.StringIO()
+    call_command('archive_applications', '--older-than-days', '180', *args, stdout=out)
+    return out.getvalue()
+
+
+class ArchiveCommandTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.old_ghosted = JobApplication.objects.create(
+            user=self.user, company='Old Co', position='Dev', status='Ghosted', applied_date=OLD,
+        )
+        self.interview = Interview.objects.create(
+            job_application=self.old_ghosted, date=OLD + timedelta(days=5), time=time(10, 0), type='HR',
+        )
+        self.recent_ghosted = JobApplication.objects.create(
+            user=self.user, company='New Co', position='Dev', status='Ghosted', applied_date=date.today(),
+        )
+        self.old_applied = JobApplication.objects.create(
+            user=self.user, company='Open Co', position='Dev', status='Applied', applied_date=OLD,
+        )
+
+    def test_moves_old_rows_in_the_status(self):
+        self.assertIn('Archived 1 Ghosted applications', _archive('--status', 'Ghosted'))
+
+        archived = ArchivedApplication.objects.get()
+        self.assertEqual(archived.pk, self.old_ghosted.pk)
+        self.assertEqual((archived.company, archived.status, archived.applied_date), ('Old Co', 'Ghosted', OLD))
+        self.assertEqual(archived.interviews[0]['id'], self.interview.pk)
+        self.assertEqual(
+            set(JobApplication.objects.values_list('pk', flat=True)),
+            {self.recent_ghosted.pk, self.old_applied.pk},
+        )
+        self.assertFalse(Interview.objects.exists())
+        # Delta sync clients drop the rows like deletions
+        self.assertEqual(
+            set(Tombstone.objects.values_list('kind', 'object_id')),
+            {(Tombstone.APPLICATION, self.old_ghosted.pk), (Tombstone.INTERVIEW, self.interview.pk)},
+        )
+
+    def test_batches_and_several_statuses(self):
+        self.assertIn('Archived 2 Ghosted/Applied', _archive('--status', 'Ghosted', '--status', 'Applied', '--batch-size', '1'))
+        self.assertEqual(ArchivedApplication.objects.count(), 2)
+
+    def test_dry_run(self):
+        self.assertIn('1 Ghosted applications applied before', _archive('--dry-run'))
+        self.assertFalse(ArchivedApplication.objects.exists())
+
+    def test_unknown_status(self):
+        with self.assertRaises(CommandError):
+            _archive('--status', 'Closed')
+
+
+class IncludeArchivedTests(TransactionTestCase):
+    # Async views query on their own connections, so the data must be committed
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+        old = JobApplication.objects.create(
+            user=self.user, company='Old Co', position='Dev', status='Ghosted', applied_date=OLD,
+        )
+        Interview.objects.create(job_application=old, date=OLD + timedelta(days=5), time=time(10, 0), type='HR')
+        self.hot = JobApplication.objects.create(user=self.user, company='New Co', position='Dev', status='Applied')
+        self.archived_id = old.pk
+        _archive()
+
+    def _get(self, url_name, *args, **params):
+        return self.client.get(reverse(url_name, args=args), params)
+
+    def test_list_reads_hot_rows_unless_asked(self):
+        self.assertEqual([row['company'] for row in self._get('recent_applications').json()], ['New Co'])
+
+        rows = self._get('recent_applications', include_archived='1').json()
+        self.assertEqual([row['company'] for row in rows], ['New Co', 'Old Co'])
+        self.assertNotIn('archived', rows[0])
+        self.assertTrue(rows[1]['archived'])
+        self.assertEqual(rows[1]['interview_date'], (OLD + timedelta(days=5)).isoformat())
+        self.assertEqual(rows[1]['interview_time'], '10:00:00')
+        self.assertEqual(set(rows[0]) | {'archived'}, set(rows[1]))
+
+    def test_stats(self):
+        self.assertEqual(self._get('job_stats').json()['total'], 1)
+        stats = self._get('job_stats', include_archived='1').json()
+        self.assertEqual((stats['total'], stats['ghosted'], stats['applied']), (2, 1, 1))
+        self.assertEqual(self._get('interview_stats').json()['total'], 0)
+        self.assertEqual(self._get('interview_stats', include_archived='1').json()['total'], 1)
+
+    def test_detail(self):
+        self.assertEqual(self._get('get_job_application', self.archived_id).status_code, 404)
+        response = self._get('get_job_application', self.archived_id, include_archived='1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['company'], 'Old Co')
+
+    def test_async_views_match(self):
+        factory = AsyncRequestFactory()
+        for name in ('job_stats', 'recent_applications', 'interview_stats'):
+            with self.subTest(view=name):
+                request = factory.get('/', {'include_archived': '1'}, headers={'Authorization': f'Bearer {self.token}'})
+                response = async_to_sync(getattr(async_views, name))(request)
+                self.assertEqual(json.loads(response.content), self._get(name, include_archived='1').json())
@@ -0,0 +1,84 @@
+"""
+Tests for the async dashboard read views
+"""
+from django.test import TransactionTestCase, AsyncRequestFactory
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from asgiref.sync import async_to_sync
+from datetime import date, time, timedelta
+from applications import async_views
+from applications.models import JobApplication, Interview
+import json
+
+User = get_user_model()
+
+
+class AsyncReadViewTests(TransactionTestCase):
+    """Async views return the same data as the DRF views"""
+
+    # Async views query on their own connections, so the data must be committed
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            username='otheruser',
+            email='other@example.com',
+            password='testpass123'
+        )
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+        self.factory = AsyncRequestFactory()
+
+        job = JobApplication.objects.create(
+            user=self.user, company="Company A", position="Developer",
+            status="Interviewing", applied_date=date.today() - timedelta(days=3),
+        )
+        JobApplication.objects.create(user=self.user, company="Company B", position="Engineer", status="Applied")
+        JobApplication.objects.create(user=self.other, company="Other Co", position="Engineer", status="Ghosted")
+        Interview.objects.create(job_application=job, date=date.today() + timedelta(days=2), time=time(14, 0), type="HR")
+        Interview.objects.create(job_application=job, date=date.today() - timedelta(days=5), time=time(9, 0), type="Technical")
+
+    def _async_get(self, view, token=None):
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        request = self.factory.get('/', headers=headers)
+        return async_to_sync(view)(request)
+
+    def _sync_get(self, url_name):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        return client.get(reverse(url_name)).json()
+
+    def test_matches_sync_views(self):
+        """Each async view returns exactly what its DRF counterpart returns"""
+        for name in ('job_stats', 'recent_applications', 'upcoming_interviews', 'interview_stats'):
+            with self.subTest(view=name):
+                response = self._async_get(getattr(async_views, name), self.token)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(json.loads(response.content), self._sync_get(name))
+
+    def test_data_is_scoped_to_user(self):
+        """Only the authenticated user's rows are counted"""
+        response = self._async_get(async_views.job_stats, self.token)
+        data = json.loads(response.content)
+        self.assertEqual(data['total'], 2)
+        self.assertEqual(data['ghosted'], 0)
+
+    def test_requires_authentication(self):
+        """Missing or invalid tokens are rejected with 401"""
+        self.assertEqual(self._async_get(async_views.job_stats).status_code, 401)
+        self.assertEqual(self._async_get(async_views.job_stats, 'not-a-token').status_code, 401)
+
+    def test_inactive_user_rejected(self):
+        """Tokens of deactivated users are rejected"""
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self._async_get(async_views.interview_stats, self.token).status_code, 401)
+
+    def test_rejects_non_get(self):
+        """Read views only accept GET"""
+        request = self.factory.post('/', headers={'Authorization': f'Bearer {self.token}'})
+        self.assertEqual(async_to_sync(async_views.job_stats)(request).status_code, 405)
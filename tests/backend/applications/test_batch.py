@@ -0,0 +1,111 @@
+"""
+Tests for the batch request endpoint
+"""
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from datetime import date
+from applications import async_views, views
+from applications.batch import _in_process_view
+from applications.models import JobApplication
+
+User = get_user_model()
+
+
+class BatchTests(TestCase):
+    """POST /api/batch/ dispatches sub-requests in order"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.other = User.objects.create_user(username='otheruser', password='testpass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        self.job = JobApplication.objects.create(user=self.user, company='Acme', position='Dev')
+        self.foreign = JobApplication.objects.create(user=self.other, company='Other', position='Dev')
+
+    def _batch(self, calls, **extra):
+        return self.client.post(reverse('batch'), {'requests': calls, **extra}, format='json')
+
+    def _create(self, company):
+        return {'method': 'POST', 'path': '/api/add-job-application/',
+                'body': {'company': company, 'position': 'Dev', 'applied_date': date.today().isoformat()}}
+
+    def test_runs_calls_in_order(self):
+        """Each call gets its own status and body"""
+        response = self._batch([
+            {'method': 'PATCH', 'path': f'/api/applications/{self.job.pk}/update/', 'body': {'status': 'Ghosted'}},
+            {'method': 'GET', 'path': '/api/job-stats/'},
+            {'method': 'GET', 'path': '/api/recent-applications/?unused=1'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['responses']
+        self.assertEqual([r['status'] for r in results], [200, 200, 200])
+        self.assertEqual(results[0]['body']['status'], 'Ghosted')
+        self.assertEqual(results[1]['body']['ghosted'], 1)
+        self.assertEqual([a['id'] for a in results[2]['body']], [self.job.pk])
+
+    def test_sub_requests_are_scoped_to_user(self):
+        """The batch user cannot reach other users' rows"""
+        results = self._batch([{'method': 'GET', 'path': f'/api/applications/{self.foreign.pk}/'}]).json()['responses']
+        self.assertEqual(results[0]['status'], 404)
+
+    def test_non_atomic_batch_keeps_successful_calls(self):
+        results = self._batch([self._create('Globex'), {'method': 'GET', 'path': '/api/nope/'}, self._create('Initech')])
+        self.assertEqual([r['status'] for r in results.json()['responses']], [201, 404, 201])
+        self.assertEqual(JobApplication.objects.filter(user=self.user).count(), 3)
+
+    def test_atomic_batch_rolls_back_on_failure(self):
+        """A failing call undoes earlier calls and skips later ones"""
+        response = self._batch([
+            self._create('Globex'),
+            {'method': 'DELETE', 'path': '/api/applications/999999/delete/'},
+            self._create('Initech'),
+        ], atomic=True)
+        data = response.json()
+        self.assertFalse(data['committed'])
+        self.assertEqual([r['status'] for r in data['responses']], [201, 404, 424])
+        self.assertFalse(JobApplication.objects.filter(company__in=['Globex', 'Initech']).exists())
+
+    def test_atomic_batch_commits(self):
+        data = self._batch([self._create('Globex'), self._create('Initech')], atomic=True).json()
+        self.assertTrue(data['committed'])
+        self.assertEqual(JobApplication.objects.filter(user=self.user).count(), 3)
+
+    def test_headers_are_passed_through(self):
+        """Per-call headers reach the view"""
+        call = {**self._create('Globex'), 'headers': {'Prefer': 'return=representation'}}
+        body = self._batch([call]).json()['responses'][0]['body']
+        self.assertEqual(body['application']['company'], 'Globex')
+
+    def test_rejects_invalid_calls(self):
+        results = self._batch([
+            {'method': 'TRACE', 'path': '/api/job-stats/'},
+            {'method': 'GET', 'path': '/admin/'},
+            {'method': 'POST', 'path': '/api/batch/', 'body': {'requests': []}},
+            'not-an-object',
+        ]).json()['responses']
+        self.assertEqual([r['status'] for r in results], [400, 400, 400, 400])
+
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_request_limit(self):
+        calls = [{'method': 'GET', 'path': '/api/job-stats/'}] * 3
+        self.assertEqual(self._batch(calls).status_code, 400)
+        self.assertEqual(self._batch([]).status_code, 400)
+
+    @override_settings(BATCH_MAX_QUERIES=1)
+    def test_work_limit(self):
+        """Calls after the query budget is spent are refused"""
+        calls = [{'method': 'GET', 'path': '/api/job-stats/'}] * 2
+        results = self._batch(calls).json()['responses']
+        self.assertEqual([r['status'] for r in results], [200, 429])
+
+    def test_async_read_views_see_batch_writes(self):
+        """Async views are swapped for their DRF versions, which share the transaction"""
+        self.assertIs(_in_process_view(async_views.job_stats), views.job_stats)
+        self.assertIs(_in_process_view(views.job_stats), views.job_stats)
+
+    def test_requires_authentication(self):
+        self.client.credentials()
+        self.assertEqual(self._batch([{'method': 'GET', 'path': '/api/job-stats/'}]).status_code, 401)
@@ -0,0 +1,83 @@
+"""
+Tests for the endpoint benchmark helpers
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from applications.benchmarks import (
+    SCENARIOS, BenchmarkContext, BenchmarkError, compare_results, percentile, run_benchmarks, run_scenario,
+    seed_dataset,
+)
+
+User = get_user_model()
+
+
+def _report(**views):
+    return {'results': {'100': views}}
+
+
+class BenchmarkTests(TestCase):
+    """Test percentile maths, baseline comparison and a minimal run"""
+
+    def test_percentile_nearest_rank(self):
+        """Nearest-rank percentile over sorted samples"""
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 95), 95.0)
+        self.assertEqual(percentile(values, 100), 100.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_compare_flags_latency_beyond_tolerance(self):
+        """Latency growth beyond tolerance is a regression, within it is not"""
+        baseline = _report(job_stats={'p50_ms': 10.0, 'p95_ms': 20.0, 'queries': 3})
+        current = _report(job_stats={'p50_ms': 12.0, 'p95_ms': 30.0, 'queries': 3})
+
+        regressions = compare_results(baseline, current, tolerance=0.25)
+        self.assertEqual([r['metric'] for r in regressions], ['p95_ms'])
+
+    def test_compare_ignores_sub_millisecond_noise(self):
+        """Tiny absolute changes are not flagged even if relatively large"""
+        baseline = _report(get_user={'p50_ms': 0.5, 'p95_ms': 0.6, 'queries': 1})
+        current = _report(get_user={'p50_ms': 0.9, 'p95_ms': 1.0, 'queries': 1})
+        self.assertEqual(compare_results(baseline, current), [])
+
+    def test_compare_flags_any_query_increase(self):
+        """An extra query per request is always a regression"""
+        baseline = _report(recent_applications={'p50_ms': 5.0, 'p95_ms': 6.0, 'queries': 3})
+        current = _report(recent_applications={'p50_ms': 5.0, 'p95_ms': 6.0, 'queries': 4})
+        self.assertEqual(compare_results(baseline, current)[0]['metric'], 'queries')
+
+    def test_run_benchmarks_smoke(self):
+        """A small run produces percentiles and query counts per view"""
+        report = run_benchmarks(
+            sizes=[5], iterations=2, warmup=0,
+            views=['recent_applications', 'add_job_application'],
+        )
+        result = report['results']['5']['recent_applications']
+        self.assertEqual(result['iterations'], 2)
+        self.assertGreater(result['queries'], 0)
+        self.assertIn('add_job_application', report['results']['5'])
+
+    def test_reads_must_see_the_seeded_rows(self):
+        """A GET answered without the seeded dataset (e.g. from the wrong database) is an error"""
+        scenarios = [s for s in SCENARIOS if s.seeded]
+        self.assertEqual({s.name for s in scenarios}, {'recent_applications', 'job_stats'})
+        seeded = BenchmarkContext(5, seed_dataset(5, seed=42))
+        empty = BenchmarkContext(5, User.objects.create_user(username='bench_empty', password='testpass123'))
+        for scenario in scenarios:
+            self.assertEqual(run_scenario(scenario, seeded, iterations=1, warmup=0)['iterations'], 1)
+            with self.assertRaisesMessage(BenchmarkError, 'saw 0 of the 5 seeded applications'):
+                run_scenario(scenario, empty, iterations=1, warmup=0)
+
+    @override_settings(QUOTA_MAX_APPLICATIONS=5000, QUOTA_WRITES_PER_MINUTE=2)
+    def test_quotas_do_not_cut_large_datasets_short(self):
+        """Datasets above the application quota still benchmark writes"""
+        report = run_benchmarks(sizes=[5001], iterations=3, warmup=0, views=['add_job_application'])
+        self.assertEqual(report['results']['5001']['add_job_application']['iterations'], 3)
+
+    def test_runs_in_a_private_cache(self):
+        """Benchmark users' cache keys neither reach nor read the shared cache"""
+        cache.clear()
+        cache.set('sentinel', True)
+        run_benchmarks(sizes=[3], iterations=1, warmup=0, views=['job_stats', 'add_job_application'])
+        self.assertEqual(list(cache._cache), [cache.make_key('sentinel')])
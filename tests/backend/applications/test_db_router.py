@@ -0,0 +1,100 @@
+"""
+Tests for read/write routing to the read-only replica
+"""
+import time
+from datetime import date
+from types import SimpleNamespace
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router, transaction
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from applications import routers
+from applications.models import JobApplication
+from applications.routers import READ_REPLICA_ALIAS, ReadReplicaRouter, pin_to_primary, use_read_replica
+
+User = get_user_model()
+
+
+def _read_db(request):
+    return router.db_for_read(JobApplication)
+
+
+@use_read_replica
+async def _async_read_db(request):
+    return router.db_for_read(JobApplication)
+
+
+@override_settings(READ_YOUR_WRITES_SECONDS=60)
+@mock.patch.object(routers, 'replica_configured', return_value=True)
+class ReadReplicaRoutingTests(SimpleTestCase):
+    databases = {'default'}
+
+    def setUp(self):
+        cache.clear()
+        self.request = SimpleNamespace(user=SimpleNamespace(pk=7, is_authenticated=True))
+        self.view = use_read_replica(_read_db)
+
+    def test_decorated_views_read_from_replica(self, _):
+        self.assertEqual(self.view(self.request), READ_REPLICA_ALIAS)
+        self.assertEqual(async_to_sync(_async_read_db)(self.request), READ_REPLICA_ALIAS)
+
+    def test_other_code_reads_and_writes_default(self, _):
+        self.assertEqual(router.db_for_read(JobApplication), 'default')
+        self.view(self.request)
+        self.assertEqual(router.db_for_read(JobApplication), 'default')
+        self.assertEqual(router.db_for_write(JobApplication), 'default')
+
+    def test_reads_stick_to_primary_after_a_write(self, _):
+        pin_to_primary(7)
+        self.assertEqual(self.view(self.request), 'default')
+        self.assertEqual(async_to_sync(_async_read_db)(self.request), 'default')
+        other = SimpleNamespace(user=SimpleNamespace(pk=8, is_authenticated=True))
+        self.assertEqual(self.view(other), READ_REPLICA_ALIAS)
+
+    @override_settings(READ_YOUR_WRITES_SECONDS=0.05)
+    def test_stickiness_expires(self, _):
+        pin_to_primary(7)
+        time.sleep(0.1)
+        self.assertEqual(self.view(self.request), READ_REPLICA_ALIAS)
+
+    def test_reads_inside_a_transaction_use_default(self, _):
+        with transaction.atomic():
+            self.assertEqual(self.view(self.request), 'default')
+
+    def test_replica_is_never_migrated(self, _):
+        self.assertFalse(ReadReplicaRouter().allow_migrate(READ_REPLICA_ALIAS, 'applications'))
+        self.assertIsNone(ReadReplicaRouter().allow_migrate('default', 'applications'))
+
+
+class ReplicaNotConfiguredTests(SimpleTestCase):
+    def test_falls_back_to_default(self):
+        request = SimpleNamespace(user=SimpleNamespace(pk=7, is_authenticated=True))
+        self.assertEqual(use_read_replica(_read_db)(request), 'default')
+
+
+@override_settings(READ_YOUR_WRITES_SECONDS=60)
+class PinOnWriteTests(TransactionTestCase):
+    """A committed write pins the writer's reads to the primary"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    @mock.patch.object(routers, 'replica_configured', return_value=True)
+    def test_write_pins_user(self, _):
+        response = self.client.post(reverse('add_job_application'), {
+            'company': 'Acme', 'position': 'Dev', 'applied_date': date.today().isoformat(),
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(routers.read_alias_for(self.user), 'default')
+        other = User.objects.create_user(username='other', password='testpass123')
+        self.assertEqual(routers.read_alias_for(other), READ_REPLICA_ALIAS)
@@ -0,0 +1,68 @@
+"""
+Tests for the generate_synthetic_data management command
+"""
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from applications.models import JobApplication, Interview
+from io import StringIO
+
+User = get_user_model()
+
+
+class GenerateSyntheticDataTests(TestCase):
+    """Test cases for the synthetic dataset generator"""
+
+    def _generate(self, *args):
+        call_command(
+            'generate_synthetic_data',
+            '--users', '3',
+            '--applications-per-user', '20',
+            '--batch-size', '7',
+            *args,
+            stdout=StringIO(),
+        )
+
+    def _snapshot(self):
+        return list(
+            JobApplication.objects.filter(user__username__startswith='loadtest_user_')
+            .order_by('user__username', 'company')
+            .values_list('user__username', 'company', 'position', 'status', 'applied_date')
+        )
+
+    def test_generates_users_applications_and_interviews(self):
+        """Users, applications and interviews are created across batches"""
+        self._generate('--status-weights', 'Interviewing=1', '--interview-rate', '1')
+
+        self.assertEqual(User.objects.filter(username__startswith='loadtest_user_').count(), 3)
+        self.assertGreaterEqual(JobApplication.objects.count(), 30)
+        self.assertEqual(set(JobApplication.objects.values_list('status', flat=True)), {'Interviewing'})
+        self.assertEqual(
+            Interview.objects.values('job_application').distinct().count(),
+            JobApplication.objects.count()
+        )
+
+    def test_same_seed_is_reproducible(self):
+        """The same seed produces the same dataset"""
+        self._generate('--seed', '7')
+        first = self._snapshot()
+        self._generate('--seed', '7', '--clear')
+        self.assertEqual(self._snapshot(), first)
+
+    def test_existing_prefix_requires_clear(self):
+        """Re-running without --clear refuses to mix datasets"""
+        self._generate()
+        with self.assertRaises(CommandError):
+            self._generate()
+
+    def test_invalid_status_weights(self):
+        """Unknown statuses are rejected"""
+        with self.assertRaises(CommandError):
+            self._generate('--status-weights', 'Hired=1')
+
+    def test_text_sizes(self):
+        """Text length options control job_description and notes"""
+        self._generate('--description-length', '0', '--notes-length', '50')
+        self.assertFalse(JobApplication.objects.exclude(job_description=None).exists())
+        self.assertFalse(JobApplication.objects.filter(notes=None).exists())
@@ -0,0 +1,136 @@
+"""
+Tests for the ghosting sweep and the per-user preference that tunes it
+"""
+import io
+from datetime import date, time, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from applications import ghosting
+from applications.coalesce import stats_key
+from applications.models import ChangeEvent, Interview, JobApplication, UserPreferences
+
+User = get_user_model()
+
+
+@override_settings(GHOST_AFTER_DAYS=30)
+class GhostingSweepTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.default_user = User.objects.create_user(username='default', password='testpass123')
+        self.eager_user = User.objects.create_user(username='eager', password='testpass123')
+        self.opted_out = User.objects.create_user(username='optedout', password='testpass123')
+        UserPreferences.objects.create(user=self.eager_user, ghost_after_days=5)
+        UserPreferences.objects.create(user=self.opted_out, ghost_after_days=0)
+
+        self.stale = self._application(self.default_user, 'Stale', days_idle=40)
+        self.recent = self._application(self.default_user, 'Recent', days_idle=10)
+        self.interviewed = self._application(self.default_user, 'Interviewed', days_idle=40)
+        Interview.objects.create(job_application=self.interviewed, date=date.today(), time=time(10, 0), type='HR')
+        self.assessment = self._application(self.default_user, 'Assessment', days_idle=40, status='Assessment')
+        self.eager = self._application(self.eager_user, 'Eager', days_idle=10)
+        self.kept = self._application(self.opted_out, 'Kept', days_idle=400)
+
+    def _application(self, user, company, days_idle, status='Applied'):
+        job = JobApplication.objects.create(user=user, company=company, position='Dev', status=status)
+        # .update() skips auto_now, so the row looks idle
+        JobApplication.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(days=days_idle))
+        return job
+
+    def _ghosted(self):
+        return set(JobApplication.objects.filter(status='Ghosted').values_list('company', flat=True))
+
+    def test_moves_stale_applications_per_user_threshold(self):
+        before = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(ghosting.sweep(), 2)
+
+        self.assertEqual(self._ghosted(), {'Stale', 'Eager'})
+        self.stale.refresh_from_db()
+        self.assertGreaterEqual(self.stale.updated_at, before)
+        # One resync per affected user
+        self.assertEqual(
+            sorted(ChangeEvent.objects.values_list('user_id', 'kind')),
+            [(self.default_user.pk, 'resync'), (self.eager_user.pk, 'resync')],
+        )
+
+    def test_invalidates_shared_stats(self):
+        key = stats_key(self.default_user.pk, 'job_stats')
+        other_key = stats_key(self.opted_out.pk, 'job_stats')
+        with self.captureOnCommitCallbacks(execute=True):
+            ghosting.sweep()
+        self.assertNotEqual(stats_key(self.default_user.pk, 'job_stats'), key)
+        self.assertEqual(stats_key(self.opted_out.pk, 'job_stats'), other_key)
+
+    def test_small_chunks(self):
+        self.assertEqual(ghosting.sweep(chunk_size=1), 2)
+        self.assertEqual(self._ghosted(), {'Stale', 'Eager'})
+
+    @override_settings(GHOST_AFTER_DAYS=0)
+    def test_default_zero_only_sweeps_users_with_a_preference(self):
+        self.assertEqual(ghosting.sweep(), 1)
+        self.assertEqual(self._ghosted(), {'Eager'})
+
+    def test_command_dry_run(self):
+        out = io.StringIO()
+        call_command('sweep_ghosted', '--dry-run', stdout=out)
+        self.assertIn('2 applications would be marked Ghosted', out.getvalue())
+        self.assertEqual(self._ghosted(), set())
+
+        call_command('sweep_ghosted', stdout=out)
+        self.assertEqual(self._ghosted(), {'Stale', 'Eager'})
+
+    def test_scheduled_rounds_run_once_per_interval(self):
+        self.assertEqual(ghosting.run_scheduled(60), 2)
+        self.assertIsNone(ghosting.run_scheduled(60))
+
+    def test_long_sweep_is_not_overlapped(self):
+        """A sweep outlasting the interval holds the lock, renewing it, until it ends"""
+        def slow_sweep(renew):
+            cache.delete(ghosting.ROUND_KEY)  # The interval ran out meanwhile
+            self.assertIsNone(ghosting.run_scheduled(60))
+            self.assertTrue(renew())
+            return 0
+        with mock.patch.object(ghosting, 'sweep', side_effect=slow_sweep):
+            self.assertEqual(ghosting.run_scheduled(60), 0)
+        self.assertIsNone(cache.get(ghosting.LOCK_KEY))
+
+    def test_lost_lease_stops_the_sweep(self):
+        """Once the lease lapsed (and another process may hold the lock) the sweep stops"""
+        def sweep(renew):
+            cache.set(ghosting.LOCK_KEY, 'another process')
+            return 0 if renew() else 1
+        with mock.patch.object(ghosting, 'sweep', side_effect=sweep):
+            self.assertEqual(ghosting.run_scheduled(60), 1)
+        # Not ours to release
+        self.assertEqual(cache.get(ghosting.LOCK_KEY), 'another process')
+
+        self.assertEqual(ghosting.sweep(chunk_size=1, renew=lambda: False), 1)
+        self.assertEqual(self._ghosted(), {'Stale'})
+
+
+class PreferencesViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    @override_settings(GHOST_AFTER_DAYS=30)
+    def test_get_and_update(self):
+        response = self.client.get(reverse('preferences'))
+        self.assertEqual(response.json(), {'ghost_after_days': None, 'default_ghost_after_days': 30})
+
+        response = self.client.patch(reverse('preferences'), {'ghost_after_days': 14}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(UserPreferences.objects.get(user=self.user).ghost_after_days, 14)
+
+        response = self.client.patch(reverse('preferences'), {'ghost_after_days': -1}, format='json')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,133 @@
+"""
+Tests for Idempotency-Key handling on write endpoints
+"""
+from unittest import mock
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from datetime import date, timedelta
+from applications.idempotency import prune_idempotency_keys
+from applications.models import JobApplication, IdempotencyKey
+
+User = get_user_model()
+
+
+class IdempotencyTests(TestCase):
+    """Retried writes with the same key do not run twice"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        self.data = {
+            'company': 'Acme', 'position': 'Dev', 'status': 'Ghosted',
+            'applied_date': date.today().isoformat(),
+        }
+
+    def _create(self, key, data=None):
+        return self.client.post(
+            reverse('add_job_application'), data or self.data, format='json', HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    def test_retry_replays_response(self):
+        """A Ghosted duplicate (not covered by the unique constraint) is not created twice"""
+        first = self._create('key-1')
+        second = self._create('key-1')
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(JobApplication.objects.filter(user=self.user).count(), 1)
+
+    def test_different_keys_run_separately(self):
+        self._create('key-1')
+        self._create('key-2')
+        self.assertEqual(JobApplication.objects.filter(user=self.user).count(), 2)
+
+    def test_key_reused_for_different_request(self):
+        self._create('key-1')
+        response = self._create('key-1', {**self.data, 'company': 'Globex'})
+        self.assertEqual(response.status_code, 422)
+
+    def test_in_flight_key_conflicts(self):
+        """A repeat while the first request is still running gets 409"""
+        self._create('key-1')
+        IdempotencyKey.objects.filter(key='key-1').update(status_code=None, response_body=None)
+        self.assertEqual(self._create('key-1').status_code, 409)
+
+    def test_abandoned_claim_is_reclaimed(self):
+        """A key left pending by a request that died is taken over once its lease runs out"""
+        self._create('key-1')
+        IdempotencyKey.objects.filter(key='key-1').update(
+            status_code=None, response_body=None, created_at=timezone.now() - timedelta(minutes=10),
+        )
+        response = self._create('key-1')
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(IdempotencyKey.objects.get(key='key-1').status_code, 201)
+
+    def test_killed_request_releases_key(self):
+        """A worker timeout (SystemExit) does not leave the key pending"""
+        with mock.patch('applications.views.events.publish_application', side_effect=SystemExit):
+            with self.assertRaises(SystemExit):
+                self._create('key-1')
+        self.assertFalse(IdempotencyKey.objects.exists())
+        self.assertEqual(self._create('key-1').status_code, 201)
+
+    def test_replay_keeps_view_headers(self):
+        first = self.client.post(
+            reverse('add_job_application'), self.data, format='json',
+            HTTP_IDEMPOTENCY_KEY='key-1', HTTP_PREFER='return=representation',
+        )
+        replay = self.client.post(
+            reverse('add_job_application'), self.data, format='json',
+            HTTP_IDEMPOTENCY_KEY='key-1', HTTP_PREFER='return=representation',
+        )
+        self.assertEqual(replay['Idempotent-Replayed'], 'true')
+        self.assertEqual(replay['Preference-Applied'], first['Preference-Applied'])
+        self.assertEqual(replay['Content-Type'], 'application/json')
+
+    def test_client_errors_are_replayed(self):
+        """4xx responses are stored like successes"""
+        bad = {'company': 'Acme'}
+        self.assertEqual(self._create('key-1', bad).status_code, 400)
+        replay = self._create('key-1', bad)
+        self.assertEqual(replay.status_code, 400)
+        self.assertEqual(replay['Idempotent-Replayed'], 'true')
+
+    def test_expired_key_runs_again(self):
+        self._create('key-1')
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=2))
+        response = self._create('key-1')
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(JobApplication.objects.filter(user=self.user).count(), 2)
+
+    def test_keys_are_scoped_per_user(self):
+        self._create('key-1')
+        other = User.objects.create_user(username='otheruser', password='testpass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(other).access_token}')
+        response = self._create('key-1')
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(JobApplication.objects.filter(user=other).count(), 1)
+
+    def test_update_and_delete_are_idempotent(self):
+        job = JobApplication.objects.create(user=self.user, company='Acme', position='Dev')
+        url = reverse('delete_job_application', args=[job.pk])
+        self.assertEqual(self.client.delete(url, HTTP_IDEMPOTENCY_KEY='del-1').status_code, 204)
+        # Without the key the retry would be a 404
+        self.assertEqual(self.client.delete(url, HTTP_IDEMPOTENCY_KEY='del-1').status_code, 204)
+
+    def test_requests_without_key_are_untouched(self):
+        self.client.post(reverse('add_job_application'), self.data, format='json')
+        self.assertEqual(IdempotencyKey.objects.count(), 0)
+
+    def test_prune_expired_keys(self):
+        self._create('key-1')
+        self._create('key-2')
+        IdempotencyKey.objects.filter(key='key-1').update(created_at=timezone.now() - timedelta(days=2))
+        self.assertEqual(prune_idempotency_keys(ttl_hours=24), 1)
+        self.assertEqual(list(IdempotencyKey.objects.values_list('key', flat=True)), ['key-2'])
@@ -0,0 +1,112 @@
+"""
+Tests for the integrity checks run by verify_user_isolation
+"""
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import date, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from applications import quotas
+from applications.integrity import run_check
+from applications.models import ArchivedApplication, Interview, JobApplication
+
+User = get_user_model()
+
+
+class VerifyUserIsolationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.user = User.objects.create_user(username='alice', password='testpass123')
+        self.other = User.objects.create_user(username='bob', password='testpass123')
+        self.job = JobApplication.objects.create(
+            user=self.user, company='Acme', position='Dev', applied_date=date.today() - timedelta(days=3),
+        )
+        JobApplication.objects.create(user=self.other, company='Acme', position='Dev')
+        JobApplication.objects.create(user=self.other, company='Acme', position='QA')
+        Interview.objects.create(job_application=self.job, date=date.today(), time=time(10, 0), type='HR')
+
+    def _run(self, *args):
+        out = io.StringIO()
+        call_command('verify_user_isolation', *args, stdout=out)
+        return out.getvalue()
+
+    def _check(self, name):
+        return run_check(name, None if name in ('orphan_resume_files', 'quota_counter_drift') else 'default')
+
+    def test_clean_data(self):
+        out = self._run()
+        self.assertIn('  alice: 1 applications', out)
+        self.assertIn('  bob: 2 applications', out)
+        self.assertIn('Total interviews: 1', out)
+        self.assertIn('[OK] User isolation verification complete!', out)
+
+    def test_interview_before_application(self):
+        early = Interview.objects.create(
+            job_application=self.job, date=date.today() - timedelta(days=10), time=time(9, 0), type='HR',
+        )
+        self.assertEqual(self._check('interviews_before_application')['samples'], [early.pk])
+
+    def test_duplicate_active_applications(self):
+        duplicate = JobApplication.objects.create(user=self.user, company='ACME', position='dev', status='Interviewing')
+        result = self._check('duplicate_active_applications')
+        self.assertEqual((result['count'], result['samples']), (1, [[self.job.pk, duplicate.pk]]))
+
+    def test_missing_owner_and_application(self):
+        # SQLite checks foreign keys at commit, which TestCase never reaches
+        orphan = JobApplication.objects.create(user_id=999999, company='Gone', position='Dev')
+        lost = Interview.objects.create(job_application_id=999999, date=date.today(), time=time(9, 0), type='HR')
+        # TestCase does check them before rolling back
+        self.addCleanup(lambda: (orphan.delete(), Interview.objects.filter(pk=lost.pk).delete()))
+        self.assertEqual(self._check('applications_without_user')['samples'], [orphan.pk])
+        self.assertEqual(self._check('interviews_without_application')['samples'], [lost.pk])
+        self.assertIn('  <missing user 999999>: 1 applications', self._run_failing())
+
+    def test_quota_counter_drift(self):
+        quotas.usage(self.user)
+        quotas.usage(self.other)
+        # A write that skipped quotas.record; other users have no counters
+        JobApplication.objects.create(user=self.other, company='Globex', position='Dev', resume_size=500)
+        self.assertEqual(self._check('quota_counter_drift')['samples'], [self.other.pk])
+
+        quotas.forget(self.other.pk)
+        self.assertEqual(self._check('quota_counter_drift')['count'], 0)
+
+    def test_orphan_resume_files(self):
+        os.makedirs(f'{self.media_root}/resumes')
+        for name in ('kept.pdf', 'archived.pdf', 'stray.pdf'):
+            with open(f'{self.media_root}/resumes/{name}', 'wb') as f:
+                f.write(b'%PDF')
+        JobApplication.objects.filter(pk=self.job.pk).update(resume='resumes/kept.pdf')
+        ArchivedApplication.objects.create(
+            id=10**6, user=self.user, company='Old', position='Dev', applied_date=date.today(),
+            status='Ghosted', resume='resumes/archived.pdf', updated_at=self.job.updated_at,
+        )
+        self.assertEqual(self._check('orphan_resume_files')['samples'], ['resumes/stray.pdf'])
+
+    def _run_failing(self, *args):
+        out = io.StringIO()
+        with self.assertRaises(CommandError):
+            call_command('verify_user_isolation', *args, stdout=out)
+        return out.getvalue()
+
+    def test_json_lines(self):
+        JobApplication.objects.create(user=self.user, company='ACME', position='dev', status='Assessment')
+        lines = [json.loads(line) for line in self._run_failing('--json').splitlines()]
+        users = {line['username']: line['applications'] for line in lines if line['type'] == 'user'}
+        self.assertEqual(users, {'alice': 2, 'bob': 2})
+        checks = {line['check']: line['count'] for line in lines if line['type'] == 'check'}
+        self.assertEqual(checks['duplicate_active_applications'], 1)
+        self.assertEqual(checks['interviews_before_application'], 0)
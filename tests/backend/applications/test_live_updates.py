@@ -0,0 +1,156 @@
+"""
+Tests for the live-update event log and SSE stream
+"""
+from django.test import TestCase, TransactionTestCase, AsyncRequestFactory, override_settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from asgiref.sync import async_to_sync
+from datetime import date, timedelta
+from applications import events
+from applications.models import JobApplication, Interview, ChangeEvent
+import json
+
+User = get_user_model()
+
+
+def parse_frames(chunks):
+    """Split SSE output into (id, event, data) tuples, skipping comments and retry"""
+    frames = []
+    for block in ''.join(chunks).split('\n\n'):
+        fields = {}
+        for line in block.splitlines():
+            if line.startswith(':') or ': ' not in line:
+                continue
+            key, value = line.split(': ', 1)
+            fields[key] = value
+        if 'event' in fields:
+            event_id = int(fields['id']) if 'id' in fields else None
+            frames.append((event_id, fields['event'], json.loads(fields['data'])))
+    return frames
+
+
+class PublishTests(TestCase):
+    """Write paths append change events once they commit"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.other = User.objects.create_user(username='otheruser', password='testpass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def _kinds(self, user=None):
+        return list(ChangeEvent.objects.filter(user=user or self.user).values_list('kind', flat=True))
+
+    def test_create_publishes_application_and_interview(self):
+        """Creating an interviewing application emits both rows"""
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('add_job_application'), {
+                'company': 'Acme', 'position': 'Dev', 'status': 'Interviewing',
+                'applied_date': date.today().isoformat(),
+                'interview_date': (date.today() + timedelta(days=3)).isoformat(),
+            })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self._kinds(), [events.INTERVIEW_CREATED, events.APPLICATION_CREATED])
+        payload = ChangeEvent.objects.get(kind=events.APPLICATION_CREATED).payload
+        self.assertEqual(payload['company'], 'Acme')
+        self.assertIsNotNone(payload['interview_date'])
+
+    def test_update_and_delete_publish(self):
+        """Updates carry the serialized row; deletes list cascaded interviews"""
+        job = JobApplication.objects.create(user=self.user, company='Acme', position='Dev')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('update_job_application', args=[job.pk]), {
+                'status': 'Interviewing', 'interview_date': date.today().isoformat(),
+            }, format='json')
+        interview = Interview.objects.get(job_application=job)
+        self.assertEqual(self._kinds(), [events.INTERVIEW_CREATED, events.APPLICATION_UPDATED])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(reverse('delete_job_application', args=[job.pk]))
+        deleted = ChangeEvent.objects.filter(kind__endswith='.deleted').order_by('id')
+        self.assertEqual(
+            [(e.kind, e.payload['id']) for e in deleted],
+            [(events.INTERVIEW_DELETED, interview.pk), (events.APPLICATION_DELETED, job.pk)],
+        )
+        self.assertEqual(self._kinds(self.other), [])
+
+    def test_failed_write_publishes_nothing(self):
+        """Validation errors do not emit events"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('add_job_application'), {'company': 'Acme'})
+        self.assertEqual(ChangeEvent.objects.count(), 0)
+
+    def test_prune_events(self):
+        """Events older than the retention window are deleted"""
+        old = ChangeEvent.objects.create(user=self.user, kind='x', payload={})
+        ChangeEvent.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(hours=2))
+        ChangeEvent.objects.create(user=self.user, kind='y', payload={})
+        self.assertEqual(events.prune_events(retention=3600), 1)
+        self.assertEqual(self._kinds(), ['y'])
+
+
+@override_settings(LIVE_UPDATES_POLL_INTERVAL=0.05, LIVE_UPDATES_MAX_STREAM=0.3, LIVE_UPDATES_HEARTBEAT=60)
+class EventStreamTests(TransactionTestCase):
+    """The SSE endpoint streams the user's events"""
+
+    # The stream queries on its own connections, so the data must be committed
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.other = User.objects.create_user(username='otheruser', password='testpass123')
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+        self.factory = AsyncRequestFactory()
+        JobApplication.objects.create(user=self.user, company='Acme', position='Dev')
+
+    def _stream(self, last_event_id=None, token=None):
+        headers = {'Authorization': f'Bearer {token or self.token}'}
+        if last_event_id is not None:
+            headers['Last-Event-ID'] = str(last_event_id)
+        request = self.factory.get('/api/events/', headers=headers)
+
+        async def consume():
+            response = await events.event_stream(request)
+            if not response.streaming:
+                return response, []
+            return response, [chunk.decode() async for chunk in response.streaming_content]
+
+        return async_to_sync(consume)()
+
+    def test_fresh_stream_starts_with_resync(self):
+        """Without Last-Event-ID the client is told to load everything"""
+        seen = ChangeEvent.objects.create(user=self.user, kind=events.APPLICATION_CREATED, payload={'id': 1})
+        response, chunks = self._stream()
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(parse_frames(chunks), [(seen.pk, events.RESYNC, {})])
+
+    def test_resumes_after_last_event_id(self):
+        """Events after Last-Event-ID are replayed, followed by fresh stats"""
+        first = ChangeEvent.objects.create(user=self.user, kind=events.APPLICATION_CREATED, payload={'id': 1})
+        ChangeEvent.objects.create(user=self.other, kind=events.APPLICATION_CREATED, payload={'id': 99})
+        second = ChangeEvent.objects.create(user=self.user, kind=events.APPLICATION_UPDATED, payload={'id': 1})
+
+        frames = parse_frames(self._stream(last_event_id=first.pk)[1])
+        self.assertEqual(frames[0], (second.pk, events.APPLICATION_UPDATED, {'id': 1}))
+        self.assertEqual(frames[1][1], events.STATS)
+        self.assertEqual(frames[1][2]['jobs']['total'], 1)
+        self.assertEqual(frames[1][2]['interviews']['total'], 0)
+        self.assertEqual(len(frames), 2)
+
+    def test_unknown_last_event_id_resyncs(self):
+        """A pruned or foreign Last-Event-ID triggers a resync"""
+        foreign = ChangeEvent.objects.create(user=self.other, kind=events.APPLICATION_CREATED, payload={'id': 99})
+        frames = parse_frames(self._stream(last_event_id=foreign.pk)[1])
+        self.assertEqual([f[1] for f in frames], [events.RESYNC])
+
+    def test_requires_authentication(self):
+        """Invalid tokens are rejected before the stream opens"""
+        response, _ = self._stream(token='not-a-token')
+        self.assertEqual(response.status_code, 401)
+
+    def test_unavailable_under_wsgi(self):
+        """The WSGI test client gets 503 instead of a held connection"""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.assertEqual(client.get(reverse('event_stream')).status_code, 503)
@@ -0,0 +1,75 @@
+"""
+Tests for the asyncio load generator
+"""
+from django.core.servers.basehttp import WSGIServer
+from django.test import LiveServerTestCase, SimpleTestCase
+from django.test.testcases import LiveServerThread, QuietWSGIRequestHandler
+from applications.loadtest import build_config, encode_multipart, parse_mix, run_load
+from applications.models import JobApplication
+import asyncio
+
+
+class LoadTestHelperTests(SimpleTestCase):
+    """Test mix parsing and multipart encoding"""
+
+    def test_parse_mix(self):
+        """Weighted mix strings parse into actions and weights"""
+        self.assertEqual(parse_mix('dashboard=3,login=1'), (['dashboard', 'login'], [3.0, 1.0]))
+
+    def test_parse_mix_rejects_unknown_action(self):
+        """Unknown actions are rejected"""
+        with self.assertRaises(ValueError):
+            parse_mix('delete_everything=1')
+
+    def test_encode_multipart(self):
+        """Fields and files are encoded with the declared boundary"""
+        body, content_type = encode_multipart(
+            {'company': 'Acme'}, {'resume': ('cv.pdf', b'%PDF-1.4', 'application/pdf')}
+        )
+        boundary = content_type.split('boundary=')[1]
+        self.assertTrue(content_type.startswith('multipart/form-data'))
+        self.assertIn(b'name="company"\r\n\r\nAcme', body)
+        self.assertIn(b'filename="cv.pdf"', body)
+        self.assertTrue(body.endswith(f'--{boundary}--\r\n'.encode()))
+
+
+class SerialLiveServerThread(LiveServerThread):
+    """Serve one request at a time
+
+    The live server shares the test's in-memory database connection with every
+    request thread, so concurrent transactions would interleave on it.
+    """
+
+    def _create_server(self, connections_override=None):
+        return WSGIServer((self.host, self.port), QuietWSGIRequestHandler, allow_reuse_address=False)
+
+
+class LoadTestRunTests(LiveServerTestCase):
+    """Run a tiny load test against a live server"""
+
+    server_thread_class = SerialLiveServerThread
+
+    def tearDown(self):
+        # Uploaded resumes live on disk, outside the test database
+        for job in JobApplication.objects.exclude(resume=''):
+            job.resume.delete(save=False)
+        super().tearDown()
+
+    def test_run_load_reports_per_endpoint(self):
+        """Virtual users register, run the mix and produce a per-endpoint report"""
+        config = build_config(
+            base_url=self.live_server_url,
+            users=2,
+            user_pool=2,
+            # Long enough to get past registration/login (password hashing)
+            duration=3,
+            mix=parse_mix('dashboard=2,create=1,update=1,upload=1'),
+            upload_kb=4,
+            timeout=30,
+        )
+        report = asyncio.run(run_load(config))
+
+        self.assertGreater(report['requests'], 0)
+        self.assertEqual(report['endpoints']['setup_register']['errors'], 0)
+        self.assertEqual(report['endpoints']['job_stats']['errors'], 0)
+        self.assertIn('p95_ms', report['endpoints']['recent_applications'])
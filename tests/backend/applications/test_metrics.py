@@ -0,0 +1,86 @@
+"""
+Tests for the per-route metrics middleware and the /metrics endpoint
+"""
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from prometheus_client import REGISTRY
+from applications.models import JobApplication
+
+User = get_user_model()
+
+
+class MetricsTests(TestCase):
+    """Test cases for request metrics collection and exposition"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+        JobApplication.objects.create(user=self.user, company="Company A", position="Developer")
+
+    def _sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_request_is_counted_by_route(self):
+        """Requests are counted under the URL pattern with method and status"""
+        labels = {'route': '/api/job-stats/', 'method': 'GET', 'status': '200'}
+        before = self._sample('job_journey_http_requests_total', **labels)
+
+        response = self.client.get(reverse('job_stats'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._sample('job_journey_http_requests_total', **labels), before + 1)
+
+    def test_parametrised_routes_share_one_series(self):
+        """Detail routes are labelled by pattern, not by primary key"""
+        labels = {'route': '/api/applications/<int:pk>/', 'method': 'GET', 'status': '404'}
+        before = self._sample('job_journey_http_requests_total', **labels)
+
+        self.client.get(reverse('get_job_application', args=[9998]))
+        self.client.get(reverse('get_job_application', args=[9999]))
+
+        self.assertEqual(self._sample('job_journey_http_requests_total', **labels), before + 2)
+
+    def test_db_queries_are_observed(self):
+        """DB query count histogram receives the per-request query count"""
+        labels = {'route': '/api/recent-applications/', 'method': 'GET'}
+        before = self._sample('job_journey_http_request_db_queries_sum', **labels)
+
+        self.client.get(reverse('recent_applications'))
+
+        self.assertGreater(self._sample('job_journey_http_request_db_queries_sum', **labels), before)
+
+    @override_settings(DEBUG=True)
+    def test_metrics_endpoint_exposition(self):
+        """/metrics returns Prometheus text format"""
+        self.client.get(reverse('job_stats'))
+        response = self.client.get(reverse('metrics'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn(b'job_journey_http_requests_total', response.content)
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_metrics_endpoint_requires_token_when_configured(self):
+        """/metrics rejects scrapers without the configured bearer token"""
+        client = APIClient()
+        self.assertEqual(client.get(reverse('metrics')).status_code, status.HTTP_403_FORBIDDEN)
+
+        client.credentials(HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(client.get(reverse('metrics')).status_code, status.HTTP_200_OK)
+
+    @override_settings(METRICS_TOKEN='', DEBUG=False)
+    def test_metrics_endpoint_closed_without_token_in_production(self):
+        """Without a token, /metrics is only served in development"""
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, status.HTTP_403_FORBIDDEN)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.client.get(reverse('metrics')).status_code, status.HTTP_200_OK)
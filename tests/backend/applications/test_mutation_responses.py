@@ -0,0 +1,76 @@
+"""
+Tests for "Prefer: return=representation" on mutation endpoints
+"""
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from datetime import date, time, timedelta
+from applications.models import JobApplication, Interview
+
+User = get_user_model()
+
+PREFER = {'HTTP_PREFER': 'return=representation'}
+
+
+class MutationRepresentationTests(TestCase):
+    """Mutations return the touched rows and fresh stats when asked"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        self.job = JobApplication.objects.create(user=self.user, company='Acme', position='Dev')
+
+    def test_create_returns_row_interview_and_stats(self):
+        tomorrow = (date.today() + timedelta(days=1)).isoformat()
+        response = self.client.post(reverse('add_job_application'), {
+            'company': 'Globex', 'position': 'SRE', 'status': 'Interviewing',
+            'applied_date': date.today().isoformat(), 'interview_date': tomorrow,
+        }, format='json', **PREFER)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['Preference-Applied'], 'return=representation')
+        data = response.json()
+        self.assertEqual(data['application']['company'], 'Globex')
+        self.assertEqual(data['application']['interview_date'], tomorrow)
+        self.assertEqual(data['interview']['time'], '10:00:00')
+        self.assertEqual(data['stats']['jobs']['total'], 2)
+        self.assertEqual(data['stats']['jobs']['interviewing'], 1)
+        self.assertEqual(data['stats']['interviews']['upcoming'], 1)
+
+    def test_update_returns_row_and_interview(self):
+        response = self.client.patch(reverse('update_job_application', args=[self.job.pk]), {
+            'status': 'Interviewing', 'interview_date': date.today().isoformat(), 'interview_time': '09:30',
+        }, format='json', **PREFER)
+        data = response.json()
+        self.assertEqual(data['application']['status'], 'Interviewing')
+        self.assertEqual(data['interview']['time'], '09:30:00')
+        self.assertEqual(data['interview']['job_application_id'], self.job.pk)
+        self.assertEqual(data['stats']['jobs']['applied'], 0)
+
+    def test_delete_returns_deleted_ids_and_stats(self):
+        interview = Interview.objects.create(job_application=self.job, date=date.today(), time=time(10, 0), type='HR')
+        response = self.client.delete(reverse('delete_job_application', args=[self.job.pk]), **PREFER)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['deleted'], {'application': self.job.pk, 'interviews': [interview.pk]})
+        self.assertIsNone(data['application'])
+        self.assertEqual(data['stats']['jobs']['total'], 0)
+
+    def test_default_responses_unchanged(self):
+        """Without the preference the original response bodies are kept"""
+        response = self.client.patch(reverse('update_job_application', args=[self.job.pk]), {'notes': 'x'}, format='json')
+        self.assertEqual(response.json()['notes'], 'x')
+        self.assertNotIn('Preference-Applied', response)
+        response = self.client.delete(reverse('delete_job_application', args=[self.job.pk]))
+        self.assertEqual(response.status_code, 204)
+
+    def test_failed_create_rolls_back(self):
+        """An invalid interview rolls back the application created with it"""
+        response = self.client.post(reverse('add_job_application'), {
+            'company': 'Globex', 'position': 'SRE', 'status': 'Interviewing',
+            'applied_date': date.today().isoformat(), 'interview_date': 'not-a-date',
+        }, format='json', **PREFER)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(JobApplication.objects.filter(company='Globex').exists())
@@ -0,0 +1,123 @@
+"""
+Tests for per-request query budget instrumentation and enforcement
+"""
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from datetime import date, time, timedelta
+from applications.models import JobApplication, Interview
+from applications.query_budget import (
+    max_queries,
+    QueryBudgetExceeded,
+    QUERY_COUNT_HEADER,
+    QUERY_DURATION_HEADER,
+)
+
+User = get_user_model()
+
+# Realistic per-user data size for budget assertions
+APPLICATION_COUNT = 200
+INTERVIEW_EVERY = 4
+
+
+class QueryBudgetTests(TestCase):
+    """Query budgets per endpoint at realistic data sizes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        JobApplication.objects.bulk_create([
+            JobApplication(
+                user=cls.user,
+                company=f"Company {i}",
+                position="Developer",
+                status="Interviewing" if i % INTERVIEW_EVERY == 0 else "Applied",
+                applied_date=date.today() - timedelta(days=i % 90),
+            )
+            for i in range(APPLICATION_COUNT)
+        ])
+        Interview.objects.bulk_create([
+            Interview(
+                job_application=job,
+                date=date.today() + timedelta(days=1),
+                time=time(10, 0),
+                type="Technical",
+            )
+            for job in JobApplication.objects.filter(user=cls.user, status="Interviewing")
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def test_recent_applications_budget(self):
+        """Listing applications does not issue a query per row"""
+        with max_queries(3):
+            response = self.client.get(reverse('recent_applications'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()), APPLICATION_COUNT)
+
+    def test_upcoming_interviews_budget(self):
+        """Upcoming interviews load their application in the same query"""
+        with max_queries(2):
+            response = self.client.get(reverse('upcoming_interviews'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_stats_budget(self):
+        """Stats endpoints run a fixed number of queries"""
+        with max_queries(3):
+            self.client.get(reverse('job_stats'))
+        with max_queries(4):
+            self.client.get(reverse('interview_stats'))
+
+    def test_get_job_application_budget(self):
+        """Detail view loads the application and its interviews only"""
+        job = JobApplication.objects.filter(user=self.user, status="Interviewing").first()
+        with max_queries(3):
+            response = self.client.get(reverse('get_job_application', args=[job.id]))
+        self.assertIsNotNone(response.json()['interview_date'])
+
+    def test_max_queries_raises_when_exceeded(self):
+        """max_queries fails the block when the budget is exceeded"""
+        with self.assertRaises(QueryBudgetExceeded):
+            with max_queries(1):
+                list(JobApplication.objects.all())
+                list(Interview.objects.all())
+
+    def test_max_queries_as_decorator(self):
+        """max_queries can decorate a function"""
+        @max_queries(1)
+        def two_queries():
+            JobApplication.objects.count()
+            Interview.objects.count()
+
+        with self.assertRaises(QueryBudgetExceeded):
+            two_queries()
+
+    @override_settings(QUERY_BUDGET_HEADERS=True)
+    def test_debug_headers(self):
+        """Query count and duration are attached when headers are enabled"""
+        response = self.client.get(reverse('job_stats'))
+        self.assertGreater(int(response[QUERY_COUNT_HEADER]), 0)
+        self.assertIn(QUERY_DURATION_HEADER, response)
+
+    @override_settings(QUERY_BUDGET_HEADERS=False)
+    def test_no_headers_when_disabled(self):
+        """Query headers are omitted outside debug mode"""
+        response = self.client.get(reverse('job_stats'))
+        self.assertNotIn(QUERY_COUNT_HEADER, response)
+
+    @override_settings(QUERY_BUDGET=0)
+    def test_over_budget_request_is_logged(self):
+        """Requests over the configured budget are logged as warnings"""
+        with self.assertLogs('applications', level='WARNING') as logs:
+            self.client.get(reverse('job_stats'))
+        self.assertTrue(any('[QUERY BUDGET]' in line for line in logs.output))
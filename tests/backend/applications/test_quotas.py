@@ -0,0 +1,146 @@
+"""
+Tests for per-user quotas on applications, resume bytes and write rate
+"""
+import shutil
+import tempfile
+import time
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from applications import quotas
+
+User = get_user_model()
+
+PDF = b'%PDF-1.4\n' + b'0' * 1991  # 2000 bytes
+
+
+@override_settings(QUOTA_MAX_APPLICATIONS=2, QUOTA_MAX_RESUME_BYTES=3000, QUOTA_WRITES_PER_MINUTE=0)
+class QuotaTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def _add(self, company, resume=None, **headers):
+        data = {'company': company, 'position': 'Dev', 'applied_date': date.today().isoformat()}
+        if resume:
+            data['resume'] = SimpleUploadedFile('cv.pdf', resume, content_type='application/pdf')
+        # Counters move when the write commits
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse('add_job_application'), data, **headers)
+
+    def test_application_limit(self):
+        self.assertEqual(self._add('A').status_code, 201)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self._add('B').status_code, 201)
+        # The seeded counter answers; no recount per write
+        self.assertFalse([q for q in queries if 'COUNT(' in q['sql']])
+
+        response = self._add('C')
+        self.assertEqual(response.status_code, 403)
+        self.assertIn('Application limit reached (2)', response.json()['error'])
+
+        job_id = self.client.get(reverse('recent_applications')).json()[0]['id']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(reverse('delete_job_application', args=[job_id]))
+        self.assertEqual(self._add('C').status_code, 201)
+        self.assertEqual(quotas.usage(self.user)['applications'], 2)
+
+    def test_resume_bytes_limit(self):
+        self.assertEqual(self._add('A', PDF).status_code, 201)
+        response = self._add('B', PDF)
+        self.assertEqual(response.status_code, 403)
+        self.assertIn('Resume storage limit reached', response.json()['error'])
+        self.assertEqual(quotas.usage(self.user), {'applications': 1, 'resume_bytes': 2000})
+
+        # Replacing with a smaller resume frees the difference
+        job_id = self.client.get(reverse('recent_applications')).json()[0]['id']
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(reverse('update_job_application', args=[job_id]), {
+                'resume': SimpleUploadedFile('cv.pdf', PDF[:500], content_type='application/pdf'),
+            })
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(quotas.usage(self.user)['resume_bytes'], 500)
+        self.assertEqual(self._add('B', PDF).status_code, 201)
+
+    def test_missing_counters_are_recounted(self):
+        self._add('A', PDF)
+        quotas.forget(self.user.pk)
+        self.assertEqual(quotas.usage(self.user), {'applications': 1, 'resume_bytes': 2000})
+
+    @override_settings(QUOTA_WRITES_PER_MINUTE=2, QUOTA_MAX_APPLICATIONS=0)
+    def test_write_rate(self):
+        self.assertEqual(self._add('A').status_code, 201)
+        self.assertEqual(self._add('B').status_code, 201)
+        response = self._add('C')
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(1 <= int(response['Retry-After']) <= 60)
+
+    @override_settings(QUOTA_WRITES_PER_MINUTE=1, QUOTA_MAX_APPLICATIONS=0)
+    def test_rate_rejection_does_not_spend_idempotency_key(self):
+        self.assertEqual(self._add('A', HTTP_IDEMPOTENCY_KEY='k1').status_code, 201)
+        self.assertEqual(self._add('B', HTTP_IDEMPOTENCY_KEY='k2').status_code, 429)
+
+        with mock.patch('applications.quotas.time') as clock:
+            clock.time.return_value = time.time() + 60
+            response = self._add('B', HTTP_IDEMPOTENCY_KEY='k2')
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', response)
+
+    def test_limit_rejection_does_not_spend_idempotency_key(self):
+        self._add('A')
+        self._add('B')
+        self.assertEqual(self._add('C', HTTP_IDEMPOTENCY_KEY='k1').status_code, 403)
+
+        job_id = self.client.get(reverse('recent_applications')).json()[0]['id']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(reverse('delete_job_application', args=[job_id]))
+        response = self._add('C', HTTP_IDEMPOTENCY_KEY='k1')
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', response)
+
+    def test_concurrent_writes_cannot_pass_together(self):
+        self.assertEqual(self._add('A').status_code, 201)
+        # Two writes in flight: the first holds the last slot until it finishes
+        with quotas.reserve(self.user, applications=1) as first:
+            self.assertIsNone(first)
+            with quotas.reserve(self.user, applications=1) as second:
+                self.assertEqual(second.status_code, 403)
+        self.assertEqual(quotas.usage(self.user)['applications'], 2)
+
+    def test_failed_write_gives_its_reservation_back(self):
+        with self.assertRaises(RuntimeError):
+            with quotas.reserve(self.user, applications=1, resume_bytes=2000):
+                raise RuntimeError
+        self.assertEqual(quotas.usage(self.user), {'applications': 0, 'resume_bytes': 0})
+
+    @override_settings(QUOTA_WRITES_PER_MINUTE=1, QUOTA_MAX_APPLICATIONS=0)
+    def test_rejected_writes_do_not_count_against_the_rate(self):
+        response = self.client.post(reverse('add_job_application'), {'company': 'A'})
+        self.assertEqual(response.status_code, 400)
+        response = self._add('A', b'MZ\x90\x00' + b'\0' * 100)
+        self.assertEqual(response.status_code, 415)
+        # Fails in the database, after the quota check
+        response = self.client.post(reverse('add_job_application'), {
+            'company': 'A', 'position': 'Dev', 'applied_date': 'not-a-date',
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self._add('A').status_code, 201)
+        self.assertEqual(self._add('B').status_code, 429)
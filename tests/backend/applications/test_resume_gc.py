@@ -0,0 +1,76 @@
+"""
+Tests for the orphaned resume garbage collector
+"""
+import io
+import os
+import random
+import shutil
+import tempfile
+import time
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from applications.models import ArchivedApplication, JobApplication
+from applications.resume_gc import external_sort, orphans
+
+User = get_user_model()
+
+
+class SortedMergeTests(SimpleTestCase):
+    def test_external_sort_spills_runs(self):
+        names = [f'resumes/{random.randrange(10**6):06d}.pdf' for _ in range(1000)]
+        self.assertEqual(list(external_sort(iter(names), run_size=64)), sorted(names))
+        self.assertEqual(list(external_sort(iter(names), run_size=10**4)), sorted(names))
+
+    def test_orphans(self):
+        stored = ['a', 'b', 'c', 'd', 'f']
+        referenced = ['b', 'b', 'd', 'e', 'z']
+        self.assertEqual(list(orphans(stored, referenced)), ['a', 'c', 'f'])
+
+
+class GcResumesCommandTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        JobApplication.objects.create(user=user, company='Acme', position='Dev', resume='resumes/hot.pdf')
+        ArchivedApplication.objects.create(
+            id=10**6, user=user, company='Old', position='Dev', applied_date=date.today(),
+            status='Ghosted', resume='resumes/1/ab/archived.pdf', updated_at='2024-01-01T00:00:00Z',
+        )
+        old = time.time() - 3 * 24 * 3600
+        for name in ('hot.pdf', '1/ab/archived.pdf', 'stale.pdf', '1/ab/replaced.pdf', 'fresh.pdf'):
+            path = os.path.join(self.media_root, 'resumes', name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(b'%PDF-1.4')
+            if name != 'fresh.pdf':
+                os.utime(path, (old, old))
+
+    def _remaining(self):
+        return sorted(
+            os.path.relpath(os.path.join(root, name), self.media_root)
+            for root, _, names in os.walk(self.media_root) for name in names
+        )
+
+    def test_deletes_old_unreferenced_files(self):
+        out = io.StringIO()
+        call_command('gc_resumes', '--dry-run', '--verbosity', '2', stdout=out)
+        self.assertIn('  resumes/1/ab/replaced.pdf\n  resumes/stale.pdf\n', out.getvalue())
+        self.assertIn('2 orphaned resume files', out.getvalue())
+        self.assertEqual(len(self._remaining()), 5)
+
+        call_command('gc_resumes', '--batch-size', '1', '--run-size', '2', stdout=out)
+        self.assertIn('[OK] Deleted 2 orphaned resume files', out.getvalue())
+        self.assertEqual(self._remaining(), ['resumes/1/ab/archived.pdf', 'resumes/fresh.pdf', 'resumes/hot.pdf'])
+
+    def test_grace_period(self):
+        call_command('gc_resumes', '--min-age-hours', '0', stdout=io.StringIO())
+        self.assertEqual(self._remaining(), ['resumes/1/ab/archived.pdf', 'resumes/hot.pdf'])
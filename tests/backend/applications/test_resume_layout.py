@@ -0,0 +1,152 @@
+"""
+Tests for the sharded resume layout and the command migrating old files into it
+"""
+import io
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from applications import sync
+from applications.resume_gc import find_orphans
+from applications.models import ArchivedApplication, JobApplication, resume_path
+
+User = get_user_model()
+
+
+class ResumePathTests(SimpleTestCase):
+    def test_layout(self):
+        path = resume_path(42, 'cv.pdf')
+        self.assertRegex(path, r'^resumes/[0-9a-f]{2}/[0-9a-f]{2}/42/cv\.pdf$')
+        self.assertEqual(resume_path(42, 'resumes/cv.pdf'), path)
+        self.assertNotEqual(resume_path(43, 'cv.pdf').split('/')[1:3], path.split('/')[1:3])
+
+
+class ResumeLayoutTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+
+    def _store(self, name, content=b'%PDF-1.4'):
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content)
+
+    def _read(self, name):
+        with open(os.path.join(self.media_root, name), 'rb') as f:
+            return f.read()
+
+    def test_uploads_use_the_layout(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        response = client.post(reverse('add_job_application'), {
+            'company': 'Acme', 'position': 'Dev', 'applied_date': date.today().isoformat(),
+            'resume': SimpleUploadedFile('cv.pdf', b'%PDF-1.4', content_type='application/pdf'),
+        })
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(JobApplication.objects.get().resume.name, resume_path(self.user.pk, 'cv.pdf'))
+
+    def test_migrates_flat_files(self):
+        jobs = []
+        for n in range(3):
+            self._store(f'resumes/cv{n}.pdf', f'resume {n}'.encode())
+            jobs.append(JobApplication.objects.create(
+                user=self.user, company=f'Co {n}', position='Dev', resume=f'resumes/cv{n}.pdf',
+            ))
+        self._store('resumes/old.pdf', b'archived')
+        ArchivedApplication.objects.create(
+            id=10**6, user=self.user, company='Old', position='Dev', applied_date=date.today(),
+            status='Ghosted', resume='resumes/old.pdf', updated_at='2024-01-01T00:00:00Z',
+        )
+        JobApplication.objects.create(user=self.user, company='Gone', position='Dev', resume='resumes/gone.pdf')
+
+        out = io.StringIO()
+        call_command('migrate_resume_layout', '--dry-run', stdout=out)
+        self.assertIn('4 resume files would move', out.getvalue())
+        self.assertIn('1 rows point at missing files', out.getvalue())
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, 'resumes/cv0.pdf')))
+
+        call_command('migrate_resume_layout', '--batch-size', '2', stdout=out)
+        self.assertIn('[OK] Moved 4 resume files', out.getvalue())
+        for n, job in enumerate(jobs):
+            job.refresh_from_db()
+            self.assertEqual(job.resume.name, resume_path(self.user.pk, f'cv{n}.pdf'))
+            self.assertEqual(self._read(job.resume.name), f'resume {n}'.encode())
+            self.assertFalse(os.path.exists(os.path.join(self.media_root, f'resumes/cv{n}.pdf')))
+        archived = ArchivedApplication.objects.get()
+        self.assertEqual(archived.resume.name, resume_path(self.user.pk, 'old.pdf'))
+        self.assertGreater(archived.updated_at.year, 2024)
+
+        # A second run finds nothing left to do
+        call_command('migrate_resume_layout', stdout=out)
+        self.assertIn('[OK] Moved 0 resume files', out.getvalue())
+
+    def test_moved_rows_reach_delta_sync(self):
+        self._store('resumes/cv.pdf')
+        job = JobApplication.objects.create(user=self.user, company='Acme', position='Dev', resume='resumes/cv.pdf')
+        JobApplication.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        token = sync.make_token(timezone.now() - timedelta(minutes=30))
+
+        call_command('migrate_resume_layout', stdout=io.StringIO())
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        data = client.get(reverse('sync'), {'since': token}).json()
+        self.assertEqual([a['id'] for a in data['applications']], [job.pk])
+        self.assertIn(resume_path(self.user.pk, 'cv.pdf'), data['applications'][0]['resume'])
+
+    def test_resumes_after_a_crash(self):
+        self._store('resumes/cv.pdf', b'mine')
+        job = JobApplication.objects.create(user=self.user, company='Acme', position='Dev', resume='resumes/cv.pdf')
+
+        with mock.patch('django.db.models.query.QuerySet.bulk_update', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                call_command('migrate_resume_layout', stdout=io.StringIO())
+        job.refresh_from_db()
+        self.assertEqual(job.resume.name, 'resumes/cv.pdf')
+        self.assertEqual(self._read('resumes/cv.pdf'), b'mine')
+
+        call_command('migrate_resume_layout', stdout=io.StringIO())
+        job.refresh_from_db()
+        # The link the crashed run made is reused, not duplicated
+        self.assertEqual(job.resume.name, resume_path(self.user.pk, 'cv.pdf'))
+        self.assertEqual(self._read(job.resume.name), b'mine')
+        self.assertEqual(os.listdir(os.path.dirname(os.path.join(self.media_root, job.resume.name))), ['cv.pdf'])
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, 'resumes/cv.pdf')))
+
+    def test_new_names_look_new_to_gc(self):
+        self._store('resumes/cv.pdf')
+        old = timezone.now().timestamp() - 2 * 24 * 3600
+        os.utime(os.path.join(self.media_root, 'resumes/cv.pdf'), (old, old))
+        JobApplication.objects.create(user=self.user, company='Acme', position='Dev', resume='resumes/cv.pdf')
+
+        # Linked, but the rows are not repointed yet
+        with mock.patch('django.db.models.query.QuerySet.bulk_update', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                call_command('migrate_resume_layout', stdout=io.StringIO())
+        self.assertEqual(list(find_orphans(min_age=3600)), [])
+        self.assertEqual(list(find_orphans()), [resume_path(self.user.pk, 'cv.pdf')])
+
+    def test_name_taken_by_another_file(self):
+        self._store('resumes/cv.pdf', b'mine')
+        self._store(resume_path(self.user.pk, 'cv.pdf'), b'theirs')
+        job = JobApplication.objects.create(user=self.user, company='Acme', position='Dev', resume='resumes/cv.pdf')
+        call_command('migrate_resume_layout', stdout=io.StringIO())
+        job.refresh_from_db()
+        self.assertNotEqual(job.resume.name, resume_path(self.user.pk, 'cv.pdf'))
+        self.assertEqual(self._read(job.resume.name), b'mine')
+        self.assertEqual(self._read(resume_path(self.user.pk, 'cv.pdf')), b'theirs')
@@ -0,0 +1,113 @@
+"""
+Tests for per-user sharding of applications and interviews across SQLite files
+"""
+import io
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from applications.models import Interview, JobApplication
+from applications.sharding import id_range, jump_hash, shard_for
+
+User = get_user_model()
+
+SHARDS = {'default', 'shard_0', 'shard_1'}
+
+
+class JumpHashTests(SimpleTestCase):
+    def test_buckets_are_in_range_and_stable(self):
+        for key in range(1000):
+            bucket = jump_hash(key, 5)
+            self.assertTrue(0 <= bucket < 5)
+            self.assertEqual(jump_hash(key, 5), bucket)
+
+    def test_growing_only_moves_keys_to_new_buckets(self):
+        for key in range(1000):
+            before, after = jump_hash(key, 3), jump_hash(key, 5)
+            self.assertTrue(after == before or after >= 3)
+
+    def test_sharding_off(self):
+        self.assertIsNone(shard_for(1))
+
+
+@override_settings(DB_SHARDS=2)
+class ShardRoutingTests(TestCase):
+    databases = SHARDS
+
+    def setUp(self):
+        # One user on each shard
+        self.users = {}
+        n = 0
+        while len(self.users) < 2:
+            user = User.objects.create_user(username=f'user{n}', password='testpass123')
+            self.users.setdefault(shard_for(user.pk), user)
+            n += 1
+
+    def _client(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        return client
+
+    def _add(self, user, **data):
+        response = self._client(user).post(reverse('add_job_application'), {
+            'company': 'Acme', 'position': 'Dev', 'applied_date': date.today().isoformat(), **data,
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+
+    def test_rows_are_written_to_the_users_shard(self):
+        tomorrow = (date.today() + timedelta(days=1)).isoformat()
+        for alias, user in self.users.items():
+            self._add(user, status='Interviewing', interview_date=tomorrow)
+            job = JobApplication.objects.using(alias).get(user=user)
+            start, end = id_range(alias)
+            self.assertTrue(start < job.pk < end)
+            self.assertEqual(Interview.objects.using(alias).filter(job_application=job).count(), 1)
+        self.assertFalse(JobApplication.objects.using('default').exists())
+
+    def test_views_read_from_the_users_shard(self):
+        for user in self.users.values():
+            self._add(user, company=f'Company of {user.username}')
+        for user in self.users.values():
+            client = self._client(user)
+            response = client.get(reverse('recent_applications'))
+            self.assertEqual([row['company'] for row in response.json()], [f'Company of {user.username}'])
+            self.assertEqual(client.get(reverse('job_stats')).json()['total'], 1)
+
+            job_id = response.json()[0]['id']
+            response = client.patch(reverse('update_job_application', args=[job_id]), {'notes': 'x'}, format='json')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(JobApplication.objects.for_user(user).get().notes, 'x')
+
+    def test_deleting_a_user_clears_their_shard(self):
+        alias, user = next(iter(self.users.items()))
+        self._add(user)
+        user.delete()
+        self.assertFalse(JobApplication.objects.using(alias).exists())
+
+
+class RebalanceTests(TestCase):
+    databases = SHARDS
+
+    def test_moves_rows_from_default_keeping_ids(self):
+        users = [User.objects.create_user(username=f'user{n}', password='testpass123') for n in range(6)]
+        ids = {}
+        for user in users:
+            job = JobApplication.objects.create(user=user, company='Acme', position='Dev')
+            Interview.objects.create(job_application=job, date=date.today(), time='10:00', type='HR')
+            ids[user.pk] = job.pk
+
+        with override_settings(DB_SHARDS=2):
+            out = io.StringIO()
+            call_command('rebalance_shards', stdout=out)
+            self.assertIn('Moved 6 users (6 applications, 6 interviews)', out.getvalue())
+            for user in users:
+                job = JobApplication.objects.for_user(user).get()
+                self.assertEqual(job.pk, ids[user.pk])
+                self.assertEqual(job.interviews.count(), 1)
+        self.assertFalse(JobApplication.objects.using('default').exists())
+        self.assertFalse(Interview.objects.using('default').exists())
@@ -0,0 +1,139 @@
+"""
+Tests for single-flight coalescing of stats computations
+"""
+import asyncio
+import threading
+import time
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from applications.coalesce import asingle_flight, invalidate_user, single_flight, stats_key
+
+User = get_user_model()
+
+
+class CountingCompute:
+    """A slow computation that records how often it ran"""
+
+    def __init__(self, value=None, delay=0.2):
+        self.calls = 0
+        self.value = value or {'total': 1}
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return self.value
+
+
+@override_settings(STATS_COALESCE_TTL=2, STATS_COALESCE_WAIT=5)
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _run_concurrently(self, fn, callers=5):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(fn())) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_callers_share_one_computation(self):
+        compute = CountingCompute()
+        results = self._run_concurrently(lambda: single_flight('k', compute))
+        self.assertEqual(compute.calls, 1)
+        self.assertEqual(results, [{'total': 1}] * 5)
+
+    def test_result_is_reused_within_ttl(self):
+        compute = CountingCompute(delay=0)
+        single_flight('k', compute)
+        single_flight('k', compute)
+        self.assertEqual(compute.calls, 1)
+
+    def test_invalidate_user_changes_key(self):
+        before, other = stats_key(7, 'job_stats'), stats_key(8, 'job_stats')
+        invalidate_user(7)
+        self.assertNotEqual(stats_key(7, 'job_stats'), before)
+        self.assertEqual(stats_key(8, 'job_stats'), other)
+
+    def test_waiters_compute_when_leader_fails(self):
+        calls = []
+
+        def failing():
+            calls.append('leader')
+            time.sleep(0.1)
+            raise RuntimeError('boom')
+
+        leader = threading.Thread(target=lambda: self.assertRaises(RuntimeError, single_flight, 'k', failing))
+        leader.start()
+        time.sleep(0.02)
+        self.assertEqual(single_flight('k', lambda: 'fallback'), 'fallback')
+        leader.join()
+        self.assertEqual(calls, ['leader'])
+
+    @override_settings(STATS_COALESCE_TTL=0)
+    def test_disabled(self):
+        compute = CountingCompute(delay=0)
+        single_flight('k', compute)
+        single_flight('k', compute)
+        self.assertEqual(compute.calls, 2)
+
+    def test_async_callers_share_one_computation(self):
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.2)
+            return {'upcoming': 3}
+
+        async def burst():
+            return await asyncio.gather(*(asingle_flight('k', compute) for _ in range(5)))
+
+        results = asyncio.run(burst())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'upcoming': 3}] * 5)
+
+
+@override_settings(STATS_COALESCE_TTL=60, STATS_COALESCE_WAIT=5)
+class CoalescedStatsViewTests(TransactionTestCase):
+    """Shared results never hide a committed write"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def _add(self, company):
+        return self.client.post(reverse('add_job_application'), {
+            'company': company, 'position': 'Dev', 'status': 'Applied',
+            'applied_date': date.today().isoformat(),
+        }, format='json')
+
+    def test_write_invalidates_shared_stats(self):
+        self.assertEqual(self.client.get(reverse('job_stats')).json()['total'], 0)
+        self.assertEqual(self._add('Acme').status_code, 201)
+        self.assertEqual(self.client.get(reverse('job_stats')).json()['total'], 1)
+
+    def test_repeat_request_reuses_result(self):
+        self.client.get(reverse('interview_stats'))
+        with self.assertNumQueries(1):  # the user lookup for authentication
+            response = self.client.get(reverse('interview_stats'))
+        self.assertEqual(response.json()['total'], 0)
+
+    def test_not_shared_inside_a_transaction(self):
+        self.client.get(reverse('job_stats'))
+        with transaction.atomic():
+            self._add('Acme')
+            self.assertEqual(self.client.get(reverse('job_stats')).json()['total'], 1)
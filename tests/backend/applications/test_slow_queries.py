@@ -0,0 +1,140 @@
+"""
+Tests for the slow-query log, its staff endpoint and dump command
+"""
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from applications.models import JobApplication
+from applications.slow_queries import full_scan_tables, get_slow_query_log, normalize_sql
+from io import StringIO
+import json
+import os
+import tempfile
+from unittest import skipUnless
+
+User = get_user_model()
+
+
+class SlowQueryHelperTests(TestCase):
+    """Test SQL normalization and plan inspection"""
+
+    def test_normalize_sql(self):
+        """Literals and placeholders collapse to '?' and IN lists to (...)"""
+        sql = "SELECT * FROM t WHERE a = %s AND b = 'x''y' AND c IN (%s, %s,  %s) LIMIT 21"
+        self.assertEqual(
+            normalize_sql(sql),
+            "SELECT * FROM t WHERE a = ? AND b = ? AND c IN (...) LIMIT ?"
+        )
+
+    def test_full_scan_tables(self):
+        """SCAN steps are reported, index searches are not"""
+        plan = [
+            (2, 0, 0, 'SCAN applications_interview'),
+            (3, 0, 0, 'SEARCH applications_jobapplication USING INTEGER PRIMARY KEY (rowid=?)'),
+        ]
+        self.assertEqual(full_scan_tables(plan), ['applications_interview'])
+
+    def test_full_scan_tables_older_sqlite(self):
+        """The "SCAN TABLE <table>" format of SQLite before 3.36 is understood too"""
+        plan = [
+            (2, 0, 0, 'SCAN TABLE applications_interview'),
+            (3, 0, 0, 'SCAN TABLE applications_jobapplication USING COVERING INDEX by_user'),
+            (4, 0, 0, 'SEARCH TABLE auth_user USING INTEGER PRIMARY KEY (rowid=?)'),
+        ]
+        self.assertEqual(full_scan_tables(plan), ['applications_interview', 'applications_jobapplication'])
+
+
+class SlowQueryLogTests(TestCase):
+    """Test recording, ring-buffer rotation and dumping"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.tmpdir.name, 'slow.sqlite3')
+        self.settings_override = override_settings(
+            SLOW_QUERY_LOG_PATH=self.log_path,
+            SLOW_QUERY_LOG_SIZE=3,
+        )
+        self.settings_override.enable()
+
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.staff = User.objects.create_user(
+            username='staff',
+            email='staff@example.com',
+            password='testpass123',
+            is_staff=True
+        )
+        JobApplication.objects.create(user=self.user, company="Company A", position="Developer")
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.tmpdir.cleanup()
+
+    def _authenticate(self, user):
+        refresh = RefreshToken.for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    @skipUnless(connection.vendor == 'sqlite', 'Query plans are only captured on SQLite')
+    def test_slow_query_recorded_with_view_and_plan(self):
+        """Queries over the threshold are logged with view and query plan"""
+        self._authenticate(self.user)
+        with override_settings(SLOW_QUERY_THRESHOLD_MS=0):
+            self.client.get(reverse('recent_applications'))
+
+        entries = get_slow_query_log().entries()
+        views = {entry['view'] for entry in entries}
+        self.assertIn('recent_applications', views)
+        selects = [entry for entry in entries if entry['sql'].startswith('SELECT')]
+        self.assertTrue(selects)
+        self.assertTrue(all(entry['plan'] for entry in selects))
+        self.assertNotIn('%s', selects[0]['sql'])
+
+    def test_ring_buffer_keeps_latest_entries(self):
+        """Only the most recent SLOW_QUERY_LOG_SIZE entries are kept"""
+        log = get_slow_query_log()
+        for i in range(5):
+            log.record(float(i), 'view', f'SELECT {i}', None)
+
+        entries = log.entries()
+        self.assertEqual([entry['seq'] for entry in entries], [5, 4, 3])
+
+    @skipUnless(connection.vendor == 'sqlite', 'Query plans are only captured on SQLite')
+    def test_full_scan_is_flagged(self):
+        """An unindexed filter is flagged as a full table scan"""
+        with override_settings(SLOW_QUERY_THRESHOLD_MS=0):
+            list(JobApplication.objects.filter(notes__contains='remote').order_by())
+
+        entries = get_slow_query_log().entries(limit=1)
+        self.assertTrue(entries[0]['full_scan'])
+
+    def test_staff_endpoint(self):
+        """Staff can dump and clear the log, regular users cannot"""
+        get_slow_query_log().record(250.0, 'job_stats', 'SELECT ?', None)
+        url = reverse('slow_queries')
+
+        self._authenticate(self.user)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self._authenticate(self.staff)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['entries'][0]['view'], 'job_stats')
+
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_200_OK)
+        self.assertEqual(get_slow_query_log().entries(), [])
+
+    def test_dump_command_json(self):
+        """dump_slow_queries prints entries as JSON"""
+        get_slow_query_log().record(300.0, 'interview_stats', 'SELECT ?', None)
+        out = StringIO()
+        call_command('dump_slow_queries', '--json', stdout=out)
+        self.assertEqual(json.loads(out.getvalue())[0]['view'], 'interview_stats')
@@ -0,0 +1,109 @@
+"""
+Tests for the SQLite-backed shared cache
+"""
+import os
+import tempfile
+import threading
+import time
+
+from django.test import SimpleTestCase
+
+from applications.sqlite_cache import SQLiteCache
+
+
+class SQLiteCacheTests(SimpleTestCase):
+    """The backend behaves like a Django cache and is shared through its file"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'cache.sqlite3')
+        self.cache = self._open()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _open(self, **options):
+        return SQLiteCache(self.path, {'OPTIONS': {'MAX_ENTRIES': 5, **options}})
+
+    def test_set_get_delete(self):
+        self.cache.set('a', {'total': 3})
+        self.assertEqual(self.cache.get('a'), {'total': 3})
+        self.assertTrue(self.cache.has_key('a'))
+        self.assertTrue(self.cache.delete('a'))
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.get('a', 'missing'), 'missing')
+        self.assertFalse(self.cache.delete('a'))
+
+    def test_ttl(self):
+        self.cache.set('a', 1, timeout=0.05)
+        self.cache.set('b', 1, timeout=None)
+        time.sleep(0.1)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.get('b'), 1)
+        self.assertTrue(self.cache.touch('b', timeout=0.05))
+        self.assertFalse(self.cache.touch('a'))
+
+    def test_add_only_sets_missing_or_expired_keys(self):
+        self.assertTrue(self.cache.add('a', 1))
+        self.assertFalse(self.cache.add('a', 2))
+        self.assertEqual(self.cache.get('a'), 1)
+        self.cache.set('b', 1, timeout=0.05)
+        time.sleep(0.1)
+        self.assertTrue(self.cache.add('b', 2))
+        self.assertEqual(self.cache.get('b'), 2)
+
+    def test_incr_decr(self):
+        self.cache.set('n', 1)
+        self.assertEqual(self.cache.incr('n'), 2)
+        self.assertEqual(self.cache.decr('n', 5), -3)
+        with self.assertRaises(ValueError):
+            self.cache.incr('missing')
+
+    def test_incr_is_atomic_across_connections(self):
+        self.cache.set('n', 0)
+
+        def bump():
+            other = self._open()
+            for _ in range(50):
+                other.incr('n')
+
+        threads = [threading.Thread(target=bump) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.cache.get('n'), 200)
+
+    def test_shared_between_instances(self):
+        """Two workers opening the same file see each other's writes"""
+        other = self._open()
+        self.cache.set('a', 'from worker 1')
+        self.assertEqual(other.get('a'), 'from worker 1')
+        other.delete('a')
+        self.assertIsNone(self.cache.get('a'))
+
+    def test_bulk_operations(self):
+        self.cache.set_many({'a': 1, 'b': 2, 'c': 3})
+        self.assertEqual(self.cache.get_many(['a', 'c', 'z']), {'a': 1, 'c': 3})
+        self.cache.delete_many(['a', 'b'])
+        self.assertEqual(self.cache.get_many(['a', 'b', 'c']), {'c': 3})
+        self.cache.clear()
+        self.assertEqual(self.cache.get_many(['c']), {})
+
+    def test_evicts_least_recently_read(self):
+        self.cache.access_resolution = 0
+        for key in 'abcde':
+            self.cache.set(key, key)
+            time.sleep(0.01)
+        self.cache.get('a')
+        self.cache.set('f', 'f')
+        self.assertEqual(set(self.cache.get_many('abcdef')), {'a', 'd', 'e', 'f'})
+        self.assertIsNone(self.cache.get('b'))
+
+    def test_expired_entries_are_evicted_first(self):
+        self.cache.set('old', 1, timeout=0.01)
+        for key in 'abcd':
+            self.cache.set(key, key)
+        time.sleep(0.05)
+        self.cache.set('e', 'e')
+        self.assertEqual(set(self.cache.get_many('abcde')), set('abcde'))
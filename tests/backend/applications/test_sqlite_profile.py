@@ -0,0 +1,60 @@
+"""
+Tests for the SQLite connection profile and the concurrent write benchmark
+"""
+import io
+import json
+import os
+import sqlite3
+import tempfile
+from contextlib import closing
+from unittest import skipUnless
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from applications.sqlite_profile import apply_pragmas
+from applications.write_benchmark import DEFAULT_PRAGMAS, write_throughput
+
+
+@skipUnless(connection.vendor == 'sqlite', 'SQLite connection profile')
+class ConnectionProfileTests(TestCase):
+    """New connections run with SQLITE_PRAGMAS"""
+
+    def _pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_django_connection_is_configured(self):
+        self.assertEqual(self._pragma('busy_timeout'), settings.SQLITE_PRAGMAS['busy_timeout'])
+        self.assertEqual(self._pragma('cache_size'), settings.SQLITE_PRAGMAS['cache_size'])
+        self.assertEqual(self._pragma('synchronous'), 1)  # NORMAL
+        self.assertEqual(self._pragma('temp_store'), 2)  # MEMORY
+
+    def test_file_database_switches_to_wal(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with closing(sqlite3.connect(os.path.join(tmpdir, 'db.sqlite3'))) as db:
+                apply_pragmas(db, settings.SQLITE_PRAGMAS)
+                self.assertEqual(db.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+                self.assertEqual(db.execute('PRAGMA mmap_size').fetchone()[0], settings.SQLITE_PRAGMAS['mmap_size'])
+
+
+class WriteBenchmarkTests(SimpleTestCase):
+    def test_write_throughput(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = write_throughput(
+                os.path.join(tmpdir, 'bench.sqlite3'), DEFAULT_PRAGMAS, persistent=False,
+                writers=2, readers=1, duration=0.3,
+            )
+        self.assertGreater(result['commits'], 0)
+        self.assertEqual(result['errors'], 0)
+        self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+
+    def test_command_reports_each_profile(self):
+        out = io.StringIO()
+        call_command('benchmark_sqlite_writes', '--duration', '0.2', '--writers', '2', '--readers', '1', '--json', stdout=out)
+        results = json.loads(out.getvalue())
+        self.assertEqual(set(results), {'default', 'pragmas', 'pragmas+persistent'})
+        self.assertEqual(results['default']['speedup'], 1.0)
@@ -0,0 +1,94 @@
+"""
+Tests for the delta sync endpoint
+"""
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from datetime import date, time, timedelta
+from applications import sync
+from applications.models import JobApplication, Interview, Tombstone
+
+User = get_user_model()
+
+
+class SyncTests(TestCase):
+    """GET /api/sync/ returns full snapshots and deltas"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.other = User.objects.create_user(username='otheruser', password='testpass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+        self.job = JobApplication.objects.create(user=self.user, company='Acme', position='Dev')
+        self.interview = Interview.objects.create(
+            job_application=self.job, date=date.today() + timedelta(days=1), time=time(10, 0), type='HR'
+        )
+        self.stale = JobApplication.objects.create(user=self.user, company='Old', position='Dev')
+        JobApplication.objects.create(user=self.other, company='Other', position='Dev')
+
+    def _sync(self, token=None):
+        params = {'since': token} if token else {}
+        return self.client.get(reverse('sync'), params)
+
+    def _age(self, *objs, by=timedelta(hours=1)):
+        """Backdate updated_at (auto_now cannot be set through save())"""
+        for obj in objs:
+            type(obj).objects.filter(pk=obj.pk).update(updated_at=timezone.now() - by)
+
+    def test_full_snapshot_without_token(self):
+        """No token returns every row the user owns"""
+        data = self._sync().json()
+        self.assertTrue(data['full'])
+        self.assertEqual({a['company'] for a in data['applications']}, {'Acme', 'Old'})
+        self.assertEqual([i['id'] for i in data['interviews']], [self.interview.pk])
+        self.assertEqual(data['deleted'], {'applications': [], 'interviews': []})
+        self.assertIn('updated_at', data['applications'][0])
+
+    def test_delta_returns_only_changes(self):
+        """Rows untouched since the token are left out"""
+        self._age(self.job, self.stale, self.interview)
+        token = sync.make_token(timezone.now() - timedelta(minutes=30))
+
+        self.client.patch(reverse('update_job_application', args=[self.job.pk]), {'notes': 'called'}, format='json')
+        data = self._sync(token).json()
+        self.assertFalse(data['full'])
+        self.assertEqual([a['id'] for a in data['applications']], [self.job.pk])
+        self.assertEqual(data['applications'][0]['notes'], 'called')
+        self.assertEqual(data['interviews'], [])
+
+    def test_deletions_are_reported(self):
+        """Deleting an application tombstones it and its interviews"""
+        token = self._sync().json()['token']
+        self.client.delete(reverse('delete_job_application', args=[self.job.pk]))
+
+        data = self._sync(token).json()
+        self.assertEqual(data['deleted'], {'applications': [self.job.pk], 'interviews': [self.interview.pk]})
+        self.assertNotIn(self.job.pk, [a['id'] for a in data['applications']])
+
+    def test_token_round_trip(self):
+        """The returned token is accepted and moves forward"""
+        first = self._sync().json()['token']
+        second = self._sync(first).json()['token']
+        self.assertGreaterEqual(int(second), int(first))
+        self.assertEqual(self._sync('not-a-token').status_code, 400)
+
+    @override_settings(SYNC_TOMBSTONE_RETENTION_DAYS=1)
+    def test_expired_token_gets_full_response(self):
+        """Tokens older than tombstone retention cannot be trusted for deletions"""
+        token = sync.make_token(timezone.now() - timedelta(days=2))
+        self.assertTrue(self._sync(token).json()['full'])
+
+    def test_prune_tombstones(self):
+        """Tombstones past retention are deleted"""
+        sync.record_deletions(self.user, [101, 102], [201])
+        Tombstone.objects.filter(object_id=101).update(deleted_at=timezone.now() - timedelta(days=60))
+        self.assertEqual(sync.prune_tombstones(retention_days=30), 1)
+        self.assertEqual(Tombstone.objects.count(), 2)
+
+    def test_requires_authentication(self):
+        self.client.credentials()
+        self.assertEqual(self._sync().status_code, 401)
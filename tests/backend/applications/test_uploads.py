@@ -0,0 +1,99 @@
+"""
+Tests for streaming resume validation: type sniffing, size limit and hashing
+"""
+import hashlib
+import shutil
+import tempfile
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from applications.models import JobApplication
+from applications.uploads import sniff_content_type
+
+User = get_user_model()
+
+PDF = b'%PDF-1.4\n' + b'0' * 2000
+
+
+class SniffTests(SimpleTestCase):
+    def test_types(self):
+        self.assertEqual(sniff_content_type(PDF[:16]), 'application/pdf')
+        self.assertEqual(sniff_content_type(b'\x89PNG\r\n\x1a\n' + b'\0' * 8), 'image/png')
+        self.assertEqual(sniff_content_type(b'\xff\xd8\xff\xe0'), 'image/jpeg')
+        self.assertEqual(sniff_content_type(b'RIFF\0\0\0\0WEBPVP8 '), 'image/webp')
+        self.assertEqual(
+            sniff_content_type(b'PK\x03\x04', 'cv.docx'),
+            'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+        )
+        self.assertIsNone(sniff_content_type(b'PK\x03\x04', 'cv.zip'))
+        self.assertIsNone(sniff_content_type(b'MZ\x90\x00'))
+
+
+@override_settings(RESUME_MAX_BYTES=4096)
+class ResumeUploadTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def _add(self, name, content, content_type='application/pdf'):
+        return self.client.post(reverse('add_job_application'), {
+            'company': 'Acme', 'position': 'Dev', 'applied_date': date.today().isoformat(),
+            'resume': SimpleUploadedFile(name, content, content_type=content_type),
+        })
+
+    def test_stores_hash_size_and_sniffed_type(self):
+        # The client's Content-Type is not trusted
+        response = self._add('cv.pdf', PDF, content_type='text/plain')
+        self.assertEqual(response.status_code, 201, response.content)
+        job = JobApplication.objects.get()
+        self.assertEqual(job.resume_sha256, hashlib.sha256(PDF).hexdigest())
+        self.assertEqual(job.resume_size, len(PDF))
+        self.assertEqual(job.resume_content_type, 'application/pdf')
+
+    def test_rejects_other_types(self):
+        response = self._add('cv.pdf', b'MZ\x90\x00' + b'\0' * 100)
+        self.assertEqual(response.status_code, 415)
+        self.assertIn('PDF, DOCX or image', response.json()['error'])
+        self.assertFalse(JobApplication.objects.exists())
+
+    def test_rejects_large_files(self):
+        response = self._add('cv.pdf', b'%PDF-1.4\n' + b'0' * 5000)
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.json()['error'], 'Resume must be at most 4 KB.')
+        self.assertFalse(JobApplication.objects.exists())
+
+    def test_rejects_oversized_requests_before_reading_the_file(self):
+        response = self._add('cv.pdf', b'%PDF-1.4\n' + b'0' * 100_000)
+        self.assertEqual(response.status_code, 413)
+
+    def test_update_replaces_metadata(self):
+        self._add('cv.pdf', PDF)
+        job = JobApplication.objects.get()
+        png = b'\x89PNG\r\n\x1a\n' + b'\0' * 100
+        response = self.client.patch(reverse('update_job_application', args=[job.pk]), {
+            'resume': SimpleUploadedFile('cv.png', png, content_type='image/png'),
+        })
+        self.assertEqual(response.status_code, 200, response.content)
+        job.refresh_from_db()
+        self.assertEqual((job.resume_sha256, job.resume_size, job.resume_content_type),
+                         (hashlib.sha256(png).hexdigest(), len(png), 'image/png'))
+
+        response = self.client.patch(reverse('update_job_application', args=[job.pk]), {
+            'resume': SimpleUploadedFile('cv.exe', b'MZ\x90\x00' + b'\0' * 100),
+        })
+        self.assertEqual(response.status_code, 415)
+        job.refresh_from_db()
+        self.assertEqual(job.resume_content_type, 'image/png')